@@ -0,0 +1,21 @@
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+BATCH_SIZE = 500
+UPSERTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
+
+def batches(items: list, size: int = BATCH_SIZE) -> list[list]:
+    """Розбиває список на частини по `size` для IN (...) та executemany."""
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def upsert(session, model, index_elements: list[str], update_fields: list[str] | None = None):
+    """INSERT ... ON CONFLICT (index_elements) DO UPDATE для діалекту сесії (sqlite/postgresql).
+    Без `update_fields` - DO NOTHING."""
+    stmt = UPSERTS[session.bind.dialect.name](model)
+    if update_fields:
+        return stmt.on_conflict_do_update(
+            index_elements=index_elements, set_={field: stmt.excluded[field] for field in update_fields}
+        )
+    return stmt.on_conflict_do_nothing(index_elements=index_elements)
@@ -5,4 +5,6 @@ load_dotenv()
 
 SCHEDULE_ID = os.environ.get("SCHEDULE_ID")
 BOT_TOKEN = os.environ.get("BOT_TOKEN")
-DATABASE_URL = os.environ.get("DATABASE_URL")
+DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite+aiosqlite:///test.db")
+DATABASE_READ_URL = os.environ.get("DATABASE_READ_URL") or DATABASE_URL
+PROFILING_TOKEN = os.environ.get("PROFILING_TOKEN")
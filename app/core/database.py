@@ -1,10 +1,15 @@
 from fastapi import Depends
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncEngine
 from sqlalchemy.orm import declarative_base
 from typing import Annotated
 
-engine: AsyncEngine = create_async_engine("sqlite+aiosqlite:///test.db")
+from .config import DATABASE_URL, DATABASE_READ_URL
+from .engine import build_engine
+
+engine: AsyncEngine = build_engine(DATABASE_URL)
+read_engine: AsyncEngine = build_engine(DATABASE_READ_URL, read_only=True)
 AsyncSessionLocal = async_sessionmaker(engine)
+ReadSessionLocal = async_sessionmaker(read_engine)
 Base = declarative_base()
 
 async def init_db():
@@ -19,4 +24,9 @@ async def get_session():
     async with AsyncSessionLocal() as session:
         yield session
 
-Session = Annotated[AsyncSessionLocal, Depends(get_session)]
\ No newline at end of file
+async def get_read_session():
+    async with ReadSessionLocal() as session:
+        yield session
+
+Session = Annotated[AsyncSessionLocal, Depends(get_session)]
+ReadSession = Annotated[ReadSessionLocal, Depends(get_read_session)]
@@ -0,0 +1,55 @@
+import os
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine
+
+from .profiling import profiler
+
+POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 30 * 60))
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT", 5000)),
+    "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)),
+}
+
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def build_engine(database_url: str, read_only: bool = False, **kwargs) -> AsyncEngine:
+    """Створює async engine для обох застосунків.
+
+    Для SQLite на кожному з'єднанні вмикаються WAL, synchronous=NORMAL, busy_timeout та mmap_size,
+    для інших БД - пул з'єднань з pre-ping. `read_only` забороняє запис через цей engine."""
+    url = make_url(database_url)
+    options = {"pool_pre_ping": True, **kwargs}
+    if not _is_memory_sqlite(url):
+        options.setdefault("pool_size", POOL_SIZE)
+        options.setdefault("max_overflow", MAX_OVERFLOW)
+        options.setdefault("pool_recycle", POOL_RECYCLE)
+    if read_only and url.get_backend_name() == "postgresql":
+        options.setdefault("execution_options", {"postgresql_readonly": True})
+
+    engine = create_async_engine(url, **options)
+
+    if url.get_backend_name() == "sqlite":
+        pragmas = dict(SQLITE_PRAGMAS)
+        if _is_memory_sqlite(url):
+            pragmas.pop("journal_mode")
+        if read_only:
+            pragmas["query_only"] = "ON"
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+    profiler.register_engine(engine)
+    return engine
@@ -0,0 +1,33 @@
+import time
+
+from fastapi import Request, Response
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+REQUEST_SECONDS = Histogram(
+    "api_request_seconds", "API request duration by route template", ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUEST_ERRORS = Counter("api_request_errors_total", "Unhandled API exceptions by route template", ["method", "route"])
+
+
+def route_template(request: Request) -> str:
+    """Route path with placeholders ("/v1/groups/{group_id}") to keep label cardinality bounded."""
+    route = request.scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+async def metrics_middleware(request: Request, call_next):
+    start_time = time.perf_counter()
+    try:
+        response = await call_next(request)
+    except Exception:
+        REQUEST_ERRORS.labels(request.method, route_template(request)).inc()
+        raise
+    REQUEST_SECONDS.labels(request.method, route_template(request), response.status_code).observe(
+        time.perf_counter() - start_time
+    )
+    return response
+
+
+async def metrics() -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
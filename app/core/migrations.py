@@ -0,0 +1,73 @@
+from typing import Callable
+from loguru import logger
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table, func, insert, inspect, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn
+
+Migration = tuple[int, str, Callable[[Connection], None]]
+
+
+def create_indexes(*indexes) -> Callable[[Connection], None]:
+    """Крок міграції: створює індекси, яких ще немає в БД."""
+    def step(connection: Connection):
+        for index in indexes:
+            index.create(connection, checkfirst=True)
+    return step
+
+
+def add_columns(*columns: Column) -> Callable[[Connection], None]:
+    """Крок міграції: додає до таблиць колонки моделей, яких ще немає в БД."""
+    def step(connection: Connection):
+        existing = {}
+        for column in columns:
+            table = column.table.name
+            if table not in existing:
+                existing[table] = {info["name"] for info in inspect(connection).get_columns(table)}
+            if column.name not in existing[table]:
+                ddl = CreateColumn(column).compile(dialect=connection.dialect)
+                connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {ddl}"))
+    return step
+
+
+def remove_duplicates(table: Table, columns: list[str]) -> Callable[[Connection], None]:
+    """Крок міграції: лишає один рядок (з найменшим id) на кожне значення `columns`."""
+    def step(connection: Connection):
+        keep = select(func.min(table.c.id)).group_by(*(table.c[column] for column in columns))
+        connection.execute(table.delete().where(table.c.id.not_in(keep)))
+    return step
+
+
+def unique_index(index: Index) -> Callable[[Connection], None]:
+    """Крок міграції: прибирає дублікати за колонками унікального індексу та створює його."""
+    def step(connection: Connection):
+        remove_duplicates(index.table, [column.name for column in index.columns])(connection)
+        create_indexes(index)(connection)
+    return step
+
+
+def apply_migrations(connection: Connection, migrations: list[Migration], version_table: str = "schema_migrations"):
+    """Виконує ще не застосовані міграції по порядку та записує їх версії."""
+    versions = Table(
+        version_table, MetaData(),
+        Column("version", Integer, primary_key=True),
+        Column("name", String, nullable=False),
+    )
+    versions.create(connection, checkfirst=True)
+    current = connection.scalar(select(func.max(versions.c.version))) or 0
+
+    for version, name, step in sorted(migrations, key=lambda migration: migration[0]):
+        if version <= current:
+            continue
+        logger.info(f"Applying migration {version}: {name}")
+        step(connection)
+        connection.execute(insert(versions).values(version=version, name=name))
+
+
+def find_full_scans(connection: Connection, statement) -> list[str]:
+    """Повертає кроки плану запиту, що читають таблицю повністю (без індексу)."""
+    compiled = statement.compile(connection, compile_kwargs={"literal_binds": True})
+    if connection.dialect.name == "sqlite":
+        plan = [row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))]
+        return [step for step in plan if step.startswith("SCAN") and "USING" not in step]
+    plan = [row[0] for row in connection.execute(text(f"EXPLAIN {compiled}"))]
+    return [step for step in plan if "Seq Scan" in step]
@@ -0,0 +1,168 @@
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+
+from loguru import logger
+from sqlalchemy import event
+
+_query_stats: ContextVar[dict | None] = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _query_stats.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _query_stats.get()
+    started = conn.info.get("query_started_at")
+    if stats is None or not started:
+        return
+    stats["queries"] += 1
+    stats["query_seconds"] += time.perf_counter() - started.pop()
+
+
+class Profiler:
+    """Профілювання за запитом: cProfile, кількість і час SQL-запитів та (опційно) tracemalloc.
+
+    Вимкнений профайлер коштує одну перевірку прапорця: слухачі подій SQLAlchemy
+    підключаються лише при enable(). Кожен звіт зберігається у `output_dir` як .prof
+    (pstats) та залишається в пам'яті серед останніх `keep` звітів."""
+
+    def __init__(self, enabled: bool = False, output_dir: str | Path = "profiles", routes=(),
+                 trace_memory: bool = False, keep: int = 20):
+        self.enabled = False
+        self.output_dir = Path(output_dir)
+        self.routes = tuple(routes)
+        self.trace_memory = trace_memory
+        self.reports: deque[dict] = deque(maxlen=keep)
+        self._engines = []
+        self._profiling = False
+        if enabled:
+            self.enable()
+
+    def register_engine(self, engine):
+        """Додає engine (sync або async), SQL-запити якого рахуються у звітах."""
+        engine = getattr(engine, "sync_engine", engine)
+        self._engines.append(engine)
+        if self.enabled:
+            self._listen(engine)
+
+    @staticmethod
+    def _listen(engine):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    def enable(self, trace_memory: bool | None = None):
+        if trace_memory is not None:
+            self.trace_memory = trace_memory
+        if not self.enabled:
+            for engine in self._engines:
+                self._listen(engine)
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.enabled = True
+        logger.info(f"Profiling enabled, reports in {self.output_dir}")
+
+    def disable(self):
+        if self.enabled:
+            for engine in self._engines:
+                event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+                event.remove(engine, "after_cursor_execute", _after_cursor_execute)
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.enabled = False
+        logger.info("Profiling disabled")
+
+    def matches(self, path: str) -> bool:
+        """Чи профілюється маршрут API з цим шляхом."""
+        return self.enabled and path.startswith(self.routes)
+
+    @asynccontextmanager
+    async def profile(self, name: str):
+        """Профілює блок коду. Одночасно працює лише один cProfile, паралельні блоки
+        отримують лише тривалість та статистику SQL."""
+        stats = {"queries": 0, "query_seconds": 0.0}
+        token = _query_stats.set(stats)
+        profile = None
+        if not self._profiling:
+            self._profiling = True
+            profile = cProfile.Profile()
+        memory_before = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+
+        started_at = datetime.now()
+        start_time = time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield stats
+        finally:
+            if profile is not None:
+                profile.disable()
+                self._profiling = False
+            duration = time.perf_counter() - start_time
+            _query_stats.reset(token)
+            self._report(name, started_at, duration, stats, profile, memory_before)
+
+    def _report(self, name: str, started_at: datetime, duration: float, stats: dict, profile, memory_before):
+        report = {
+            "name": name,
+            "started_at": started_at.isoformat(timespec="milliseconds"),
+            "duration": round(duration, 6),
+            "queries": stats["queries"],
+            "query_seconds": round(stats["query_seconds"], 6),
+        }
+        if profile is not None:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            file_name = "".join(char if char.isalnum() else "_" for char in name).strip("_")
+            path = self.output_dir / f"{started_at:%Y%m%d_%H%M%S_%f}_{file_name}.prof"
+            profile.dump_stats(path)
+            text = io.StringIO()
+            pstats.Stats(profile, stream=text).sort_stats("cumulative").print_stats(20)
+            report["profile_file"] = str(path)
+            report["top"] = text.getvalue()
+        if memory_before is not None and tracemalloc.is_tracing():
+            diff = tracemalloc.take_snapshot().compare_to(memory_before, "lineno")
+            report["memory"] = [str(stat) for stat in diff[:10]]
+
+        self.reports.append(report)
+        logger.info(f"Profiled {name}: {report['duration']:.3f}s, {report['queries']} queries "
+                    f"({report['query_seconds']:.3f}s)")
+
+    async def middleware(self, request, call_next):
+        """HTTP middleware: профілює запити до маршрутів з `routes` та додає X-Query-Count."""
+        if not self.matches(request.url.path):
+            return await call_next(request)
+        async with self.profile(f"{request.method} {request.url.path}") as stats:
+            response = await call_next(request)
+        response.headers["X-Query-Count"] = str(stats["queries"])
+        return response
+
+    def profiled(self, name: str):
+        """Декоратор корутини: профілює виклики лише коли профайлер увімкнено."""
+        def decorator(func):
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return await func(*args, **kwargs)
+                async with self.profile(name):
+                    return await func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+
+profiler = Profiler(
+    enabled=os.environ.get("PROFILING", "").lower() in ("1", "true", "yes"),
+    output_dir=os.environ.get("PROFILE_DIR", "profiles"),
+    routes=[route for route in os.environ.get("PROFILE_ROUTES", "/v1/").split(",") if route],
+    trace_memory=os.environ.get("PROFILE_MEMORY", "").lower() in ("1", "true", "yes"),
+)
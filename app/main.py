@@ -1,7 +1,23 @@
-from fastapi import FastAPI, status
-from app.routers import user_router, lesson_router, group_router, subscription_router
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError
+from app.core.database import init_db
+from app.core.metrics import metrics, metrics_middleware
+from app.core.profiling import profiler
+from app.migrations import migrate_db
+from app.routers import user_router, lesson_router, group_router, subscription_router, debug_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_db()
+    await migrate_db()
+    yield
+
 
 app = FastAPI(
+    lifespan=lifespan,
     title="LNUVMB Lecture Schedule API",
     description="API for accessing lecture schedules at the "
                 "Lviv National University of Veterinary Medicine and"
@@ -13,10 +29,24 @@ app = FastAPI(
     }
 )
 
+app.middleware("http")(profiler.middleware)
+app.middleware("http")(metrics_middleware)
+app.add_api_route("/metrics", metrics, include_in_schema=False)
+
+
+@app.exception_handler(IntegrityError)
+async def integrity_error_handler(request: Request, exc: IntegrityError):
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"detail": "Conflicts with an existing record (duplicate or missing reference)"},
+    )
+
+
 app.include_router(user_router)
 app.include_router(lesson_router)
 app.include_router(group_router)
 app.include_router(subscription_router)
+app.include_router(debug_router)
 
 
 @app.get("/info", status_code=status.HTTP_200_OK)
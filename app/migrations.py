@@ -0,0 +1,21 @@
+from app.core.database import engine
+from app.core.migrations import apply_migrations, create_indexes, unique_index
+from app.models import Lesson, Subscription
+
+lesson_indexes = {index.name: index for index in Lesson.__table__.indexes}
+subscription_indexes = {index.name: index for index in Subscription.__table__.indexes}
+
+
+MIGRATIONS = [
+    (1, "lessons natural key", unique_index(lesson_indexes["uq_lessons_group_slot"])),
+    (2, "hot path indexes", create_indexes(
+        lesson_indexes["ix_lessons_group_week_type_day"],
+        subscription_indexes["ix_subscriptions_group_week_type"],
+    )),
+    (3, "one subscription per user", unique_index(subscription_indexes["uq_subscriptions_user"])),
+]
+
+
+async def migrate_db():
+    async with engine.begin() as conn:
+        await conn.run_sync(apply_migrations, MIGRATIONS, "api_schema_migrations")
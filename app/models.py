@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, Boolean
+from sqlalchemy import Column, String, Integer, ForeignKey, Boolean, Index
 from sqlalchemy.orm import declarative_base, relationship
 from app.core.database import Base
 
@@ -13,7 +13,7 @@ class User(Base):
     last_name = Column(String)
     is_superuser = Column(Boolean, nullable=False, default=False)
 
-    subscription = relationship("Subscription", back_populates="users")
+    subscription = relationship("Subscription", back_populates="user", uselist=False)
 
 
 class Subscription(Base):
@@ -27,7 +27,12 @@ class Subscription(Base):
     group = relationship("Group", back_populates="subscriptions")
 
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    user = relationship("User", back_populates="subscriptions")
+    user = relationship("User", back_populates="subscription")
+
+    __table_args__ = (
+        Index("uq_subscriptions_user", "user_id", unique=True),
+        Index("ix_subscriptions_group_week_type", "group_id", "week_type"),
+    )
 
 class Group(Base):
     __tablename__ = "groups"
@@ -58,3 +63,8 @@ class Lesson(Base):
 
     group_id = Column(Integer, ForeignKey("groups.id"), nullable=False)
     group = relationship("Group", back_populates="lessons")
+
+    __table_args__ = (
+        Index("uq_lessons_group_slot", "group_id", "week_day", "lesson_number", "week_type", unique=True),
+        Index("ix_lessons_group_week_type_day", "group_id", "week_type", "week_day"),
+    )
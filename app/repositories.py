@@ -1,35 +1,137 @@
-from sqlalchemy import select, update, delete
+from contextlib import asynccontextmanager
+from sqlalchemy import select, update, delete, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.bulk import upsert
+
+
+@asynccontextmanager
+async def unit_of_work(session: AsyncSession):
+    """Один commit на кілька викликів репозиторіїв у `session`; при помилці - rollback."""
+    session.info["unit_of_work"] = session.info.get("unit_of_work", 0) + 1
+    try:
+        yield session
+        if session.info["unit_of_work"] == 1:
+            await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        session.info["unit_of_work"] -= 1
+
+
 class Repository:
     def __init__(self, model, session: AsyncSession) -> None:
         self.model = model
         self.session = session
 
-    async def create(self, **kwargs) -> None:
-        user = self.model(**kwargs)
-        self.session.add(user)
-        await self.session.commit()
+    def transaction(self):
+        return unit_of_work(self.session)
+
+    async def _commit(self) -> None:
+        if not self.session.info.get("unit_of_work"):
+            await self.session.commit()
 
-    async def get_from_id(self, item_id: int):
-        stmt = select(self.model).where(self.model.id == item_id)
+    async def create(self, **kwargs):
+        item = self.model(**kwargs)
+        self.session.add(item)
+        await self.session.flush()
+        await self._commit()
+        await self.session.refresh(item)
+        return item
 
-        user = await self.session.scalars(stmt)
-        return user.one_or_none()
+    async def create_many(self, items: list[dict]) -> None:
+        if items:
+            await self.session.execute(insert(self.model), items)
+        await self._commit()
+
+    async def upsert_many(self, items: list[dict], index_elements: list[str], update_fields: list[str] | None = None) -> None:
+        """INSERT ... ON CONFLICT (index_elements) DO UPDATE для sqlite/postgresql."""
+        if items:
+            fields = update_fields or [field for field in items[0] if field not in index_elements and field != "id"]
+            await self.session.execute(upsert(self.session, self.model, index_elements, fields), items)
+        await self._commit()
+
+    async def get_from_id(self, item_id: int, options=()):
+        stmt = select(self.model).where(self.model.id == item_id).options(*options)
+
+        item = await self.session.scalars(stmt)
+        return item.one_or_none()
 
     async def get_all(self):
         stmt = select(self.model)
         users = await self.session.scalars(stmt)
         return users.all()
 
+    def _where(self, stmt, filters: dict):
+        """Фільтри на рівність; list/tuple/set стають IN (...), значення None пропускаються."""
+        for field, value in filters.items():
+            if value is None:
+                continue
+            column = getattr(self.model, field)
+            stmt = stmt.where(column.in_(value) if isinstance(value, (list, tuple, set)) else column == value)
+        return stmt
+
+    async def get_many(self, order_by=(), options=(), **filters):
+        stmt = select(self.model).options(*options).order_by(*(order_by or (self.model.id,)))
+        return (await self.session.scalars(self._where(stmt, filters))).all()
+
+    async def iter_all(self, batch_size: int = 1000, options=()):
+        """Читає всю таблицю серверним курсором по `batch_size` рядків."""
+        stmt = select(self.model).options(*options).order_by(self.model.id).execution_options(yield_per=batch_size)
+        result = await self.session.stream_scalars(stmt)
+        async for partition in result.partitions():
+            for item in partition:
+                yield item
+
+    async def iter_rows(self, batch_size: int = 1000, **filters):
+        """Читає рядки всіх колонок таблиці (без ORM-об'єктів) пачками до `batch_size` серверним курсором,
+        тож пам'ять не залежить від розміру таблиці."""
+        stmt = select(*self.model.__table__.columns).order_by(self.model.id).execution_options(yield_per=batch_size)
+        result = await self.session.stream(self._where(stmt, filters))
+        async for partition in result.partitions():
+            yield partition
+
+    async def get_page(self, after: int | None = None, limit: int = 50, options=(), **filters):
+        """Keyset-пагінація за id: до `limit` записів з id > `after` та наступний курсор."""
+        stmt = select(self.model).options(*options).order_by(self.model.id).limit(limit + 1)
+        if after is not None:
+            stmt = stmt.where(self.model.id > after)
+
+        items = (await self.session.scalars(self._where(stmt, filters))).all()
+        next_cursor = items[limit - 1].id if len(items) > limit else None
+        return items[:limit], next_cursor
+
     async def update(self, item_id: int, **kwargs) -> None:
+        """Оновлює передані колонки одного рядка; порожнє оновлення нічого не робить."""
+        if not kwargs:
+            return
         stmt = update(self.model).where(self.model.id == item_id).values(**kwargs)
 
         await self.session.execute(stmt)
-        await self.session.commit()
+        await self._commit()
+
+    async def update_many(self, items: list[dict]) -> None:
+        """Масовий UPDATE за первинним ключем; кожен елемент має містити "id"."""
+        if items:
+            await self.session.execute(update(self.model), items)
+        await self._commit()
 
     async def delete(self, item_id: int) -> None:
         stmt = delete(self.model).where(self.model.id == item_id)
 
         await self.session.execute(stmt)
-        await self.session.commit()
+        await self._commit()
+
+    async def delete_many(self, ids: list[int] | None = None, **filters) -> int:
+        """Видаляє рядки за списком id та/або фільтрами `_where`; повертає кількість видалених рядків."""
+        if ids is None and all(value is None for value in filters.values()):
+            raise ValueError("delete_many requires ids or filters")
+        stmt = delete(self.model)
+        if ids is not None:
+            stmt = stmt.where(self.model.id.in_(ids))
+        stmt = self._where(stmt, filters)
+
+        result = await self.session.execute(stmt)
+        await self._commit()
+        return result.rowcount
@@ -1,4 +1,5 @@
 from .users import *
 from .subscription import *
 from .group import *
-from .lesson import *
\ No newline at end of file
+from .lesson import *
+from .debug import *
\ No newline at end of file
@@ -0,0 +1,37 @@
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from app.core.config import PROFILING_TOKEN
+from app.core.profiling import profiler
+
+
+def require_profiling_token(x_profiling_token: str | None = Header(None)):
+    if not PROFILING_TOKEN or not secrets.compare_digest(x_profiling_token or "", PROFILING_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Profiling is not allowed")
+
+
+debug_router = APIRouter(
+    prefix="/debug", tags=["Debug"], dependencies=[Depends(require_profiling_token)], include_in_schema=False
+)
+
+
+@debug_router.get("/profile", status_code=status.HTTP_200_OK)
+async def get_profile():
+    return {
+        "enabled": profiler.enabled,
+        "routes": profiler.routes,
+        "trace_memory": profiler.trace_memory,
+        "reports": list(profiler.reports),
+    }
+
+
+@debug_router.post("/profile", status_code=status.HTTP_200_OK)
+async def set_profile(enabled: bool, routes: str | None = None, trace_memory: bool | None = None):
+    if routes is not None:
+        profiler.routes = tuple(route for route in routes.split(",") if route)
+    if enabled:
+        profiler.enable(trace_memory=trace_memory)
+    else:
+        profiler.disable()
+    return await get_profile()
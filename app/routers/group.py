@@ -1,28 +1,54 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, HTTPException, Query, status
+
+from app.core.database import Session, ReadSession
+from app.models import Group
+from app.repositories import Repository
+from app.schemas.groups import BaseGroup, ReadGroup, UpdateGroup
+from app.schemas.pagination import Page
 
 group_router = APIRouter(prefix="/v1/groups", tags=["Groups"])
 
 
-@group_router.get("/", status_code=status.HTTP_200_OK)
-async def get_all_group():
-    return {"message": "get all"}
+@group_router.get("/", status_code=status.HTTP_200_OK, response_model=Page[ReadGroup])
+async def get_all_group(
+        session: ReadSession,
+        after: int | None = None,
+        limit: int = Query(50, ge=1, le=500),
+        specialty: str | None = None,
+        course: int | None = None,
+):
+    items, next_cursor = await Repository(Group, session).get_page(
+        after=after, limit=limit, specialty=specialty, course=course
+    )
+    return {"items": items, "next_cursor": next_cursor}
 
 
-@group_router.get("/{group_id}", status_code=status.HTTP_200_OK)
-async def get_group_one(group_id: int):
-    return {"message": f"get one {group_id}"}
+@group_router.get("/{group_id}", status_code=status.HTTP_200_OK, response_model=ReadGroup)
+async def get_group_one(group_id: int, session: ReadSession):
+    group = await Repository(Group, session).get_from_id(group_id)
+    if group is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    return group
 
 
-@group_router.post("/", status_code=status.HTTP_201_CREATED)
-async def create_group():
-    return {"message": "create"}
+@group_router.post("/", status_code=status.HTTP_201_CREATED, response_model=ReadGroup)
+async def create_group(data: BaseGroup, session: Session):
+    return await Repository(Group, session).create(**data.model_dump())
 
 
-@group_router.put("/{group_id}", status_code=status.HTTP_202_ACCEPTED)
-async def update_group(group_id: int):
-    return {"message": f"update {group_id}"}
+@group_router.put("/{group_id}", status_code=status.HTTP_202_ACCEPTED, response_model=ReadGroup)
+async def update_group(group_id: int, data: UpdateGroup, session: Session):
+    repository = Repository(Group, session)
+    if await repository.get_from_id(group_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    await repository.update(group_id, **data.model_dump(exclude_unset=True))
+    return await repository.get_from_id(group_id)
 
 
 @group_router.delete("/{group_id}", status_code=status.HTTP_202_ACCEPTED)
-async def delete_group(group_id: int):
-    return {"message": f"delete {group_id}"}
+async def delete_group(group_id: int, session: Session):
+    repository = Repository(Group, session)
+    if await repository.get_from_id(group_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found")
+    await repository.delete(group_id)
+    return {"id": group_id}
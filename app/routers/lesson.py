@@ -1,28 +1,126 @@
-from fastapi import APIRouter, status
+import csv
+import io
+import json
+from collections import defaultdict
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.core.database import Session, ReadSession, ReadSessionLocal
+from app.models import Group, Lesson
+from app.repositories import Repository
+from app.schemas.lessons import CreateLesson, ReadLesson, UpdateLesson, ScheduleBatch, ScheduleBatchRequest
+from app.schemas.pagination import Page
 
 lesson_router = APIRouter(prefix="/v1/lessons", tags=["Lessons"])
 
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = [column.name for column in Lesson.__table__.columns]
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def render_rows(rows, export_format: str) -> str:
+    if export_format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+    return "".join(json.dumps(row._asdict(), ensure_ascii=False) + "\n" for row in rows)
+
+
+async def iter_export(export_format: str, **filters):
+    """Own read session: the stream outlives the request dependencies."""
+    async with ReadSessionLocal() as session:
+        if export_format == "csv":
+            yield render_rows([EXPORT_COLUMNS], export_format)
+        async for rows in Repository(Lesson, session).iter_rows(batch_size=EXPORT_BATCH_SIZE, **filters):
+            yield render_rows(rows, export_format)
+
+
+@lesson_router.get("/", status_code=status.HTTP_200_OK, response_model=Page[ReadLesson])
+async def get_all_lesson(
+        session: ReadSession,
+        after: int | None = None,
+        limit: int = Query(50, ge=1, le=500),
+        group_id: int | None = None,
+        week_day: int | None = None,
+        week_type: str | None = None,
+):
+    items, next_cursor = await Repository(Lesson, session).get_page(
+        after=after, limit=limit, group_id=group_id, week_day=week_day, week_type=week_type
+    )
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@lesson_router.post("/batch", status_code=status.HTTP_200_OK, response_model=ScheduleBatch)
+async def get_schedules(data: ScheduleBatchRequest, session: ReadSession):
+    groups_repository = Repository(Group, session)
+    groups = {}
+    if data.group_ids:
+        found = {group.id: group for group in await groups_repository.get_many(id=data.group_ids)}
+        groups.update((group_id, found[group_id]) for group_id in data.group_ids if group_id in found)
+    if data.group_names:
+        found = {group.name: group for group in await groups_repository.get_many(name=data.group_names)}
+        groups.update((found[name].id, found[name]) for name in data.group_names if name in found)
+
+    lessons = defaultdict(list)
+    if groups:
+        for lesson in await Repository(Lesson, session).get_many(
+            group_id=list(groups), week_type=data.week_types,
+            order_by=(Lesson.group_id, Lesson.week_type, Lesson.week_day, Lesson.lesson_number),
+        ):
+            lessons[lesson.group_id].append(lesson)
+
+    names = {group.name for group in groups.values()}
+    return {
+        "groups": [
+            {"group_id": group.id, "group_name": group.name, "lessons": lessons[group.id]}
+            for group in groups.values()
+        ],
+        "not_found": [group_id for group_id in data.group_ids if group_id not in groups]
+                     + [name for name in data.group_names if name not in names],
+    }
+
 
-@lesson_router.get("/", status_code=status.HTTP_200_OK)
-async def get_all_lesson():
-    return {"message": "get all"}
+@lesson_router.get("/export", status_code=status.HTTP_200_OK)
+async def export_lessons(
+        export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+        group_id: int | None = None,
+        week_type: str | None = None,
+):
+    return StreamingResponse(
+        iter_export(export_format, group_id=group_id, week_type=week_type),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="lessons.{export_format}"'},
+    )
 
 
-@lesson_router.get("/{lesson_id}", status_code=status.HTTP_200_OK)
-async def get_user_one(lesson_id: int):
-    return {"message": f"get one {lesson_id}"}
+@lesson_router.get("/{lesson_id}", status_code=status.HTTP_200_OK, response_model=ReadLesson)
+async def get_user_one(lesson_id: int, session: ReadSession):
+    lesson = await Repository(Lesson, session).get_from_id(lesson_id)
+    if lesson is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lesson not found")
+    return lesson
 
 
-@lesson_router.post("/", status_code=status.HTTP_201_CREATED)
-async def create_user():
-    return {"message": "create"}
+@lesson_router.post("/", status_code=status.HTTP_201_CREATED, response_model=ReadLesson)
+async def create_user(data: CreateLesson, session: Session):
+    return await Repository(Lesson, session).create(**data.model_dump())
 
 
-@lesson_router.put("/{lesson_id}", status_code=status.HTTP_202_ACCEPTED)
-async def update_user(lesson_id: int):
-    return {"message": f"update {lesson_id}"}
+@lesson_router.put("/{lesson_id}", status_code=status.HTTP_202_ACCEPTED, response_model=ReadLesson)
+async def update_user(lesson_id: int, data: UpdateLesson, session: Session):
+    repository = Repository(Lesson, session)
+    if await repository.get_from_id(lesson_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lesson not found")
+    await repository.update(lesson_id, **data.model_dump(exclude_unset=True))
+    return await repository.get_from_id(lesson_id)
 
 
 @lesson_router.delete("/{lesson_id}", status_code=status.HTTP_202_ACCEPTED)
-async def delete_user(lesson_id: int):
-    return {"message": f"delete {lesson_id}"}
\ No newline at end of file
+async def delete_user(lesson_id: int, session: Session):
+    repository = Repository(Lesson, session)
+    if await repository.get_from_id(lesson_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lesson not found")
+    await repository.delete(lesson_id)
+    return {"id": lesson_id}
@@ -1,23 +1,57 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, HTTPException, Query, status
+from sqlalchemy.orm import selectinload
+
+from app.core.database import Session, ReadSession
+from app.models import Subscription
+from app.repositories import Repository
+from app.schemas.pagination import Page
+from app.schemas.subscriptions import CreateSubscription, ReadSubscription, UpdateSubscription
 
 subscription_router = APIRouter(prefix="/v1/subscription", tags=["Subscription"])
 
-@subscription_router.get("/", status_code=status.HTTP_200_OK)
-async def get_all_subscription():
-    return {"message": "get all"}
+SUBSCRIPTION_OPTIONS = (selectinload(Subscription.group),)
+
+@subscription_router.get("/", status_code=status.HTTP_200_OK, response_model=Page[ReadSubscription])
+async def get_all_subscription(
+        session: ReadSession,
+        after: int | None = None,
+        limit: int = Query(50, ge=1, le=500),
+        user_id: int | None = None,
+        group_id: int | None = None,
+        week_type: str | None = None,
+        is_active: bool | None = None,
+):
+    items, next_cursor = await Repository(Subscription, session).get_page(
+        after=after, limit=limit, options=SUBSCRIPTION_OPTIONS,
+        user_id=user_id, group_id=group_id, week_type=week_type, is_active=is_active,
+    )
+    return {"items": items, "next_cursor": next_cursor}
 
-@subscription_router.get("/{subscription_id}", status_code=status.HTTP_200_OK)
-async def get_one_subscription(subscription_id: int):
-    return {"message": f"get one {subscription_id}"}
+@subscription_router.get("/{subscription_id}", status_code=status.HTTP_200_OK, response_model=ReadSubscription)
+async def get_one_subscription(subscription_id: int, session: ReadSession):
+    subscription = await Repository(Subscription, session).get_from_id(subscription_id, options=SUBSCRIPTION_OPTIONS)
+    if subscription is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Subscription not found")
+    return subscription
 
-@subscription_router.post("/", status_code=status.HTTP_201_CREATED)
-async def create_subscription():
-    return {"message": "create"}
+@subscription_router.post("/", status_code=status.HTTP_201_CREATED, response_model=ReadSubscription)
+async def create_subscription(data: CreateSubscription, session: Session):
+    repository = Repository(Subscription, session)
+    subscription = await repository.create(**data.model_dump())
+    return await repository.get_from_id(subscription.id, options=SUBSCRIPTION_OPTIONS)
 
-@subscription_router.put("/{subscription_id}", status_code=status.HTTP_202_ACCEPTED)
-async def update_subscription(subscription_id: int):
-    return {"message": f"update {subscription_id}"}
+@subscription_router.put("/{subscription_id}", status_code=status.HTTP_202_ACCEPTED, response_model=ReadSubscription)
+async def update_subscription(subscription_id: int, data: UpdateSubscription, session: Session):
+    repository = Repository(Subscription, session)
+    if await repository.get_from_id(subscription_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Subscription not found")
+    await repository.update(subscription_id, **data.model_dump(exclude_unset=True))
+    return await repository.get_from_id(subscription_id, options=SUBSCRIPTION_OPTIONS)
 
 @subscription_router.delete("/{subscription_id}", status_code=status.HTTP_202_ACCEPTED)
-async def delete_subscription(subscription_id: int):
-    return {"message": f"delete {subscription_id}"}
\ No newline at end of file
+async def delete_subscription(subscription_id: int, session: Session):
+    repository = Repository(Subscription, session)
+    if await repository.get_from_id(subscription_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Subscription not found")
+    await repository.delete(subscription_id)
+    return {"id": subscription_id}
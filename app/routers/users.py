@@ -1,28 +1,59 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, HTTPException, Query, status
+from sqlalchemy.orm import selectinload
+
+from app.core.database import Session, ReadSession
+from app.models import User, Subscription
+from app.repositories import Repository
+from app.schemas.pagination import Page
+from app.schemas.users import CreateUser, ReadUser, UpdateUser
 
 user_router = APIRouter(prefix="/v1/users", tags=["Users"])
 
+USER_OPTIONS = (selectinload(User.subscription).selectinload(Subscription.group),)
+
 
-@user_router.get("/", status_code=status.HTTP_200_OK)
-async def get_all_user():
-    return {"message": "get all"}
+@user_router.get("/", status_code=status.HTTP_200_OK, response_model=Page[ReadUser])
+async def get_all_user(
+        session: ReadSession,
+        after: int | None = None,
+        limit: int = Query(50, ge=1, le=500),
+        chat_id: int | None = None,
+        is_superuser: bool | None = None,
+):
+    items, next_cursor = await Repository(User, session).get_page(
+        after=after, limit=limit, options=USER_OPTIONS, chat_id=chat_id, is_superuser=is_superuser
+    )
+    return {"items": items, "next_cursor": next_cursor}
 
 
-@user_router.get("/{user_id}", status_code=status.HTTP_200_OK)
-async def get_user_one(user_id: int):
-    return {"message": f"get one {user_id}"}
+@user_router.get("/{user_id}", status_code=status.HTTP_200_OK, response_model=ReadUser)
+async def get_user_one(user_id: int, session: ReadSession):
+    user = await Repository(User, session).get_from_id(user_id, options=USER_OPTIONS)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return user
 
 
-@user_router.post("/", status_code=status.HTTP_201_CREATED)
-async def create_user():
-    return {"message": "create"}
+@user_router.post("/", status_code=status.HTTP_201_CREATED, response_model=ReadUser)
+async def create_user(data: CreateUser, session: Session):
+    repository = Repository(User, session)
+    user = await repository.create(**data.model_dump())
+    return await repository.get_from_id(user.id, options=USER_OPTIONS)
 
 
-@user_router.put("/{user_id}", status_code=status.HTTP_202_ACCEPTED)
-async def update_user(user_id: int):
-    return {"message": f"update {user_id}"}
+@user_router.put("/{user_id}", status_code=status.HTTP_202_ACCEPTED, response_model=ReadUser)
+async def update_user(user_id: int, data: UpdateUser, session: Session):
+    repository = Repository(User, session)
+    if await repository.get_from_id(user_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    await repository.update(user_id, **data.model_dump(exclude_unset=True))
+    return await repository.get_from_id(user_id, options=USER_OPTIONS)
 
 
 @user_router.delete("/{user_id}", status_code=status.HTTP_202_ACCEPTED)
-async def delete_user(user_id: int):
-    return {"message": f"delete {user_id}"}
+async def delete_user(user_id: int, session: Session):
+    repository = Repository(User, session)
+    if await repository.get_from_id(user_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    await repository.delete(user_id)
+    return {"id": user_id}
@@ -1,12 +1,22 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from .validators import not_null
 
 class BaseGroup(BaseModel):
     name: str
-    specialty: str
-    course: int
+    specialty: str | None = None
+    course: int | None = None
+
+class UpdateGroup(BaseModel):
+    name: str | None = None
+    specialty: str | None = None
+    course: int | None = None
+
+    _not_null = not_null("name")
 
 class ReadGroup(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
-    specialty: str
-    course: int
+    specialty: str | None
+    course: int | None
@@ -1,22 +1,51 @@
-from datetime import time
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
+from .validators import not_null
 
 class CreateLesson(BaseModel):
     week_day: int
     lesson_number: int
-    week_type: int
+    week_type: str
     subject: str
     teacher: str
     room: str
     group_id: int
-    start_time: time
-    end_time: time
+    start_time: str
+    end_time: str
 
 class UpdateLesson(BaseModel):
+    lesson_number: int | None = None
+    subject: str | None = None
+    teacher: str | None = None
+    room: str | None = None
+    start_time: str | None = None
+    end_time: str | None = None
+
+    _not_null = not_null("lesson_number")
+
+class ReadLesson(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    week_day: int
     lesson_number: int
-    subject: str
-    teacher: str
-    room: str
-    start_time: time
-    end_time: time
+    week_type: str
+    subject: str | None
+    teacher: str | None
+    room: str | None
+    group_id: int
+    start_time: str | None
+    end_time: str | None
+
+class ScheduleBatchRequest(BaseModel):
+    group_ids: list[int] = Field(default_factory=list, max_length=500)
+    group_names: list[str] = Field(default_factory=list, max_length=500)
+    week_types: list[str] | None = None
+
+class GroupSchedule(BaseModel):
+    group_id: int
+    group_name: str
+    lessons: list[ReadLesson]
 
+class ScheduleBatch(BaseModel):
+    groups: list[GroupSchedule]
+    not_found: list[int | str]
@@ -1,22 +1,25 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from .groups import ReadGroup
+from .validators import not_null
 
 
 class CreateSubscription(BaseModel):
     user_id: int
     week_type: str
-    group: ReadGroup | None
+    group_id: int
 
 class UpdateSubscription(BaseModel):
-    week_type: str
-    group: ReadGroup | None
-    is_active: bool
+    week_type: str | None = None
+    group_id: int | None = None
+    is_active: bool | None = None
+
+    _not_null = not_null("group_id", "is_active")
 
 class ReadSubscription(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     user_id: int
     id: int
-    week_type: str
+    week_type: str | None
     is_active: bool
     group: ReadGroup | None
-
-
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from .subscriptions import ReadSubscription
+from .validators import not_null
 
 
 class CreateUser(BaseModel):
@@ -9,14 +10,18 @@ class CreateUser(BaseModel):
     last_name: str
 
 class UpdateUser(BaseModel):
-    username: str
-    first_name: str
-    last_name: str
+    username: str | None = None
+    first_name: str | None = None
+    last_name: str | None = None
+
+    _not_null = not_null("username")
 
 class ReadUser(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     chat_id: int
     username: str
-    first_name: str
-    last_name: str
+    first_name: str | None
+    last_name: str | None
     subscription: ReadSubscription | None
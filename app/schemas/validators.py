@@ -0,0 +1,11 @@
+from pydantic import field_validator
+
+
+def not_null(*fields: str):
+    """Validator for update fields of NOT NULL columns: the field may be omitted, but not set to null."""
+    def check(cls, value):
+        if value is None:
+            raise ValueError("must not be null")
+        return value
+
+    return field_validator(*fields)(classmethod(check))
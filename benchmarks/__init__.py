@@ -0,0 +1 @@
+"""Бенчмарки LectureNotifier на синтетичних розкладах та підписниках (python -m benchmarks.run)."""
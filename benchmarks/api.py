@@ -0,0 +1,119 @@
+"""Бенчмарки списочних ендпоїнтів API (повний прохід курсорною пагінацією), пакетного розкладу
+груп проти запиту на кожну групу та потокового експорту уроків.
+
+Потрібен httpx (ASGI-клієнт). DATABASE_URL має вказувати на порожню тимчасову БД ще до імпорту модуля."""
+import random
+
+import httpx
+
+from app.core.database import AsyncSessionLocal, init_db
+from app.main import app
+from app.migrations import migrate_db
+from app.models import Group, Lesson, Subscription, User
+from app.repositories import Repository, unit_of_work
+
+from .generators import make_group_names
+from .timing import ameasure
+
+ENDPOINTS = ("/v1/groups/", "/v1/lessons/", "/v1/users/", "/v1/subscription/")
+
+
+async def populate(groups: int, users: int, lessons_per_group: int = 30, seed: int = 1):
+    """Заповнює БД API групами, уроками, користувачами та їх підписками."""
+    rnd = random.Random(seed)
+    async with AsyncSessionLocal() as session:
+        async with unit_of_work(session):
+            await Repository(Group, session).create_many([
+                {"name": name, "specialty": name.split("-")[0], "course": int(name.split("-")[1][0])}
+                for name in make_group_names(groups)
+            ])
+            await Repository(Lesson, session).create_many([
+                {"group_id": group_id, "week_day": slot // 10 % 5, "lesson_number": slot % 5 + 1,
+                 "week_type": ("numerator", "denominator")[slot // 5 % 2], "subject": f"Предмет {rnd.randint(1, 50)}",
+                 "teacher": f"Викладач {rnd.randint(1, 80)}", "room": str(rnd.randint(1, 300)),
+                 "start_time": "08:00", "end_time": "09:20"}
+                for group_id in range(1, groups + 1) for slot in range(lessons_per_group)
+            ])
+            await Repository(User, session).create_many([
+                {"chat_id": 100_000 + index, "username": f"user{index}"} for index in range(users)
+            ])
+            await Repository(Subscription, session).create_many([
+                {"user_id": index + 1, "group_id": rnd.randint(1, groups), "week_type": "numerator"}
+                for index in range(users)
+            ])
+
+
+async def paginate(client: httpx.AsyncClient, endpoint: str, limit: int = 500) -> int:
+    """Проходить увесь список ендпоїнта сторінками по `limit`; повертає кількість записів."""
+    count, after = 0, None
+    while True:
+        params = {"limit": limit} if after is None else {"limit": limit, "after": after}
+        response = await client.get(endpoint, params=params)
+        response.raise_for_status()
+        page = response.json()
+        count += len(page["items"])
+        after = page["next_cursor"]
+        if after is None:
+            return count
+
+
+async def fetch_per_group(client: httpx.AsyncClient, groups: int) -> int:
+    """Розклад усіх груп окремим запитом на кожну групу."""
+    count = 0
+    for group_id in range(1, groups + 1):
+        response = await client.get("/v1/lessons/", params={"group_id": group_id, "limit": 500})
+        response.raise_for_status()
+        count += len(response.json()["items"])
+    return count
+
+
+async def fetch_batch(client: httpx.AsyncClient, groups: int, size: int = 500) -> int:
+    """Розклад усіх груп пакетними запитами по `size` груп."""
+    count = 0
+    for start in range(1, groups + 1, size):
+        response = await client.post("/v1/lessons/batch", json={
+            "group_ids": list(range(start, min(start + size, groups + 1))),
+        })
+        response.raise_for_status()
+        count += sum(len(group["lessons"]) for group in response.json()["groups"])
+    return count
+
+
+async def export(client: httpx.AsyncClient, export_format: str) -> int:
+    """Читає потоковий експорт уроків; повертає кількість рядків."""
+    lines = 0
+    async with client.stream("GET", "/v1/lessons/export", params={"format": export_format}) as response:
+        response.raise_for_status()
+        async for _ in response.aiter_lines():
+            lines += 1
+    return lines
+
+
+async def run_suite(groups: int, subscribers_per_group: int, work_dir: str, repeat: int = 5) -> list[dict]:
+    """Проганяє бенчмарки API для одного масштабу та повертає список результатів."""
+    scale = {"groups": groups, "subscribers": groups * subscribers_per_group}
+    await init_db()
+    await migrate_db()
+    await populate(groups, scale["subscribers"])
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for endpoint in ENDPOINTS:
+            rows = await paginate(client, endpoint)
+            result = await ameasure(f"api.list{endpoint.rstrip('/').replace('/', '.')}",
+                                    lambda: paginate(client, endpoint), repeat, rows=rows)
+            results.append(result)
+
+        rows = await fetch_batch(client, groups)
+        results.append(await ameasure("api.schedule.per_group", lambda: fetch_per_group(client, groups), repeat,
+                                      rows=rows))
+        results.append(await ameasure("api.schedule.batch", lambda: fetch_batch(client, groups), repeat, rows=rows))
+        for export_format in ("ndjson", "csv"):
+            results.append(await ameasure(f"api.export.{export_format}", lambda: export(client, export_format), repeat,
+                                          rows=rows))
+
+    for result in results:
+        result["suite"] = "api"
+        result["scale"] = scale
+    return results
@@ -0,0 +1,111 @@
+"""Бенчмарки процесу бота та парсера: парсинг, синхронізація з БД, кеші, розсилка та рендеринг.
+
+DATABASE_URL має вказувати на порожню тимчасову БД ще до імпорту модуля (це робить benchmarks.run)."""
+import random
+import time
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import insert, select
+
+from old_app.bot.schedule_service import ScheduleService
+from old_app.bot.subscriptions_service import SubscriptionService
+from old_app.bot.utils import format_schedule
+from old_app.database import AsyncSessionLocal, Group, Subscription, init_db
+from old_app.schedule.schedule_parser import ScheduleParser
+
+from .generators import make_subscribers, write_sheet
+from .timing import ameasure, measure, summarize
+
+
+async def sync(parser: ScheduleParser, csv_lessons: dict, group_columns: list[str],
+               session_factory=AsyncSessionLocal) -> dict:
+    async with session_factory() as session:
+        async with session.begin():
+            return await parser.sync_engine.sync(session, csv_lessons, group_columns)
+
+
+def mutate(csv_lessons: dict, share: float, seed: int = 1) -> dict:
+    """Копія уроків, де у частці `share` уроків змінено аудиторію."""
+    rnd = random.Random(seed)
+    return {
+        group_name: [
+            {**lesson, "room": f"{lesson['room']}-new"} if rnd.random() < share else lesson
+            for lesson in lessons
+        ]
+        for group_name, lessons in csv_lessons.items()
+    }
+
+
+async def insert_subscribers(subscribers: list[dict], session_factory=AsyncSessionLocal):
+    async with session_factory() as session:
+        group_ids = dict((await session.execute(select(Group.name, Group.id))).all())
+        rows = [
+            {"chat_id": subscriber["chat_id"], "group_id": group_ids[subscriber["group_name"]],
+             "week_type": subscriber["week_type"]}
+            for subscriber in subscribers
+        ]
+        for start in range(0, len(rows), 5000):
+            await session.execute(insert(Subscription), rows[start:start + 5000])
+        await session.commit()
+
+
+async def run_suite(groups: int, subscribers_per_group: int, work_dir: str, repeat: int = 5) -> list[dict]:
+    """Проганяє всі бенчмарки бота для одного масштабу та повертає список результатів."""
+    work_dir = Path(work_dir)
+    scale = {"groups": groups, "subscribers": groups * subscribers_per_group}
+    results = []
+
+    await init_db()
+    sheet_path = write_sheet(work_dir / f"sheet_{groups}.csv", groups=groups)
+    parser = ScheduleParser("benchmark", snapshot_dir=str(work_dir))
+
+    results.append(measure("parser.read_csv", lambda: pd.read_csv(sheet_path, header=1), repeat))
+    df = pd.read_csv(sheet_path, header=1)
+    group_columns, room_columns = await parser.detect_groups_and_rooms(df)
+    results.append(measure("parser.hash_columns", lambda: parser.hash_columns(df), repeat))
+    results.append(measure("parser.parse_lessons", lambda: parser.parse_lessons(df, group_columns, room_columns), repeat))
+    csv_lessons = parser.parse_lessons(df, group_columns, room_columns)
+    lessons_count = sum(len(lessons) for lessons in csv_lessons.values())
+
+    start_time = time.perf_counter()
+    await sync(parser, csv_lessons, group_columns)
+    results.append(summarize("sync.initial", [time.perf_counter() - start_time], lessons=lessons_count))
+    results.append(await ameasure("sync.unchanged", lambda: sync(parser, csv_lessons, group_columns), repeat))
+    changed = mutate(csv_lessons, 0.01)
+    results.append(await ameasure(
+        "sync.changed_1pct", lambda: sync(parser, changed, group_columns), repeat,
+        setup=lambda: sync(parser, csv_lessons, group_columns),
+    ))
+
+    await insert_subscribers(make_subscribers(scale["subscribers"], group_columns))
+
+    schedule_service = ScheduleService()
+    results.append(await ameasure("cache.schedule_load", schedule_service.load_cache, repeat, lessons=lessons_count))
+    subscribe_service = SubscriptionService(journal_path=work_dir / f"subscriptions_{groups}.journal")
+    results.append(await ameasure("cache.subscriptions_load", subscribe_service.load_cache, repeat))
+
+    keys = [(group_name, week_type) for group_name in group_columns for week_type in ("numerator", "denominator")]
+
+    async def fan_out():
+        for group_name, week_type in keys:
+            await subscribe_service.get_users_from_options(group_name, week_type)
+
+    results.append(await ameasure("fanout.lookup_all_groups", fan_out, repeat, lookups=len(keys)))
+
+    weeks = [(await schedule_service.get_week_schedule(group_name, week_type), week_type)
+             for group_name, week_type in keys]
+    results.append(measure(
+        "render.format_week_all_groups", lambda: [format_schedule(days, week_type) for days, week_type in weeks], repeat,
+        renders=len(weeks),
+    ))
+    results.append(measure(
+        "render.cached_week_all_groups",
+        lambda: [schedule_service.get_week_text(group_name, week_type) for group_name, week_type in keys], repeat,
+        renders=len(keys),
+    ))
+
+    for result in results:
+        result["suite"] = "bot"
+        result["scale"] = scale
+    return results
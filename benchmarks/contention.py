@@ -0,0 +1,153 @@
+"""Затримка читань бота під час синхронізації розкладу (LessonSyncEngine.sync) з прагмами SQLite та без них.
+
+`pragmas` - engine застосунку (WAL, synchronous=NORMAL, busy_timeout) та окремий read engine з query_only;
+`plain` - engine без прагм (rollback journal), читання й запис через один пул. Кожен режим має власну БД,
+бо режим WAL зберігається у файлі БД. READERS читачів безперервно виконують запити бота (підписка за chat_id
+та уроки групи на день) спершу без запису, а потім поки синхронізація `repeat` разів застосовує зміну
+частини уроків; для читань записуються p50/p99 та частка помилок "database is locked"."""
+import asyncio
+import random
+import statistics
+import time
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import selectinload, sessionmaker
+
+from app.core.engine import build_engine
+from old_app.database import Group, Lesson, Subscription
+from old_app.database.models import Base
+from old_app.database.migrations import migrate
+from old_app.schedule.schedule_parser import ScheduleParser
+
+from .bot import insert_subscribers, mutate, sync
+from .generators import make_subscribers, write_sheet
+from .timing import summarize
+
+MODES = ("pragmas", "plain")
+READERS = 4
+IDLE_SECONDS = 1.0
+CHANGED_SHARE = 0.2
+
+
+def make_engines(database_url: str, mode: str):
+    """Повертає (engine запису, engine читання) для режиму."""
+    if mode == "pragmas":
+        return build_engine(database_url), build_engine(database_url, read_only=True)
+    engine = create_async_engine(database_url)
+    return engine, engine
+
+
+def latency_summary(name: str, latencies: list[float], errors: int, **extra) -> dict:
+    """p50 (як `seconds`), p99 та максимум затримки читань; `errors` - частка невдалих читань."""
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "name": name,
+        "seconds": round(quantiles[49], 6),
+        "p50": round(quantiles[49], 6),
+        "p99": round(quantiles[98], 6),
+        "max": round(max(latencies), 6),
+        "reads": len(latencies),
+        "error_share": round(errors / (len(latencies) + errors), 4),
+        **extra,
+    }
+
+
+async def read_loop(session_factory, chat_ids: list[int], group_ids: list[int], stop: asyncio.Event,
+                    latencies: list[float], seed: int) -> int:
+    """Виконує читання бота до `stop`, додає затримки успішних читань і повертає кількість помилок."""
+    rnd = random.Random(seed)
+    errors = 0
+    while not stop.is_set():
+        start_time = time.perf_counter()
+        try:
+            async with session_factory() as session:
+                await session.execute(
+                    select(Subscription).where(Subscription.chat_id == rnd.choice(chat_ids))
+                    .options(selectinload(Subscription.group))
+                )
+                await session.execute(select(Lesson).where(
+                    Lesson.group_id == rnd.choice(group_ids), Lesson.week_type == "numerator",
+                    Lesson.week_day == rnd.randrange(5),
+                ))
+        except OperationalError:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - start_time)
+        await asyncio.sleep(0)
+    return errors
+
+
+async def measure_reads(read_factory, chat_ids: list[int], group_ids: list[int], workload) -> tuple[list[float], int]:
+    """Запускає READERS читачів на час виконання корутини `workload`."""
+    stop, latencies = asyncio.Event(), []
+    readers = [
+        asyncio.create_task(read_loop(read_factory, chat_ids, group_ids, stop, latencies, seed))
+        for seed in range(READERS)
+    ]
+    try:
+        await workload()
+    finally:
+        stop.set()
+    errors = sum(await asyncio.gather(*readers))
+    return latencies, errors
+
+
+async def run_mode(mode: str, work_dir: Path, sheet_path: Path, subscribers: int, repeat: int) -> list[dict]:
+    database_url = f"sqlite+aiosqlite:///{work_dir / f'contention_{sheet_path.stem}_{mode}.db'}"
+    engine, read_engine = make_engines(database_url, mode)
+    write_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    read_factory = sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(migrate)
+
+    parser = ScheduleParser("benchmark", snapshot_dir=str(work_dir))
+    df = pd.read_csv(sheet_path, header=1)
+    group_columns, room_columns = await parser.detect_groups_and_rooms(df)
+    csv_lessons = parser.parse_lessons(df, group_columns, room_columns)
+    changed = mutate(csv_lessons, CHANGED_SHARE)
+    await sync(parser, csv_lessons, group_columns, write_factory)
+    await insert_subscribers(make_subscribers(subscribers, group_columns), write_factory)
+
+    async with read_factory() as session:
+        group_ids = list(await session.scalars(select(Group.id)))
+        chat_ids = list(await session.scalars(select(Subscription.chat_id)))
+
+    latencies, errors = await measure_reads(read_factory, chat_ids, group_ids, lambda: asyncio.sleep(IDLE_SECONDS))
+    results = [latency_summary(f"contention.{mode}.read_idle", latencies, errors)]
+
+    sync_timings = []
+
+    async def sync_workload():
+        for index in range(repeat):
+            start_time = time.perf_counter()
+            await sync(parser, changed if index % 2 == 0 else csv_lessons, group_columns, write_factory)
+            sync_timings.append(time.perf_counter() - start_time)
+
+    latencies, errors = await measure_reads(read_factory, chat_ids, group_ids, sync_workload)
+    results.append(latency_summary(f"contention.{mode}.read_during_sync", latencies, errors))
+    results.append(summarize(f"contention.{mode}.sync", sync_timings, changed_share=CHANGED_SHARE))
+
+    await engine.dispose()
+    await read_engine.dispose()
+    return results
+
+
+async def run_suite(groups: int, subscribers_per_group: int, work_dir: str, repeat: int = 5) -> list[dict]:
+    """Затримка читань під час синхронізації для кожного режиму SQLite на одному масштабі."""
+    work_dir = Path(work_dir)
+    scale = {"groups": groups, "subscribers": groups * subscribers_per_group}
+    sheet_path = write_sheet(work_dir / f"sheet_{groups}.csv", groups=groups)
+
+    results = []
+    for mode in MODES:
+        results.extend(await run_mode(mode, work_dir, sheet_path, scale["subscribers"], repeat))
+
+    for result in results:
+        result["suite"] = "contention"
+        result["scale"] = scale
+    return results
@@ -0,0 +1,84 @@
+import csv
+import io
+import random
+from pathlib import Path
+
+DAYS = ["Пн", "Вт", "Ср", "Чт", "Пт", "Сб"]
+LESSON_NUMBERS = ["I", "II", "III", "IV", "V", "VI", "VII", "VIII"]
+WEEK_TYPES = ["чис.", "знам."]
+SPECIALTIES = ["ІТ", "КН", "ПЗ", "ВМ", "ЕК", "МЕН", "ФІН", "ТВ", "ХТ", "БТ"]
+
+
+def make_group_names(groups: int) -> list[str]:
+    """Назви груп у форматі розкладу: спеціальність-курс+номер (ІТ-21, ВМ-103, ...)."""
+    names = []
+    number = 0
+    while len(names) < groups:
+        specialty = SPECIALTIES[number % len(SPECIALTIES)]
+        course, index = divmod(number // len(SPECIALTIES), 9)
+        names.append(f"{specialty}-{course % 6 + 1}{index + 1}" + ("" if course < 6 else f"/{course // 6}"))
+        number += 1
+    return names
+
+
+def make_sheet(groups: int = 300, weeks: int = 2, days: int = 5, lessons_per_day: int = 5, subjects: int = 50,
+               teachers: int = 80, rooms: int = 300, density: float = 0.6, seed: int = 1) -> str:
+    """Генерує CSV розкладу у форматі опублікованої Google-таблиці, який очікує ScheduleParser.
+
+    Перший рядок - заголовок аркуша, другий - шапка колонок (день, пара, час, "Шифр групи"
+    та пари колонок група/аудиторія). Кожна пара займає два рядки: предмет і час початку,
+    потім викладач, аудиторія та час кінця. `weeks` - кількість типів тижня (1 або 2),
+    `density` - частка заповнених клітинок."""
+    rnd = random.Random(seed)
+    names = make_group_names(groups)
+
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["Розклад"] + [""] * (4 + 2 * groups))
+    header = ["", "", "", "", "Шифр групи"]
+    for name in names:
+        header += [name, name]
+    writer.writerow(header)
+
+    for day in DAYS[:days]:
+        for position, number in enumerate(LESSON_NUMBERS[:lessons_per_day]):
+            start_minutes = 8 * 60 + position * 100
+            start, end = divmod(start_minutes, 60), divmod(start_minutes + 80, 60)
+            for week_type in WEEK_TYPES[:weeks]:
+                main = ["", day, number, f"{start[0]}:{start[1]:02d}", week_type]
+                teacher = ["", "", "", f"{end[0]}:{end[1]:02d}", ""]
+                for _ in names:
+                    if rnd.random() < density:
+                        main += [f"Предмет {rnd.randint(1, subjects)}", ""]
+                        room = str(rnd.randint(1, rooms)) if rnd.random() < 0.9 else ""
+                        teacher += [f"Викладач {rnd.randint(1, teachers)}", room]
+                    else:
+                        main += ["", ""]
+                        teacher += ["", ""]
+                writer.writerow(main)
+                writer.writerow(teacher)
+    return out.getvalue()
+
+
+def write_sheet(path: str | Path, **kwargs) -> Path:
+    """Записує згенерований розклад у файл і повертає шлях."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(make_sheet(**kwargs), encoding="utf-8")
+    return path
+
+
+def make_subscribers(count: int, group_names: list[str], numerator_share: float = 0.5, skew: float = 1.0,
+                     seed: int = 1) -> list[dict]:
+    """Генерує підписки чатів: популярніші групи отримують більше підписників (закон Ципфа з `skew`)."""
+    rnd = random.Random(seed)
+    weights = [1 / (rank + 1) ** skew for rank in range(len(group_names))]
+    chosen = rnd.choices(group_names, weights=weights, k=count)
+    return [
+        {
+            "chat_id": 100_000 + index,
+            "group_name": group_name,
+            "week_type": "numerator" if rnd.random() < numerator_share else "denominator",
+        }
+        for index, group_name in enumerate(chosen)
+    ]
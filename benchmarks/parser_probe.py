@@ -0,0 +1,40 @@
+"""Окремий процес для вимірювання бекенда парсера з нуля: python -m benchmarks.parser_probe pandas|csv sheet.csv
+
+Друкує JSON з часом імпорту, часом розбору та піковим RSS процесу."""
+import json
+import resource
+import sys
+import time
+
+
+def probe(backend: str, sheet_path: str) -> dict:
+    start_time = time.perf_counter()
+    if backend == "csv":
+        from old_app.schedule.csv_parser import CsvScheduleParser
+        parser = CsvScheduleParser("benchmark")
+    else:
+        import pandas as pd
+        from old_app.schedule.schedule_parser import ScheduleParser
+        parser = ScheduleParser("benchmark")
+    import_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    if backend == "csv":
+        with open(sheet_path, encoding="utf-8", newline="") as file:
+            _, lessons = parser.parse_lines(file)
+    else:
+        df = pd.read_csv(sheet_path, header=1)
+        group_columns, room_columns = parser.detect_columns(list(df.columns))
+        lessons = parser.parse_lessons(df, group_columns, room_columns)
+    parse_seconds = time.perf_counter() - start_time
+
+    return {
+        "import_seconds": import_seconds,
+        "parse_seconds": parse_seconds,
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "lessons": sum(len(group_lessons) for group_lessons in lessons.values()),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(probe(sys.argv[1], sys.argv[2])))
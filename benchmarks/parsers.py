@@ -0,0 +1,56 @@
+"""Порівняння бекендів парсера (pandas та потоковий csv): час запуску, розбору та піковий RSS.
+
+Кожен вимір - окремий процес benchmarks.parser_probe, щоб імпорт і пам'ять рахувались з нуля.
+Окремо в цьому процесі порівнюються векторний ScheduleParser.parse_lessons та попередній
+послідовний обхід рядків (tests.sheets.process_group) на тому самому DataFrame. Обхід рядків
+на 300 групах триває близько півтори хвилини, тому він вимірюється один раз і лише на масштабах
+до ROW_WALK_MAX_GROUPS груп."""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from old_app.schedule.schedule_parser import ScheduleParser
+from tests.sheets import process_group
+from .generators import write_sheet
+from .timing import measure, summarize, summarize_memory
+
+BACKENDS = ("pandas", "csv")
+ROW_WALK_MAX_GROUPS = 300
+
+
+def run_probe(backend: str, sheet_path: Path) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.parser_probe", backend, str(sheet_path)],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+async def run_suite(groups: int, subscribers_per_group: int, work_dir: str, repeat: int = 5) -> list[dict]:
+    """Проганяє probe кожного бекенда `repeat` разів для одного масштабу."""
+    scale = {"groups": groups, "subscribers": groups * subscribers_per_group}
+    sheet_path = write_sheet(Path(work_dir) / f"sheet_{groups}.csv", groups=groups)
+
+    df = pd.read_csv(sheet_path, header=1)
+    group_columns, room_columns = ScheduleParser.detect_columns(list(df.columns))
+    results = [measure("parser_pandas.parse_lessons",
+                       lambda: ScheduleParser.parse_lessons(df, group_columns, room_columns), repeat)]
+    if groups <= ROW_WALK_MAX_GROUPS:
+        results.append(measure("parser_pandas.parse_rows", lambda: {
+            group_name: process_group(df, group_name, room_columns.get(group_name)) for group_name in group_columns
+        }, repeat=1))
+    for backend in BACKENDS:
+        probes = [run_probe(backend, sheet_path) for _ in range(repeat)]
+        lessons = probes[0]["lessons"]
+        results.append(summarize(f"parser_{backend}.import", [probe["import_seconds"] for probe in probes]))
+        results.append(summarize(f"parser_{backend}.parse", [probe["parse_seconds"] for probe in probes],
+                                 lessons=lessons))
+        results.append(summarize_memory(f"parser_{backend}.max_rss_kb", [probe["max_rss_kb"] for probe in probes]))
+
+    for result in results:
+        result["suite"] = "parsers"
+        result["scale"] = scale
+    return results
@@ -0,0 +1,107 @@
+"""Запуск бенчмарків: python -m benchmarks.run --groups 50 300 500 --output results.json
+
+Кожен набір (bot, api, parsers, webhook, contention) на кожному масштабі виконується в окремому процесі з власною
+тимчасовою SQLite БД, бо обидва застосунки беруть DATABASE_URL з оточення під час імпорту.
+Результати зберігаються в JSON; з --compare виводиться порівняння з попереднім запуском."""
+import argparse
+import asyncio
+import importlib
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from loguru import logger
+
+SUITES = ("bot", "api", "parsers", "webhook", "contention")
+METRIC_FORMATS = {"seconds": "{:.4f}s", "max_rss_kb": "{:.0f} KB"}
+
+
+def run_in_process(suite: str, database_url: str, **params) -> list[dict]:
+    """Виконується в дочірньому процесі: налаштовує БД та запускає набір."""
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.pop("DATABASE_READ_URL", None)
+    module = importlib.import_module(f"benchmarks.{suite}")
+    return asyncio.run(module.run_suite(**params))
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metric(result: dict) -> tuple[str, float]:
+    """Головна величина результату: час (`seconds`) або пам'ять (`max_rss_kb`)."""
+    key = next(key for key in METRIC_FORMATS if key in result)
+    return key, result[key]
+
+
+def format_metric(key: str, value: float) -> str:
+    return METRIC_FORMATS[key].format(value)
+
+
+def compare(results: list[dict], previous_path: Path):
+    """Виводить відношення до попереднього запуску для однакових бенчмарків, масштабів і величин."""
+    previous = {
+        (result["suite"], result["name"], result["scale"]["groups"]): metric(result)
+        for result in json.loads(previous_path.read_text())["results"]
+    }
+    for result in results:
+        key, value = metric(result)
+        before_key, before = previous.get((result["suite"], result["name"], result["scale"]["groups"]), (key, None))
+        if before and before_key == key:
+            logger.info(f"{result['suite']}:{result['name']} [{result['scale']['groups']} groups] "
+                        f"{format_metric(key, before)} -> {format_metric(key, value)} (x{value / before:.2f})")
+
+
+def main():
+    arguments = argparse.ArgumentParser(description="LectureNotifier benchmarks")
+    arguments.add_argument("--groups", type=int, nargs="+", default=[50, 300, 500])
+    # 500 груп x 200 = 100k підписників, масштаб розсилки, на який розраховано бота.
+    arguments.add_argument("--subscribers-per-group", type=int, default=200)
+    arguments.add_argument("--repeat", type=int, default=5)
+    arguments.add_argument("--suites", nargs="+", choices=SUITES, default=list(SUITES))
+    arguments.add_argument("--output", type=Path, default=Path(f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json"))
+    arguments.add_argument("--compare", type=Path)
+    args = arguments.parse_args()
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as work_dir:
+        for groups in args.groups:
+            for suite in args.suites:
+                logger.info(f"Running {suite} benchmarks for {groups} groups...")
+                database_url = f"sqlite+aiosqlite:///{Path(work_dir) / f'{suite}_{groups}.db'}"
+                with context.Pool(1) as pool:
+                    suite_results = pool.apply(run_in_process, (suite, database_url), {
+                        "groups": groups,
+                        "subscribers_per_group": args.subscribers_per_group,
+                        "work_dir": work_dir,
+                        "repeat": args.repeat,
+                    })
+                for result in suite_results:
+                    logger.info(f"{suite}:{result['name']} {format_metric(*metric(result))}")
+                results.extend(suite_results)
+
+    args.output.write_text(json.dumps({
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }, ensure_ascii=False, indent=2))
+    logger.success(f"Results saved to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import statistics
+import time
+
+
+def summarize(name: str, timings: list[float], **extra) -> dict:
+    """Результат одного вимірювання: медіана, мінімум та кількість повторів у секундах."""
+    return {
+        "name": name,
+        "seconds": round(statistics.median(timings), 6),
+        "min": round(min(timings), 6),
+        "repeat": len(timings),
+        **extra,
+    }
+
+
+def summarize_memory(name: str, rss_kb: list[int], **extra) -> dict:
+    """Результат вимірювання пам'яті: пікова RSS у кілобайтах серед повторів, без `seconds`."""
+    return {"name": name, "max_rss_kb": max(rss_kb), "repeat": len(rss_kb), **extra}
+
+
+def measure(name: str, func, repeat: int = 5, **extra) -> dict:
+    """Вимірює синхронну функцію `repeat` разів."""
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start_time)
+    return summarize(name, timings, **extra)
+
+
+async def ameasure(name: str, func, repeat: int = 5, setup=None, **extra) -> dict:
+    """Вимірює корутинну функцію `repeat` разів; `setup` (теж корутина) виконується перед кожним повтором."""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            await setup()
+        start_time = time.perf_counter()
+        await func()
+        timings.append(time.perf_counter() - start_time)
+    return summarize(name, timings, **extra)
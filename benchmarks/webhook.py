@@ -0,0 +1,82 @@
+"""Бенчмарк webhook-режиму бота з локальним фейковим сервером Telegram Bot API (tests.fake_telegram).
+
+Фейковий сервер відповідає на запити бота із затримкою та записує надіслані тексти по чатах. Кожен чат надсилає свої оновлення послідовно, чати - паралельно; вимірюється час до
+обробки всіх оновлень для різної кількості воркерів і перевіряється порядок відповідей у чатах."""
+import asyncio
+import time
+
+from aiogram import Bot, Dispatcher
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiohttp import ClientSession, web
+
+from old_app.bot.webhook import WebhookServer
+from tests.fake_telegram import FakeTelegramServer, make_update
+from .timing import summarize
+
+WORKERS = (1, 4, 16)
+UPDATES_PER_CHAT = 10
+
+
+async def send_updates(url: str, chats: int) -> float:
+    """Надсилає UPDATES_PER_CHAT оновлень кожного чату по порядку. Повертає частку відхилених (503)."""
+    rejected = 0
+
+    async def send_chat(session: ClientSession, chat_id: int):
+        nonlocal rejected
+        for index in range(UPDATES_PER_CHAT):
+            update = make_update(chat_id * UPDATES_PER_CHAT + index, chat_id, str(index))
+            while True:
+                async with session.post(url, json=update) as response:
+                    if response.status == 200:
+                        break
+                    rejected += 1
+
+    async with ClientSession() as session:
+        await asyncio.gather(*(send_chat(session, chat_id) for chat_id in range(1, chats + 1)))
+    return rejected / (chats * UPDATES_PER_CHAT)
+
+
+async def run_workers(api_base: str, telegram: FakeTelegramServer, workers: int, chats: int, repeat: int) -> dict:
+    bot = Bot("123456:BENCHMARK", session=AiohttpSession(api=TelegramAPIServer.from_base(api_base)))
+    dispatcher = Dispatcher()
+
+    @dispatcher.message()
+    async def echo(message):
+        await message.answer(message.text)
+
+    webhook = WebhookServer(bot, dispatcher, workers=workers, queue_size=workers * 64, enqueue_timeout=1)
+    runner = web.AppRunner(webhook.web_app())
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    url = f"http://127.0.0.1:{runner.addresses[0][1]}{webhook.path}"
+
+    timings, rejected, ordered = [], 0.0, True
+    expected = [str(index) for index in range(UPDATES_PER_CHAT)]
+    for _ in range(repeat):
+        telegram.messages.clear()
+        await webhook.start()
+        start_time = time.perf_counter()
+        rejected = max(rejected, await send_updates(url, chats))
+        await webhook.stop()
+        timings.append(time.perf_counter() - start_time)
+        ordered = ordered and all(telegram.messages[chat_id] == expected for chat_id in range(1, chats + 1))
+
+    await runner.cleanup()
+    await bot.session.close()
+    return summarize(f"webhook.workers_{workers}", timings, updates=chats * UPDATES_PER_CHAT,
+                     ordered=ordered, rejected_share=round(rejected, 4))
+
+
+async def run_suite(groups: int, subscribers_per_group: int, work_dir: str, repeat: int = 5) -> list[dict]:
+    """Обробка оновлень від `groups` чатів (по UPDATES_PER_CHAT кожен) для різної кількості воркерів."""
+    scale = {"groups": groups, "subscribers": groups * subscribers_per_group}
+    telegram = FakeTelegramServer()
+    api_base = await telegram.start()
+    results = [await run_workers(api_base, telegram, workers, groups, repeat) for workers in WORKERS]
+    await telegram.stop()
+
+    for result in results:
+        result["suite"] = "webhook"
+        result["scale"] = scale
+    return results
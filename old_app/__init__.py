@@ -1 +1 @@
-from .config import BOT_TOKEN, SCHEDULE_ID, DATABASE_URL
\ No newline at end of file
+from .config import BOT_TOKEN, SCHEDULE_ID, DATABASE_URL, SCHEDULE_URL, SCHEDULE_CACHE_DIR
\ No newline at end of file
@@ -1,4 +1,5 @@
 from .bot import NotifierBot
 from .subscriptions_service import SubscriptionService
 from .schedule_service import ScheduleService
-from .keyboards import Keyboards
\ No newline at end of file
+from .keyboards import Keyboards
+from .webhook import WebhookServer
@@ -1,66 +1,87 @@
 import asyncio
+import queue
 from loguru import logger
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from app.core.profiling import profiler
 
 from old_app.bot.utils import format_lesson
+from old_app.bot.notification_dispatcher import NotificationDispatcher
+from old_app.bot.notification_scheduler import NotificationScheduler
+from old_app.metrics import CACHE_SIZE, NOTIFICATION_MESSAGES, NOTIFICATION_RECIPIENTS, NOTIFICATION_SECONDS
 
 
 class NotifierBot:
     """Telegram bot для розкладу та підписок."""
 
-    def __init__(self, bot, dispatcher, subscribe_service, schedule_service):
-        """Ініціалізація бота, диспетчера та сервісів."""
+    def __init__(self, bot, dispatcher, subscribe_service, schedule_service, keyboards, changes=None, webhook=None):
+        """Ініціалізація бота, диспетчера та сервісів.
+        `changes` - черга змін розкладу від процесу парсера,
+        `webhook` - WebhookServer для отримання оновлень через webhook замість polling."""
         self.bot = bot
         self.dispatcher = dispatcher
+        self.changes = changes
+        self.webhook = webhook
 
         self.subscribe_service = subscribe_service
         self.schedule_service = schedule_service
+        self.keyboards = keyboards
+
+        self.notification_dispatcher = NotificationDispatcher(bot, on_blocked=self.subscribe_service.remove_user)
+
+        self.scheduler = NotificationScheduler(self.send_lesson_messages)
+        self._register_cache_metrics()
 
-        self.scheduler = AsyncIOScheduler()
-        self.scheduler.start()
+    def _register_cache_metrics(self):
+        """Розміри кешів рахуються лише під час збору метрик."""
+        for service in (self.schedule_service, self.subscribe_service):
+            for name in service.cache_sizes():
+                CACHE_SIZE.labels(name).set_function(lambda service=service, name=name: service.cache_sizes()[name])
 
+    @profiler.profiled("bot.send_lesson_messages")
     async def send_lesson_messages(self, group_name: str, week_type: str, lesson_id: int):
         users_ids = await self.subscribe_service.get_users_from_options(group_name, week_type)
 
-        if users_ids is None:
+        if not users_ids:
             return
 
         lesson = await self.schedule_service.get_lesson(lesson_id)
+        if lesson is None:
+            return
 
-        for user_id in users_ids:
-            text = await format_lesson(lesson)
-            await  self.bot.send_message(chat_id=user_id, text=f"Наступна пара:\n{text}")
-
-    async def _ggg(self):
-        schedules = await self.schedule_service.get_test_data()
-        for group_name, schedule in schedules.items():
-            for lesson in schedule:
-                hour, minute = map(int, lesson.start_time.split(":"))
-                day_of_week = lesson.day_of_week
-                job_id = f"{group_name}:{lesson.week_type}:{lesson.id}"
-                self.scheduler.add_job(
-                    self.send_lesson_messages,
-                    trigger="cron",
-                    id=job_id,
-                    day_of_week=day_of_week,
-                    hour=hour,
-                    minute=minute - 5,
-                    args=[group_name, lesson.week_type, lesson.id],
-                )
-
-    # async def _background_sync_cache(self, interval: int = 12 * 60 * 60):
-    #     """Фонове оновлення кешу кожні `interval` секунд"""
-    #     while True:
-    #         try:
-    #             logger.info("Starting cache synchronization...")
-    #             await self.subscribe_service.load_cache()
-    #             await self.schedule_service.load_cache()
-    #             logger.info(f"Next synchronization in {interval // (60 * 60)} hours.")
-    #             await self._ggg()
-    #         except Exception as e:
-    #             logger.error(f"Error during cache synchronization and try again: {e}")
-    #             continue
-    #         await asyncio.sleep(interval)
+        text = f"Наступна пара:\n{format_lesson(lesson)}"
+        stats = await self.notification_dispatcher.send(users_ids, text)
+        NOTIFICATION_SECONDS.observe(stats["duration"])
+        NOTIFICATION_RECIPIENTS.observe(stats["total"])
+        for result in ("sent", "failed", "blocked", "retried"):
+            NOTIFICATION_MESSAGES.labels(result).inc(stats[result])
+        logger.info(f"Lesson {lesson_id} for {group_name} ({week_type}) delivered: {stats}")
+
+    async def schedule_notifications(self):
+        """Будує шкалу сповіщень з кешу розкладу."""
+        schedules = await self.schedule_service.get_all_schedule()
+        self.scheduler.load(lesson for lessons in schedules.values() for lesson in lessons)
+
+    async def apply_changes(self, changes: dict):
+        """Застосовує зміни розкладу до кешів та шкали сповіщень без повного перезавантаження."""
+        updated, removed_ids = await self.schedule_service.apply_changes(changes["groups"], changes["removed_groups"])
+        self.subscribe_service.drop_groups(changes["removed_groups"])
+        self.keyboards.update_groups(changes["groups"], changes["removed_groups"])
+        self.scheduler.remove_lessons(removed_ids)
+        self.scheduler.update_lessons(updated)
+        logger.info(f"Schedule changes applied: {len(changes['groups'])} groups, "
+                    f"{len(updated)} lessons updated, {len(removed_ids)} removed")
+
+    async def _listen_changes(self):
+        """Фоново отримує зміни розкладу від парсера."""
+        while True:
+            try:
+                changes = await asyncio.to_thread(self.changes.get, timeout=1)
+            except queue.Empty:
+                continue
+            try:
+                await self.apply_changes(changes)
+            except Exception as e:
+                logger.error(f"Error while applying schedule changes: {e}")
 
     async def run(self):
         """Запускає бота."""
@@ -68,10 +89,23 @@ class NotifierBot:
 
         await self.subscribe_service.load_cache()
         await self.schedule_service.load_cache()
-
-        await self._ggg()
-
-        await self.dispatcher.start_polling(self.bot)
-        await self.bot.session.close()
+        await self.keyboards.load_groups()
+
+        await self.schedule_notifications()
+        tasks = [asyncio.create_task(self.scheduler.run()), asyncio.create_task(self.subscribe_service.run())]
+        if self.changes is not None:
+            tasks.append(asyncio.create_task(self._listen_changes()))
+
+        try:
+            if self.webhook is not None:
+                await self.webhook.run()
+            else:
+                await self.bot.delete_webhook()
+                await self.dispatcher.start_polling(self.bot)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await self.subscribe_service.close()
+            await self.bot.session.close()
 
         logger.info("Bot stopped")
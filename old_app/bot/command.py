@@ -1,8 +1,16 @@
 import json
 
-from aiogram.filters import Command
-from aiogram import types
-from .utils import require_subscription, format_schedule
+from aiogram.enums import ChatType
+from aiogram.filters import Command, CommandObject
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State, StatesGroup
+from aiogram import Bot, F, types
+from .utils import require_subscription
+
+
+class SearchStates(StatesGroup):
+    """Стан після /search без тексту: наступне повідомлення - запит пошуку групи."""
+    query = State()
 
 
 class CommandHandlers:
@@ -21,15 +29,23 @@ class CommandHandlers:
             ("start", self.command_start),
             ("change", self.command_settings),
             ("today", self.command_today),
-            ("week", self.command_week)
+            ("week", self.command_week),
+            ("search", self.command_search),
         ]
         for cmd_name, handler in commands:
             self.dispatcher.message.register(handler, Command(cmd_name))
 
+        # Звичайний текст - не пошук: шукаємо лише в приватному чаті після /search або
+        # коли користувач обрав групу з inline-пошуку цього бота.
+        private_text = (F.chat.type == ChatType.PRIVATE, F.text, ~F.text.startswith("/"))
+        self.dispatcher.message.register(self.search_group, *private_text, SearchStates.query)
+        self.dispatcher.message.register(self.search_group, *private_text, self.is_own_inline_result)
+        self.dispatcher.inline_query.register(self.inline_search_group)
+
     @require_subscription
     async def command_start(self, message: types.Message, user_data, *args, **kwargs):
         """Обробляє команду /start."""
-        await message.answer(f"Привіт! Ти підписаний на групу {user_data["group_name"]}")
+        await message.answer(f"Привіт! Ти підписаний на групу {user_data['group_name']}")
 
     @require_subscription
     async def command_settings(self, message: types.Message, *args, **kwargs):
@@ -40,13 +56,50 @@ class CommandHandlers:
     @require_subscription
     async def command_today(self, message: types.Message, user_data, *args, **kwargs):
         """Відправляє розклад на сьогодні."""
-        schedule = await self.schedule_service.get_today_schedule(group_name=user_data["group_name"], week_type=user_data["week_type"])
-        message_text = await format_schedule(schedule=schedule, week_type=user_data["week_type"])
+        message_text = self.schedule_service.get_today_text(group_name=user_data["group_name"], week_type=user_data["week_type"])
         await message.answer(message_text)
 
     @require_subscription
     async def command_week(self, message: types.Message, user_data, *args, **kwargs):
         """Відправляє розклад на тиждень."""
-        schedule = await self.schedule_service.get_week_schedule(group_name=user_data["group_name"], week_type=user_data["week_type"])
-        message_text = await format_schedule(schedule=schedule, week_type=user_data["week_type"])
+        message_text = self.schedule_service.get_week_text(group_name=user_data["group_name"], week_type=user_data["week_type"])
         await message.answer(message_text)
+
+    @staticmethod
+    def is_own_inline_result(message: types.Message, bot: Bot) -> bool:
+        """Повідомлення надіслане через inline-пошук саме цього бота."""
+        return message.via_bot is not None and message.via_bot.id == bot.id
+
+    async def command_search(self, message: types.Message, command: CommandObject, state: FSMContext):
+        """Обробляє /search <назва>; без назви чекає на неї наступним повідомленням."""
+        if command.args:
+            await self.answer_search(message, command.args)
+            return
+        await state.set_state(SearchStates.query)
+        await message.answer("Введіть назву групи:")
+
+    async def search_group(self, message: types.Message, state: FSMContext):
+        """Шукає групу за введеним текстом і пропонує найкращі збіги."""
+        await state.clear()
+        await self.answer_search(message, message.text)
+
+    async def answer_search(self, message: types.Message, query: str):
+        """Відповідає клавіатурою з найкращими збігами пошуку або повідомленням, що групу не знайдено."""
+        markup = await self.keyboards.search_keyboard(query)
+        if markup is None:
+            await message.answer("Групу не знайдено 🤯")
+            return
+        await message.answer("Оберіть групу для підписки:", reply_markup=markup)
+
+    async def inline_search_group(self, inline_query: types.InlineQuery, *args, **kwargs):
+        """Inline-пошук групи: обрана група надсилається в чат як текст через бота і потрапляє в search_group."""
+        group_names = self.keyboards.search_index.search(inline_query.query)
+        results = [
+            types.InlineQueryResultArticle(
+                id=str(index),
+                title=group_name,
+                input_message_content=types.InputTextMessageContent(message_text=group_name),
+            )
+            for index, group_name in enumerate(group_names)
+        ]
+        await inline_query.answer(results, cache_time=60)
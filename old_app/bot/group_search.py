@@ -0,0 +1,76 @@
+import bisect
+import re
+
+SEPARATORS = re.compile(r"[\s\-_.,/()]+")
+LOOKALIKES = str.maketrans("aceiopxyktmhb", "асеіорхуктмнв")
+
+
+class GroupSearchIndex:
+    """Пошук групи за назвою: префікс повної назви, префікс будь-якої її частини та нечіткий збіг.
+
+    Ключі нормалізуються (регістр, роздільники, латинські літери-двійники кирилиці),
+    тому "іт-2", "IT 2" та "it2" знаходять "ІТ-21". Префіксний пошук - бінарний по
+    відсортованому списку ключів, групи додаються та видаляються без перебудови індексу."""
+
+    def __init__(self, group_names=()):
+        self._keys: list[tuple[str, str]] = []
+        self._names: dict[str, str] = {}
+        self.add(group_names)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return SEPARATORS.sub("", text.casefold().translate(LOOKALIKES))
+
+    @classmethod
+    def keys_for(cls, group_name: str) -> set[str]:
+        """Ключі групи: повна назва та кожен її суфікс, що починається з нової частини назви."""
+        parts = [cls.normalize(part) for part in SEPARATORS.split(group_name)]
+        parts = [part for part in parts if part]
+        return {"".join(parts[start:]) for start in range(len(parts))} | {cls.normalize(group_name)}
+
+    def add(self, group_names):
+        for group_name in group_names:
+            if group_name in self._names:
+                continue
+            self._names[group_name] = self.normalize(group_name)
+            for key in self.keys_for(group_name):
+                bisect.insort(self._keys, (key, group_name))
+
+    def remove(self, group_names):
+        for group_name in group_names:
+            if self._names.pop(group_name, None) is None:
+                continue
+            for key in self.keys_for(group_name):
+                index = bisect.bisect_left(self._keys, (key, group_name))
+                if index < len(self._keys) and self._keys[index] == (key, group_name):
+                    del self._keys[index]
+
+    def _prefix_matches(self, query: str):
+        index = bisect.bisect_left(self._keys, (query, ""))
+        while index < len(self._keys) and self._keys[index][0].startswith(query):
+            yield self._keys[index][1]
+            index += 1
+
+    @staticmethod
+    def _is_subsequence(query: str, key: str) -> bool:
+        chars = iter(key)
+        return all(char in chars for char in query)
+
+    def search(self, query: str, limit: int = 8) -> list[str]:
+        """Повертає до `limit` назв груп, впорядкованих за якістю збігу."""
+        query = self.normalize(query)
+        if not query:
+            return []
+
+        ranks: dict[str, tuple] = {}
+        for group_name in self._prefix_matches(query):
+            key = self._names[group_name]
+            rank = 0 if key == query else 1 if key.startswith(query) else 2
+            ranks[group_name] = min(ranks.get(group_name, (3,)), (rank, len(key), group_name))
+
+        if len(ranks) < limit:
+            for group_name, key in self._names.items():
+                if group_name not in ranks and self._is_subsequence(query, key):
+                    ranks[group_name] = (3, len(key), group_name)
+
+        return [group_name for group_name, _ in sorted(ranks.items(), key=lambda item: item[1])[:limit]]
@@ -2,7 +2,8 @@ from aiogram import types
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from sqlalchemy.future import select
 from ..database.models import Group
-from ..database.session import AsyncSessionLocal
+from ..database.session import ReadSessionLocal
+from .group_search import GroupSearchIndex
 
 
 class Keyboards:
@@ -16,34 +17,87 @@ class Keyboards:
         "denominator": "Знаменник",
     }
 
-    @staticmethod
-    async def group_keyboard(active_group: str = None, mode: str = 'settings', page: int = 0) -> types.InlineKeyboardMarkup:
-        """Клавіатура для вибору груп з пагінацією і кнопкою повернутися."""
-        async with AsyncSessionLocal() as session:
+    def __init__(self):
+        self._groups: list[str] | None = None
+        self._pages: dict[int, list[list[types.InlineKeyboardButton]]] = {}
+        self.search_index = GroupSearchIndex()
+
+    async def load_groups(self):
+        """Завантажує відсортований список груп з БД та скидає готові клавіатури."""
+        async with ReadSessionLocal() as session:
             result = await session.execute(select(Group.name).order_by(Group.name))
-            groups = result.scalars().all()
+            self.set_groups(result.scalars().all())
 
-        start = page * Keyboards.GROUP_OPTIONS["buttons_per_page"]
-        end = start + Keyboards.GROUP_OPTIONS["buttons_per_page"]
-        page_items = groups[start:end]
+    def set_groups(self, group_names):
+        self._groups = sorted(group_names)
+        self._pages.clear()
+        self.search_index = GroupSearchIndex(self._groups)
 
-        keyboard = InlineKeyboardBuilder()
-        for group_name in page_items:
-            text = f"✅ {group_name}" if group_name == active_group else group_name
-            keyboard.button(text=text, callback_data=f"subscribe:{group_name}")
-        keyboard.adjust(Keyboards.GROUP_OPTIONS["buttons_per_row"])
+    def update_groups(self, group_names: list[str], removed_groups: list[str]):
+        """Додає нові та прибирає видалені групи; клавіатури перебудовуються лише якщо список змінився."""
+        current = set(self._groups or ())
+        added = set(group_names) - current - set(removed_groups)
+        removed = current & set(removed_groups)
+        if self._groups is not None and not added and not removed:
+            return
+        self.search_index.add(added)
+        self.search_index.remove(removed)
+        self._groups = sorted((current | added) - removed)
+        self._pages.clear()
+
+    def _page_rows(self, page: int) -> list[list[types.InlineKeyboardButton]]:
+        """Готові рядки кнопок груп сторінки (без позначки активної групи та навігації)."""
+        rows = self._pages.get(page)
+        if rows is None:
+            start = page * Keyboards.GROUP_OPTIONS["buttons_per_page"]
+            keyboard = InlineKeyboardBuilder()
+            for group_name in self._groups[start:start + Keyboards.GROUP_OPTIONS["buttons_per_page"]]:
+                keyboard.button(text=group_name, callback_data=f"subscribe:{group_name}")
+            keyboard.adjust(Keyboards.GROUP_OPTIONS["buttons_per_row"])
+            rows = self._pages[page] = keyboard.export()
+        return rows
+
+    async def group_keyboard(self, active_group: str = None, mode: str = 'settings', page: int = 0) -> types.InlineKeyboardMarkup:
+        """Клавіатура для вибору груп з пагінацією і кнопкою повернутися.
+        Кнопки сторінки беруться з кешу, для кожного запиту додається лише ✅ та навігація."""
+        if self._groups is None:
+            await self.load_groups()
 
+        rows = [
+            [
+                button.model_copy(update={"text": f"✅ {button.text}"}) if button.text == active_group else button
+                for button in row
+            ]
+            for row in self._page_rows(page)
+        ]
+
+        end = (page + 1) * Keyboards.GROUP_OPTIONS["buttons_per_page"]
         nav_buttons = []
         if page > 0:
             nav_buttons.append(types.InlineKeyboardButton(text="⬅️ Назад", callback_data=f"page:{page - 1}:{mode}:{active_group}"))
-        if end < len(groups):
+        if end < len(self._groups):
             nav_buttons.append(types.InlineKeyboardButton(text="➡️ Вперед", callback_data=f"page:{page + 1}:{mode}:{active_group}"))
         if nav_buttons:
-            keyboard.row(*nav_buttons)
+            rows.append(nav_buttons)
 
         if mode == "setting":
-            keyboard.row(Keyboards.back_keyboard())
+            rows.append([Keyboards.back_keyboard()])
+
+        return types.InlineKeyboardMarkup(inline_keyboard=rows)
+
+    async def search_keyboard(self, query: str, limit: int = 8) -> types.InlineKeyboardMarkup | None:
+        """Клавіатура з найкращими збігами пошуку групи або None, якщо нічого не знайдено."""
+        if self._groups is None:
+            await self.load_groups()
 
+        group_names = self.search_index.search(query, limit)
+        if not group_names:
+            return None
+
+        keyboard = InlineKeyboardBuilder()
+        for group_name in group_names:
+            keyboard.button(text=group_name, callback_data=f"subscribe:{group_name}")
+        keyboard.adjust(Keyboards.GROUP_OPTIONS["buttons_per_row"])
         return keyboard.as_markup()
 
     @staticmethod
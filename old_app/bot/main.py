@@ -1,22 +1,28 @@
+from pathlib import Path
+
 from aiogram import Bot, Dispatcher
 from loguru import logger
 
 from .bot import NotifierBot
+from .webhook import WebhookServer
 from .keyboards import Keyboards
 from .command import CommandHandlers
 from .callback import CallbackHandlers
 from .subscriptions_service import SubscriptionService
 from .schedule_service import ScheduleService
 from ..database import init_db
+from ..metrics import start_metrics_server
 
 
-async def bot_init(token):
+async def bot_init(token, changes=None, cache_dir="cache", metrics_port=None, webhook=None):
+    """`webhook` - параметри WebhookServer (url, port, secret_token, workers, ...); без них - polling."""
     await init_db()
+    start_metrics_server(metrics_port)
     bot = Bot(token)
     dispatcher = Dispatcher()
 
     keyboards = Keyboards()
-    subscribe_service = SubscriptionService()
+    subscribe_service = SubscriptionService(journal_path=Path(cache_dir) / "subscriptions.journal")
     schedule_service = ScheduleService()
 
     CommandHandlers(
@@ -37,6 +43,9 @@ async def bot_init(token):
         dispatcher=dispatcher,
         subscribe_service=subscribe_service,
         schedule_service=schedule_service,
+        keyboards=keyboards,
+        changes=changes,
+        webhook=WebhookServer(bot, dispatcher, **webhook) if webhook is not None else None,
     )
 
     try:
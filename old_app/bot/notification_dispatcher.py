@@ -0,0 +1,113 @@
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from aiogram.exceptions import TelegramAPIError, TelegramForbiddenError, TelegramRetryAfter
+from loguru import logger
+
+
+class TokenBucket:
+    """Token bucket: не більше `rate` подій за секунду з запасом `capacity`."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def is_full(self) -> bool:
+        self._refill()
+        return self.tokens >= self.capacity
+
+    async def acquire(self):
+        """Чекає, поки з'явиться токен, і забирає його."""
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class NotificationDispatcher:
+    """Розсилка одного повідомлення багатьом чатам з обмеженням швидкості Telegram.
+
+    Повідомлення надсилаються пулом воркерів з обмеженою конкурентністю через глобальний
+    та per-chat token bucket. На RetryAfter запит повторюється після вказаної паузи,
+    заблоковані чати передаються в `on_blocked`, помилка одного чату не зупиняє решту."""
+
+    def __init__(self, bot, concurrency: int = 10, global_rate: float = 25, chat_rate: float = 1,
+                 max_retries: int = 3, on_blocked: Callable[[int], Awaitable] | None = None):
+        self.bot = bot
+        self.concurrency = concurrency
+        self.chat_rate = chat_rate
+        self.max_retries = max_retries
+        self.on_blocked = on_blocked
+        self._global_bucket = TokenBucket(global_rate)
+        self._chat_buckets: dict[int, TokenBucket] = {}
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        """Повертає bucket чату; повні (неактивні) bucket-и періодично прибираються."""
+        if len(self._chat_buckets) > 10_000:
+            self._chat_buckets = {key: bucket for key, bucket in self._chat_buckets.items() if not bucket.is_full()}
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._chat_buckets[chat_id] = TokenBucket(self.chat_rate, 1)
+        return bucket
+
+    async def _deliver(self, chat_id: int, text: str, stats: dict):
+        """Надсилає повідомлення одному чату з повторами на RetryAfter."""
+        for attempt in range(self.max_retries + 1):
+            await self._chat_bucket(chat_id).acquire()
+            await self._global_bucket.acquire()
+            try:
+                await self.bot.send_message(chat_id=chat_id, text=text)
+                stats["sent"] += 1
+                return
+            except TelegramRetryAfter as e:
+                if attempt == self.max_retries:
+                    break
+                stats["retried"] += 1
+                await asyncio.sleep(e.retry_after)
+            except TelegramForbiddenError:
+                stats["blocked"] += 1
+                if self.on_blocked:
+                    await self.on_blocked(chat_id)
+                return
+            except TelegramAPIError as e:
+                logger.warning(f"Failed to send message to {chat_id}: {e}")
+                break
+        stats["failed"] += 1
+
+    async def _worker(self, queue: asyncio.Queue, text: str, stats: dict):
+        while True:
+            try:
+                chat_id = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                await self._deliver(chat_id, text, stats)
+            except Exception as e:
+                logger.error(f"Unexpected error while sending to {chat_id}: {e}")
+                stats["failed"] += 1
+
+    async def send(self, chat_ids, text: str) -> dict:
+        """Надсилає `text` усім чатам. Повертає статистику доставки."""
+        start_time = time.monotonic()
+        stats = {"total": 0, "sent": 0, "failed": 0, "blocked": 0, "retried": 0}
+
+        queue = asyncio.Queue()
+        for chat_id in dict.fromkeys(chat_ids):
+            queue.put_nowait(chat_id)
+        stats["total"] = queue.qsize()
+
+        workers = min(self.concurrency, stats["total"])
+        await asyncio.gather(*(self._worker(queue, text, stats) for _ in range(workers)))
+
+        stats["duration"] = round(time.monotonic() - start_time, 3)
+        return stats
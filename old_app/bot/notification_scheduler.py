@@ -0,0 +1,124 @@
+import asyncio
+import bisect
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+from ..metrics import SCHEDULER_LAG_SECONDS
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+class NotificationScheduler:
+    """Один планувальник сповіщень замість окремої cron-задачі на кожен урок.
+
+    Тримає тижневу шкалу слотів: хвилина тижня -> уроки [(група, тип тижня, id уроку)],
+    спить до найближчого слоту та надсилає всі його уроки разом. Розклад оновлюється
+    поурочно без перебудови всієї шкали."""
+
+    def __init__(self, callback: Callable[[str, str, int], Awaitable], lead_minutes: int = 5):
+        self.callback = callback
+        self.lead_minutes = lead_minutes
+        self._slots: dict[int, dict[int, tuple[str, str]]] = {}
+        self._timeline: list[int] = []
+        self._lesson_slots: dict[int, int] = {}
+        self._changed = asyncio.Event()
+        self._last_fired_at: datetime | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def slot_for(self, lesson) -> int | None:
+        """Хвилина тижня, коли треба нагадати про урок (за `lead_minutes` до початку)."""
+        if lesson.week_day is None or not lesson.start_time:
+            return None
+        try:
+            hour, minute = map(int, lesson.start_time.split(":"))
+        except ValueError:
+            return None
+        return (lesson.week_day * MINUTES_PER_DAY + hour * 60 + minute - self.lead_minutes) % MINUTES_PER_WEEK
+
+    def _add(self, lesson):
+        slot = self.slot_for(lesson)
+        if slot is None:
+            return
+        if slot not in self._slots:
+            self._slots[slot] = {}
+            bisect.insort(self._timeline, slot)
+        self._slots[slot][lesson.id] = (lesson.group_name, lesson.week_type)
+        self._lesson_slots[lesson.id] = slot
+
+    def _remove(self, lesson_id: int):
+        slot = self._lesson_slots.pop(lesson_id, None)
+        if slot is None:
+            return
+        entries = self._slots[slot]
+        entries.pop(lesson_id, None)
+        if not entries:
+            del self._slots[slot]
+            self._timeline.pop(bisect.bisect_left(self._timeline, slot))
+
+    def load(self, lessons):
+        """Повністю перебудовує шкалу з переданих уроків."""
+        self._slots.clear()
+        self._timeline.clear()
+        self._lesson_slots.clear()
+        for lesson in lessons:
+            self._add(lesson)
+        self._changed.set()
+
+    def update_lessons(self, lessons):
+        """Додає нові або переносить змінені уроки."""
+        for lesson in lessons:
+            self._remove(lesson.id)
+            self._add(lesson)
+        self._changed.set()
+
+    def remove_lessons(self, lesson_ids):
+        """Прибирає видалені уроки зі шкали."""
+        for lesson_id in lesson_ids:
+            self._remove(lesson_id)
+        self._changed.set()
+
+    def next_fire(self, now: datetime) -> tuple[int, datetime] | None:
+        """Найближчий слот строго після `now` та час його спрацювання."""
+        if not self._timeline:
+            return None
+        week_start = (now - timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+        current = (now - week_start) // timedelta(minutes=1)
+        index = bisect.bisect_right(self._timeline, current)
+        if index < len(self._timeline):
+            slot = self._timeline[index]
+            return slot, week_start + timedelta(minutes=slot)
+        slot = self._timeline[0]
+        return slot, week_start + timedelta(weeks=1, minutes=slot)
+
+    async def fire(self, slot: int):
+        """Надсилає всі уроки слоту одночасно."""
+        entries = list(self._slots.get(slot, {}).items())
+        results = await asyncio.gather(
+            *(self.callback(group_name, week_type, lesson_id) for lesson_id, (group_name, week_type) in entries),
+            return_exceptions=True,
+        )
+        for (lesson_id, _), result in zip(entries, results):
+            if isinstance(result, Exception):
+                logger.error(f"Notification for lesson {lesson_id} failed: {result}")
+
+    async def run(self):
+        """Головний цикл: чекає до наступного слоту або до зміни розкладу."""
+        while True:
+            self._changed.clear()
+            now = datetime.now()
+            upcoming = self.next_fire(max(now, self._last_fired_at or now))
+            timeout = None if upcoming is None else max((upcoming[1] - now).total_seconds(), 0)
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+                continue
+            except asyncio.TimeoutError:
+                pass
+
+            slot, self._last_fired_at = upcoming
+            SCHEDULER_LAG_SECONDS.observe(max((datetime.now() - self._last_fired_at).total_seconds(), 0))
+            task = asyncio.create_task(self.fire(slot))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
@@ -1,70 +1,157 @@
 from datetime import datetime
+from typing import NamedTuple
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
 
-from ..database.models import Lesson, Subscription
-from ..database.session import AsyncSessionLocal
+from ..database.models import Lesson, Group
+from ..database.session import ReadSessionLocal
+from .utils import format_schedule, WEEK_MAP
+from ..metrics import CACHE_REQUESTS
+
+
+class LessonRecord(NamedTuple):
+    """Компактний незмінний запис уроку для кешу бота."""
+    id: int
+    group_name: str
+    week_day: int
+    lesson_number: int
+    week_type: str
+    subject: str | None
+    teacher: str | None
+    room: str | None
+    start_time: str | None
+    end_time: str | None
 
 
 class ScheduleService:
     """Сервіс для отримання розкладу занять."""
     def __init__(self):
-        self._cache: dict[str, list] = {}
+        self._cache: dict[str, list[LessonRecord]] = {}
+        self._lessons: dict[int, LessonRecord] = {}
+        self._views: dict[tuple[str, str], dict[int, tuple[LessonRecord, ...]]] = {}
+        self._rendered: dict[str, dict[tuple[str, int | None], str]] = {}
+
+    @staticmethod
+    async def _select_lessons(*criteria) -> list[LessonRecord]:
+        """Вибирає уроки з БД як LessonRecord."""
+        async with ReadSessionLocal() as session:
+            result = await session.execute(
+                select(
+                    Lesson.id, Group.name, Lesson.week_day, Lesson.lesson_number, Lesson.week_type,
+                    Lesson.subject, Lesson.teacher, Lesson.room, Lesson.start_time, Lesson.end_time,
+                ).join(Lesson.group).where(*criteria)
+            )
+            return [LessonRecord(*row) for row in result.all()]
 
     async def load_cache(self):
-        """Завантажує всі уроки з БД у пам'ять."""
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(select(Lesson).options(selectinload(Lesson.group)))
-            lessons = result.scalars().all()
+        """Завантажує всі уроки з БД у пам'ять та будує індекси."""
+        lessons = await self._select_lessons()
 
         self._cache.clear()
         for lesson in lessons:
-            group_name = lesson.group.name
-            self._cache.setdefault(group_name, []).append(lesson)
+            self._cache.setdefault(lesson.group_name, []).append(lesson)
+        self._build_indexes()
 
-    async def get_lesson(self, lesson_id: int) -> dict | None:
-        """Повертає весь розклад."""
-        for lessons in self._cache.values():
-            for lesson in lessons:
-                if lesson.id == lesson_id:
-                    return lesson
-        return None
-
-    async def get_test_data(self) -> dict:
-        """Повертає тестові дані у форматі self._cache (group_name -> список Lesson)."""
-        from types import SimpleNamespace
-
-        # Тестові уроки
-        lesson1 = SimpleNamespace(
-            id=2,
-            group=SimpleNamespace(name="Іт-21"),
-            week_type="numerator",
-            day_of_week=6,
-            start_time="15:45"
-        )
+    def _build_indexes(self):
+        """Будує індекси id -> урок та (група, тип тижня) -> день -> впорядковані уроки."""
+        self._lessons = {}
+        self._views = {}
+        self._rendered = {}
+        for group_name in self._cache:
+            self._index_group(group_name)
+
+    def _index_group(self, group_name: str):
+        """Перебудовує індекси однієї групи."""
+        for key in [key for key in self._views if key[0] == group_name]:
+            del self._views[key]
+
+        views: dict[tuple[str, str], dict[int, list[LessonRecord]]] = {}
+        for lesson in self._cache.get(group_name, []):
+            self._lessons[lesson.id] = lesson
+            views.setdefault((group_name, lesson.week_type), {}).setdefault(lesson.week_day, []).append(lesson)
+
+        for key, days in views.items():
+            self._views[key] = {
+                day: tuple(sorted(day_lessons, key=lambda lesson: lesson.lesson_number))
+                for day, day_lessons in sorted(days.items())
+            }
+        self._render_group(group_name)
+
+    def _render_group(self, group_name: str):
+        """Заздалегідь рендерить тексти /week та /today групи: (тип тижня, день або None для тижня) -> текст."""
+        self._rendered.pop(group_name, None)
+        if group_name not in self._cache:
+            return
+
+        rendered = {}
+        for week_type in WEEK_MAP:
+            days = self._views.get((group_name, week_type), {})
+            rendered[(week_type, None)] = format_schedule(days, week_type)
+            for day in range(7):
+                rendered[(week_type, day)] = format_schedule({day: days.get(day, ())}, week_type)
+        self._rendered[group_name] = rendered
+
+    def _rendered_text(self, group_name: str, week_type: str, day: int | None) -> str:
+        text = self._rendered.get(group_name, {}).get((week_type, day))
+        CACHE_REQUESTS.labels("schedule_text", "miss" if text is None else "hit").inc()
+        if text is None:
+            days = self._views.get((group_name, week_type), {})
+            text = format_schedule(days if day is None else {day: days.get(day, ())}, week_type)
+        return text
 
+    async def apply_changes(self, groups: list[str], removed_groups: list[str]) -> tuple[list[LessonRecord], list[int]]:
+        """Перезавантажує з БД лише змінені групи та прибирає видалені.
+        Повертає нові або змінені уроки та id видалених уроків."""
+        fresh: dict[str, list[LessonRecord]] = {group_name: [] for group_name in groups}
+        if groups:
+            for lesson in await self._select_lessons(Group.name.in_(groups)):
+                fresh[lesson.group_name].append(lesson)
+
+        updated, removed_ids = [], []
+        for group_name in [*groups, *removed_groups]:
+            old_lessons = {lesson.id: lesson for lesson in self._cache.pop(group_name, [])}
+            new_lessons = fresh.get(group_name, [])
+            new_ids = {lesson.id for lesson in new_lessons}
+
+            updated.extend(lesson for lesson in new_lessons if old_lessons.get(lesson.id) != lesson)
+            removed_ids.extend(lesson_id for lesson_id in old_lessons if lesson_id not in new_ids)
+            for lesson_id in old_lessons:
+                self._lessons.pop(lesson_id, None)
+
+            if new_lessons:
+                self._cache[group_name] = new_lessons
+            self._index_group(group_name)
+
+        return updated, removed_ids
+
+    def cache_sizes(self) -> dict[str, int]:
+        """Розміри кешів для метрик: групи, уроки та групи з готовими текстами."""
         return {
-            "Іт-21": [lesson1],
+            "schedule_groups": len(self._cache),
+            "schedule_lessons": len(self._lessons),
+            "schedule_texts": len(self._rendered),
         }
 
+    async def get_lesson(self, lesson_id: int) -> LessonRecord | None:
+        """Повертає урок за id."""
+        return self._lessons.get(lesson_id)
+
     async def get_all_schedule(self) -> dict:
         """Повертає весь розклад."""
         return self._cache.copy()
 
     async def get_today_schedule(self, group_name: str, week_type: str = "numerator") -> dict:
         """Розклад на сьогодні у вигляді словника з ключем = номер дня тижня."""
-        weekday = datetime.today().isoweekday()
-        lessons = [
-            lesson for lesson in self._cache.get(group_name, [])
-            if lesson.week_day == weekday and lesson.week_type == week_type
-        ]
-        schedule = {weekday: [lesson for lesson in lessons]}
-        return schedule
+        weekday = datetime.today().weekday()
+        return {weekday: self._views.get((group_name, week_type), {}).get(weekday, ())}
 
     async def get_week_schedule(self, group_name: str, week_type: str = "numerator") -> dict:
         """Розклад на тиждень у вигляді словника: день (int) -> список уроків."""
-        lessons = [l for l in self._cache.get(group_name, []) if l.week_type == week_type]
-        schedule: dict[int, list[dict]] = {}
-        for lesson in lessons:
-            schedule.setdefault(lesson.week_day, []).append(lesson)
-        return schedule
+        return dict(self._views.get((group_name, week_type), {}))
+
+    def get_today_text(self, group_name: str, week_type: str = "numerator") -> str:
+        """Готовий текст розкладу на сьогодні."""
+        return self._rendered_text(group_name, week_type, datetime.today().weekday())
+
+    def get_week_text(self, group_name: str, week_type: str = "numerator") -> str:
+        """Готовий текст розкладу на тиждень."""
+        return self._rendered_text(group_name, week_type, None)
@@ -1,19 +1,81 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+
+from loguru import logger
+from sqlalchemy import bindparam, delete, update
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 
+from app.core.bulk import batches, upsert
 from ..database.models import Subscription, Group
-from ..database.session import AsyncSessionLocal
+from ..database.session import AsyncSessionLocal, ReadSessionLocal
+from ..metrics import CACHE_REQUESTS
 
 
 class SubscriptionService:
-    """Клас для роботи з підписками чатів та кешуванням даних."""
+    """Клас для роботи з підписками чатів та кешуванням даних.
+
+    Зміни підписок працюють у режимі write-behind: кеш оновлюється одразу, а зміни
+    збираються по chat_id (залишається лише останній стан чату) і записуються в БД
+    однією транзакцією раз на `flush_interval` секунд або при `flush_size` змінах.
+    Кожна зміна спершу дописується в журнал `journal_path`, який відтворюється при
+    старті, тому незаписані зміни не губляться при падінні процесу.
+
+    Якщо пакет не записується через недоступну БД, він лишається в буфері до наступної спроби;
+    інші помилки пакета призводять до запису змін по одній, і зміни, що не записуються, відкидаються."""
 
-    def __init__(self):
+    # Тип тижня без зміни групи: Core UPDATE ... WHERE chat_id, який не перевіряє кількість рядків,
+    # тож зміна для чату без підписки нічого не робить.
+    UPDATE_WEEK_TYPE = (
+        update(Subscription.__table__)
+        .where(Subscription.__table__.c.chat_id == bindparam("target_chat_id"))
+        .values(week_type=bindparam("target_week_type"))
+    )
+
+    def __init__(self, journal_path: str | Path = "cache/subscriptions.journal", flush_interval: float = 1.0,
+                 flush_size: int = 500):
         self._cache: dict[int, dict[str, str]] = {}
+        self._index: dict[tuple[str, str], set[int]] = {}
+        self._pending: dict[int, dict[str, str] | None] = {}
+        self.journal_path = Path(journal_path)
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self._journal = None
+        self._flush_lock = asyncio.Lock()
+        self._flush_needed = asyncio.Event()
+
+    def _index_add(self, chat_id: int):
+        """Додає чат до індексу (група, тип тижня) -> чати."""
+        data = self._cache.get(chat_id)
+        if data and data.get("group_name"):
+            self._index.setdefault((data["group_name"], data.get("week_type")), set()).add(chat_id)
+
+    def _index_remove(self, chat_id: int):
+        """Прибирає чат з індексу за поточними даними кешу."""
+        data = self._cache.get(chat_id)
+        if not data:
+            return
+        key = (data.get("group_name"), data.get("week_type"))
+        chats = self._index.get(key)
+        if chats is not None:
+            chats.discard(chat_id)
+            if not chats:
+                del self._index[key]
+
+    def _set_cache(self, chat_id: int, data: dict[str, str]):
+        """Оновлює кеш чату разом з індексом."""
+        self._index_remove(chat_id)
+        self._cache[chat_id] = data
+        self._index_add(chat_id)
 
     async def load_cache(self):
-        """Завантажує всі підписки з БД у пам'ять."""
-        async with AsyncSessionLocal() as session:
+        """Дописує в БД зміни з журналу попереднього запуску та завантажує всі підписки в пам'ять."""
+        await self._replay_journal()
+
+        async with ReadSessionLocal() as session:
             result = await session.execute(
                 select(Subscription).options(selectinload(Subscription.group))
             )
@@ -25,21 +87,35 @@ class SubscriptionService:
                 "week_type": sub.week_type
             } for sub in subscriptions
         }
+        self._index = {}
+        for chat_id in self._cache:
+            self._index_add(chat_id)
+
+    def cache_sizes(self) -> dict[str, int]:
+        """Розміри кешів для метрик: підписки в кеші та ще не записані в БД зміни."""
+        return {"subscriptions": len(self._cache), "subscriptions_pending": len(self._pending)}
 
     async def get_users_from_options(self, group_name, week_type) -> list:
-        """Повертає всі підписки користувачів."""
-        users_ids = []
-        for chat_id, data in self._cache.items():
-            if data["group_name"] == group_name and data["week_type"] == week_type:
-                users_ids.append(chat_id)
-        return users_ids
+        """Повертає чати, підписані на групу з вказаним типом тижня."""
+        return list(self._index.get((group_name, week_type), ()))
+
+    def drop_groups(self, group_names: list[str]):
+        """Прибирає з кешу чати видалених груп (їх підписки вже видалені з БД парсером)."""
+        removed = set(group_names)
+        for key in [key for key in self._index if key[0] in removed]:
+            for chat_id in self._index.pop(key):
+                self._cache.pop(chat_id, None)
 
     async def get_user(self, chat_id: int, *args, **kwargs) -> dict | None:
         """Повертає дані користувача (підписку) з кешу або БД."""
         if chat_id in self._cache:
+            CACHE_REQUESTS.labels("subscriptions", "hit").inc()
             return self._cache[chat_id]
+        CACHE_REQUESTS.labels("subscriptions", "miss").inc()
+        if chat_id in self._pending and self._pending[chat_id] is None:
+            return None
 
-        async with AsyncSessionLocal() as session:
+        async with ReadSessionLocal() as session:
             result = await session.execute(
                 select(Subscription).where(Subscription.chat_id == chat_id).options(selectinload(Subscription.group))
             )
@@ -51,57 +127,164 @@ class SubscriptionService:
                 "group_name": subscription.group.name,
                 "week_type": subscription.week_type
             }
-            self._cache[chat_id] = data
+            self._set_cache(chat_id, data)
             return data
 
     async def set_group(self, chat_id: int, group_name: str, week_type: str | None = None, *args, **kwargs):
         """Встановлює або оновлює підписку чату.
-        Оновлює кеш та базу даних."""
-        async with AsyncSessionLocal() as session:
-            group = await session.scalar(select(Group).where(Group.name == group_name))
+        Оновлює кеш одразу, а БД - при наступному скиданні буфера."""
+        current = self._cache.get(chat_id, {})
+        data = {"group_name": group_name, "week_type": week_type or current.get("week_type") or "numerator"}
+        self._set_cache(chat_id, data)
+        self._enqueue(chat_id, data)
 
-            subscription = await session.scalar(select(Subscription).where(Subscription.chat_id == chat_id))
-            final_week_type = week_type or (subscription.week_type if subscription else "numerator")
+    async def set_week_type(self, chat_id: int, week_type: str, *args, **kwargs):
+        """Оновлює тільки тип тижня користувача; без підписки нічого не робить.
+        Оновлює кеш одразу, а БД - при наступному скиданні буфера."""
+        current = await self.get_user(chat_id)
+        if not current:
+            return
+        data = {**current, "week_type": week_type}
+        self._set_cache(chat_id, data)
+        self._enqueue(chat_id, data)
 
-            if subscription:
-                subscription.group_id = group.id
-                subscription.week_type = final_week_type
-            else:
-                subscription = Subscription(chat_id=chat_id, group_id=group.id, week_type=final_week_type)
-                session.add(subscription)
+    async def remove_user(self, chat_id: int, ) -> str | None:
+        """Видаляє підписку чату. Оновлює кеш одразу, а БД - при наступному скиданні буфера.
+        Повертає назву групи або None, якщо підписки не було."""
+        data = self._cache.get(chat_id)
+        if not data:
+            return None
 
-            await session.commit()
+        self._index_remove(chat_id)
+        self._cache.pop(chat_id, None)
+        self._enqueue(chat_id, None)
+        return data.get("group_name")
 
-        self._cache[chat_id] = {
-            "group_name": group_name,
-            "week_type": final_week_type
-        }
+    def _enqueue(self, chat_id: int, data: dict[str, str] | None):
+        """Записує зміну в журнал та буфер; None означає видалення підписки."""
+        if self._journal is None:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._journal = self.journal_path.open("a", encoding="utf-8")
+        self._journal.write(json.dumps({"chat_id": chat_id, "data": data}, ensure_ascii=False) + "\n")
+        self._journal.flush()
 
-    async def set_week_type(self, chat_id: int, week_type: str, *args, **kwargs):
-        """Оновлює тільки тип тижня користувача.
-        Оновлює кеш та БД."""
-        self._cache.setdefault(chat_id, {})["week_type"] = week_type
+        self._pending[chat_id] = data
+        if len(self._pending) >= self.flush_size:
+            self._flush_needed.set()
 
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(Subscription).where(Subscription.chat_id == chat_id)
-            )
-            subscription = result.scalars().first()
-            if subscription:
-                subscription.week_type = week_type
-                await session.commit()
+    def _rewrite_journal(self):
+        """Залишає в журналі лише ще не записані в БД зміни."""
+        if self._journal is not None:
+            self._journal.close()
+        tmp_path = self.journal_path.with_name(self.journal_path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as journal:
+            for chat_id, data in self._pending.items():
+                journal.write(json.dumps({"chat_id": chat_id, "data": data}, ensure_ascii=False) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+        os.replace(tmp_path, self.journal_path)
+        self._journal = self.journal_path.open("a", encoding="utf-8")
 
-    async def remove_user(self, chat_id: int, ) -> str | None:
-        """Видаляє підписку чату. Оновлює кеш та базу даних.
-        Повертає назву групи або None, якщо підписки не було."""
-        group_name = self._cache.get(chat_id).get("group_name")
-        self._cache.pop(chat_id, None)
+    async def _replay_journal(self):
+        """Відтворює незаписані зміни з журналу (після падіння) та записує їх у БД."""
+        if not self.journal_path.exists():
+            return
+        with self.journal_path.open(encoding="utf-8") as journal:
+            for line in journal:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                self._pending[entry["chat_id"]] = entry["data"]
+        if self._pending:
+            logger.info(f"Replaying {len(self._pending)} subscription changes from journal")
+        await self.flush()
+
+    async def _write(self, batch: dict[int, dict[str, str] | None]):
+        """Записує пакет змін у БД однією транзакцією."""
+        removed = [chat_id for chat_id, data in batch.items() if data is None]
+        changed = {chat_id: data for chat_id, data in batch.items() if data is not None}
+        group_names = list({data["group_name"] for data in changed.values() if data.get("group_name")})
 
         async with AsyncSessionLocal() as session:
-            subscription = await session.scalar(select(Subscription).where(Subscription.chat_id == chat_id))
-            if not subscription:
-                return None
-            await session.delete(subscription)
-            await session.commit()
+            async with session.begin():
+                group_ids = {}
+                for batch in batches(group_names):
+                    result = await session.execute(select(Group.name, Group.id).where(Group.name.in_(batch)))
+                    group_ids.update(result.all())
+
+                for batch in batches(removed):
+                    await session.execute(delete(Subscription).where(Subscription.chat_id.in_(batch)))
+
+                rows = [
+                    {"chat_id": chat_id, "group_id": group_ids[data["group_name"]], "week_type": data["week_type"]}
+                    for chat_id, data in changed.items() if data.get("group_name") in group_ids
+                ]
+                stmt = upsert(session, Subscription, ["chat_id"], ["group_id", "week_type"])
+                for batch in batches(rows):
+                    await session.execute(stmt, batch)
+
+                week_types = [
+                    {"target_chat_id": chat_id, "target_week_type": data["week_type"]}
+                    for chat_id, data in changed.items() if not data.get("group_name")
+                ]
+                for batch in batches(week_types):
+                    await session.execute(self.UPDATE_WEEK_TYPE, batch)
+
+        skipped = len(changed) - len(rows) - len(week_types)
+        if skipped:
+            logger.warning(f"Skipped {skipped} subscription changes for unknown groups")
+
+    def _requeue(self, batch: dict[int, dict[str, str] | None]):
+        """Повертає незаписані зміни в буфер; новіші зміни тих самих чатів лишаються."""
+        self._pending = {**batch, **self._pending}
+
+    async def _write_each(self, batch: dict[int, dict[str, str] | None]):
+        """Записує зміни по одній: зміна, що не записується, відкидається і не блокує решту."""
+        for chat_id, data in batch.items():
+            try:
+                await self._write({chat_id: data})
+            except OperationalError:
+                self._requeue({chat_id: data})
+            except Exception as e:
+                logger.error(f"Dropped subscription change for chat {chat_id} ({data}): {e}")
+
+    async def flush(self):
+        """Записує всі накопичені зміни в БД. Якщо БД недоступна, зміни повертаються в буфер."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, {}
+            try:
+                await self._write(batch)
+            except OperationalError:
+                self._requeue(batch)
+                raise
+            except Exception as e:
+                logger.warning(f"Writing {len(batch)} subscription changes failed ({e}), writing one by one")
+                await self._write_each(batch)
+            except BaseException:
+                self._requeue(batch)
+                raise
+            self._rewrite_journal()
+            logger.debug(f"Flushed {len(batch)} subscription changes")
+
+    async def run(self):
+        """Фоново скидає буфер змін раз на `flush_interval` або при досягненні `flush_size`."""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_needed.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_needed.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error while flushing subscription changes: {e}")
 
-        return group_name
+    async def close(self):
+        """Скидає залишок буфера та закриває журнал."""
+        await self.flush()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
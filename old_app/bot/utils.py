@@ -22,7 +22,7 @@ DAYS = {0: "Понеділок", 1: "Вівторок", 2: "Середа", 3: "
 WEEK_MAP = {"numerator": "чис.", "denominator": "знам."}
 
 
-async def format_lesson(lesson) -> str:
+def format_lesson(lesson) -> str:
     """Форматує один урок у рядок для Telegram."""
     return (
         f"{lesson.lesson_number or '-'}. {lesson.subject or 'Не вказано'} | "
@@ -32,7 +32,7 @@ async def format_lesson(lesson) -> str:
     )
 
 
-async def format_schedule(schedule: dict[int, list[dict]], week_type: str) -> str:
+def format_schedule(schedule: dict[int, list[dict]], week_type: str) -> str:
     """Форматує словник розкладу на тиждень або день у рядок для Telegram."""
     if not schedule:
         return "😱 Занять немає."
@@ -41,7 +41,7 @@ async def format_schedule(schedule: dict[int, list[dict]], week_type: str) -> st
     for day, lessons in sorted(schedule.items()):
         text_lines.append(f"{DAYS.get(day)}:")
         for lesson in lessons:
-            text_lines.append(await format_lesson(lesson))
+            text_lines.append(format_lesson(lesson))
         text_lines.append("")
 
     return "\n".join(text_lines).strip()
@@ -0,0 +1,175 @@
+import asyncio
+import secrets
+import signal
+import time
+from contextlib import suppress
+
+from aiogram.dispatcher.middlewares.user_context import UserContextMiddleware
+from aiogram.types import Update
+from aiohttp import web
+from loguru import logger
+from pydantic import ValidationError
+
+from old_app.metrics import (
+    WEBHOOK_ENQUEUE_SECONDS, WEBHOOK_QUEUE_SECONDS, WEBHOOK_QUEUE_SIZE, WEBHOOK_UPDATE_SECONDS, WEBHOOK_UPDATES,
+)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+class WebhookServer:
+    """Приймання оновлень Telegram через webhook замість long polling.
+
+    HTTP-обробник лише перевіряє секрет, розбирає оновлення та кладе його в обмежену чергу,
+    а обробляють оновлення `workers` воркерів. Черга розбита на шарди за чатом: оновлення одного
+    чату завжди потрапляють до того самого воркера й обробляються по порядку, різні чати - паралельно.
+
+    Коли шард заповнений, запит чекає на місце до `enqueue_timeout` секунд (тим часом Telegram не
+    надсилає нових оновлень у це з'єднання), а потім отримує 503, і Telegram повторить оновлення пізніше.
+
+    Сервер запускається як окремий aiohttp-застосунок (run) або монтується в інший ASGI-застосунок,
+    наприклад FastAPI: app.mount("/telegram", webhook.asgi), з викликами start()/stop() у lifespan."""
+
+    def __init__(self, bot, dispatcher, url: str | None = None, path: str = "/webhook", host: str = "0.0.0.0",
+                 port: int = 8080, secret_token: str | None = None, workers: int = 8, queue_size: int = 1000,
+                 enqueue_timeout: float = 5.0, max_connections: int = 40, drain_timeout: float = 10.0):
+        """`url` - публічна адреса webhook для setWebhook; без неї webhook реєструється вручну.
+        Якщо `url` задано без `secret_token`, секрет генерується на час роботи процесу: інакше
+        будь-хто, хто знає адресу, міг би надсилати підроблені оновлення."""
+        if url and not secret_token:
+            secret_token = secrets.token_urlsafe(32)
+            logger.info("Webhook secret token is not configured, generated one for this run")
+        elif not secret_token:
+            logger.warning("Webhook has no secret token and accepts updates from any sender")
+        self.bot = bot
+        self.dispatcher = dispatcher
+        self.url = url
+        self.path = path
+        self.host = host
+        self.port = port
+        self.secret_token = secret_token
+        self.enqueue_timeout = enqueue_timeout
+        self.max_connections = max_connections
+        self.drain_timeout = drain_timeout
+        self._queues = [asyncio.Queue(max(1, queue_size // workers)) for _ in range(workers)]
+        self._workers: list[asyncio.Task] = []
+        WEBHOOK_QUEUE_SIZE.set_function(lambda: sum(shard.qsize() for shard in self._queues))
+
+    @staticmethod
+    def chat_key(update: Update) -> int:
+        """Ключ впорядкування: чат оновлення, інакше користувач (inline-запити), інакше саме оновлення."""
+        context = UserContextMiddleware.resolve_event_context(update)
+        return context.chat_id or context.user_id or update.update_id
+
+    async def enqueue(self, update: Update) -> bool:
+        """Кладе оновлення в шард його чату. Повертає False, якщо місце не звільнилось вчасно."""
+        shard = self._queues[self.chat_key(update) % len(self._queues)]
+        try:
+            shard.put_nowait((update, time.monotonic()))
+        except asyncio.QueueFull:
+            start_time = time.monotonic()
+            try:
+                await asyncio.wait_for(shard.put((update, time.monotonic())), self.enqueue_timeout)
+            except asyncio.TimeoutError:
+                WEBHOOK_UPDATES.labels("rejected").inc()
+                return False
+            finally:
+                WEBHOOK_ENQUEUE_SECONDS.observe(time.monotonic() - start_time)
+        WEBHOOK_UPDATES.labels("accepted").inc()
+        return True
+
+    async def handle(self, body: bytes, secret_token: str | None) -> int:
+        """Обробляє тіло запиту від Telegram та повертає HTTP-статус відповіді."""
+        if self.secret_token and not secrets.compare_digest(secret_token or "", self.secret_token):
+            WEBHOOK_UPDATES.labels("forbidden").inc()
+            return 403
+        if not self._workers:
+            return 503
+        try:
+            update = Update.model_validate_json(body, context={"bot": self.bot})
+        except ValidationError:
+            WEBHOOK_UPDATES.labels("invalid").inc()
+            return 400
+        return 200 if await self.enqueue(update) else 503
+
+    async def _work(self, shard: asyncio.Queue):
+        while True:
+            update, queued_at = await shard.get()
+            WEBHOOK_QUEUE_SECONDS.observe(time.monotonic() - queued_at)
+            try:
+                with WEBHOOK_UPDATE_SECONDS.time():
+                    await self.dispatcher.feed_update(self.bot, update)
+                WEBHOOK_UPDATES.labels("processed").inc()
+            except Exception as e:
+                WEBHOOK_UPDATES.labels("failed").inc()
+                logger.error(f"Error while processing update {update.update_id}: {e}")
+            finally:
+                shard.task_done()
+
+    async def start(self):
+        """Запускає воркери обробки черги."""
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._work(shard)) for shard in self._queues]
+
+    async def stop(self):
+        """Перестає приймати оновлення, дочікується обробки черги (до drain_timeout) та зупиняє воркери."""
+        workers, self._workers = self._workers, []
+        with suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(asyncio.gather(*(shard.join() for shard in self._queues)), self.drain_timeout)
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _aiohttp_handler(self, request: web.Request) -> web.Response:
+        return web.Response(status=await self.handle(await request.read(), request.headers.get(SECRET_HEADER)))
+
+    def web_app(self) -> web.Application:
+        """aiohttp-застосунок з єдиним маршрутом webhook."""
+        app = web.Application()
+        app.router.add_post(self.path, self._aiohttp_handler)
+        return app
+
+    async def asgi(self, scope, receive, send):
+        """ASGI-застосунок webhook для монтування в інший сервер (FastAPI, Starlette)."""
+        if scope["type"] != "http":
+            return
+        if scope["method"] != "POST":
+            status = 405
+        else:
+            body, more_body = b"", True
+            while more_body:
+                message = await receive()
+                body += message.get("body", b"")
+                more_body = message.get("more_body", False)
+            secret_token = dict(scope["headers"]).get(SECRET_HEADER.lower().encode())
+            status = await self.handle(body, secret_token.decode() if secret_token else None)
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def run(self):
+        """Запускає воркери та HTTP-сервер, реєструє webhook і працює до SIGINT/SIGTERM."""
+        stop_signal = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        with suppress(NotImplementedError):
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                loop.add_signal_handler(sig, stop_signal.set)
+
+        await self.start()
+        runner = web.AppRunner(self.web_app())
+        await runner.setup()
+        await web.TCPSite(runner, self.host, self.port).start()
+        try:
+            if self.url:
+                await self.bot.set_webhook(
+                    self.url,
+                    secret_token=self.secret_token,
+                    max_connections=self.max_connections,
+                    allowed_updates=self.dispatcher.resolve_used_update_types(),
+                )
+            await self.dispatcher.emit_startup(bot=self.bot)
+            logger.info(f"Webhook listening on {self.host}:{self.port}{self.path}")
+            await stop_signal.wait()
+        finally:
+            await runner.cleanup()
+            await self.stop()
+            await self.dispatcher.emit_shutdown(bot=self.bot)
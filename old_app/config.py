@@ -4,5 +4,23 @@ from dotenv import load_dotenv
 load_dotenv()
 
 SCHEDULE_ID = os.environ.get("SCHEDULE_ID")
+# Кілька аркушів (факультети, сесії) через кому; за замовчуванням - лише SCHEDULE_ID.
+SCHEDULE_IDS = [sheet_id.strip() for sheet_id in os.environ.get("SCHEDULE_IDS", "").split(",") if sheet_id.strip()]
 BOT_TOKEN = os.environ.get("BOT_TOKEN")
+BOT_MODE = os.environ.get("BOT_MODE", "polling")
+WEBHOOK_URL = os.environ.get("WEBHOOK_URL")
+WEBHOOK_HOST = os.environ.get("WEBHOOK_HOST", "0.0.0.0")
+WEBHOOK_PORT = int(os.environ.get("WEBHOOK_PORT", 8080))
+WEBHOOK_PATH = os.environ.get("WEBHOOK_PATH", "/webhook")
+WEBHOOK_SECRET = os.environ.get("WEBHOOK_SECRET")
+WEBHOOK_WORKERS = int(os.environ.get("WEBHOOK_WORKERS", 8))
+WEBHOOK_QUEUE_SIZE = int(os.environ.get("WEBHOOK_QUEUE_SIZE", 1000))
 DATABASE_URL = os.environ.get("DATABASE_URL")
+DATABASE_READ_URL = os.environ.get("DATABASE_READ_URL") or DATABASE_URL
+SCHEDULE_URL = os.environ.get("SCHEDULE_URL")
+SCHEDULE_CACHE_DIR = os.environ.get("SCHEDULE_CACHE_DIR", "cache")
+SCHEDULE_PARSER_BACKEND = os.environ.get("SCHEDULE_PARSER_BACKEND", "pandas")
+PARSER_WORKERS = int(os.environ.get("PARSER_WORKERS", 0)) or None
+PARSER_CONCURRENCY = int(os.environ.get("PARSER_CONCURRENCY", 4))
+BOT_METRICS_PORT = int(os.environ.get("BOT_METRICS_PORT", 9101))
+PARSER_METRICS_PORT = int(os.environ.get("PARSER_METRICS_PORT", 9102))
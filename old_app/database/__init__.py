@@ -1,2 +1,2 @@
 from .models import Lesson, Subscription, Group
-from .session import AsyncSessionLocal, init_db
+from .session import AsyncSessionLocal, ReadSessionLocal, init_db
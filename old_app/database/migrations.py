@@ -0,0 +1,53 @@
+from loguru import logger
+from sqlalchemy import select
+
+from app.core.migrations import add_columns, apply_migrations, create_indexes, find_full_scans, unique_index
+from .models import Lesson, Subscription, Group
+
+lesson_indexes = {index.name: index for index in Lesson.__table__.indexes}
+subscription_indexes = {index.name: index for index in Subscription.__table__.indexes}
+group_indexes = {index.name: index for index in Group.__table__.indexes}
+
+
+def group_sources(connection):
+    """Додає до груп джерело (аркуш розкладу), щоб синхронізація аркуша видаляла лише його групи."""
+    add_columns(Group.__table__.c.source)(connection)
+    create_indexes(group_indexes["ix_groups_source"])(connection)
+
+
+MIGRATIONS = [
+    (1, "lessons natural key", unique_index(lesson_indexes["uq_lessons_group_slot"])),
+    (2, "hot path indexes", create_indexes(
+        lesson_indexes["ix_lessons_group_week_type_day"],
+        subscription_indexes["ix_subscriptions_group_week_type"],
+    )),
+    (3, "group sources", group_sources),
+]
+
+HOT_QUERIES = {
+    "lessons by group": select(Lesson).where(Lesson.group_id.in_([1, 2])),
+    "lessons by group/week_type/day": select(Lesson).where(
+        Lesson.group_id == 1, Lesson.week_type == "numerator", Lesson.week_day == 0
+    ),
+    "subscription by chat": select(Subscription).where(Subscription.chat_id == 1),
+    "subscriptions by group/week_type": select(Subscription.chat_id).where(
+        Subscription.group_id == 1, Subscription.week_type == "numerator"
+    ),
+    "group by name": select(Group).where(Group.name == "name"),
+}
+
+
+def migrate(connection):
+    """Доводить схему існуючої БД до актуальної."""
+    apply_migrations(connection, MIGRATIONS)
+
+
+def check_query_plans(connection) -> dict[str, list[str]]:
+    """Перевіряє, що гарячі запити використовують індекси. Повертає запити з повним скануванням."""
+    full_scans = {}
+    for name, statement in HOT_QUERIES.items():
+        scans = find_full_scans(connection, statement)
+        if scans:
+            logger.warning(f"Query '{name}' uses full table scan: {scans}")
+            full_scans[name] = scans
+    return full_scans
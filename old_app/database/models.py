@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, PrimaryKeyConstraint
+from sqlalchemy import Column, String, Integer, ForeignKey, PrimaryKeyConstraint, Index
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
@@ -9,6 +9,7 @@ class Group(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String, unique=True, nullable=False)
+    source = Column(String, nullable=True, index=True)
 
     lessons = relationship("Lesson", back_populates="group", cascade="all, delete-orphan")
     subscriptions = relationship("Subscription", back_populates="group", cascade="all, delete-orphan")
@@ -23,6 +24,10 @@ class Subscription(Base):
     week_type = Column(String, nullable=False, default="numerator")
     group = relationship("Group", back_populates="subscriptions")
 
+    __table_args__ = (
+        Index("ix_subscriptions_group_week_type", "group_id", "week_type"),
+    )
+
 
 class Lesson(Base):
     """Модель розкладу"""
@@ -43,4 +48,6 @@ class Lesson(Base):
 
     __table_args__ = (
         PrimaryKeyConstraint("id"),
+        Index("uq_lessons_group_slot", "group_id", "week_day", "lesson_number", "week_type", unique=True),
+        Index("ix_lessons_group_week_type_day", "group_id", "week_type", "week_day"),
     )
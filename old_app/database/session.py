@@ -1,14 +1,22 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
-from ..config import DATABASE_URL
+from app.core.engine import build_engine
+from ..config import DATABASE_URL, DATABASE_READ_URL
 from .models import Base
+from .migrations import migrate, check_query_plans
 
-engine = create_async_engine(DATABASE_URL, echo=False)
+engine = build_engine(DATABASE_URL)
+read_engine = build_engine(DATABASE_READ_URL, read_only=True)
 
 AsyncSessionLocal = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
+ReadSessionLocal = sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
 
 async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(migrate)
+        await conn.run_sync(check_query_plans)
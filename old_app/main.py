@@ -2,18 +2,32 @@ import multiprocessing
 import asyncio
 from old_app.bot.main import bot_init
 from old_app.schedule.main import parser_init
-from old_app.config import BOT_TOKEN, SCHEDULE_ID
+from old_app.config import (
+    BOT_TOKEN, SCHEDULE_ID, SCHEDULE_IDS, SCHEDULE_URL, SCHEDULE_CACHE_DIR, BOT_METRICS_PORT, PARSER_METRICS_PORT,
+    SCHEDULE_PARSER_BACKEND, PARSER_WORKERS, PARSER_CONCURRENCY, BOT_MODE, WEBHOOK_URL, WEBHOOK_HOST, WEBHOOK_PORT,
+    WEBHOOK_PATH, WEBHOOK_SECRET, WEBHOOK_WORKERS, WEBHOOK_QUEUE_SIZE,
+)
 
-def run_bot():
-    asyncio.run(bot_init(BOT_TOKEN))
+WEBHOOK = {
+    "url": WEBHOOK_URL, "host": WEBHOOK_HOST, "port": WEBHOOK_PORT, "path": WEBHOOK_PATH,
+    "secret_token": WEBHOOK_SECRET, "workers": WEBHOOK_WORKERS, "queue_size": WEBHOOK_QUEUE_SIZE,
+} if BOT_MODE == "webhook" else None
 
-def run_parser():
-    asyncio.run(parser_init(SCHEDULE_ID))
+
+def run_bot(changes):
+    asyncio.run(bot_init(BOT_TOKEN, changes=changes, cache_dir=SCHEDULE_CACHE_DIR, metrics_port=BOT_METRICS_PORT,
+                         webhook=WEBHOOK))
+
+def run_parser(changes):
+    asyncio.run(parser_init(SCHEDULE_IDS or SCHEDULE_ID, url=SCHEDULE_URL, snapshot_dir=SCHEDULE_CACHE_DIR,
+                            changes=changes, metrics_port=PARSER_METRICS_PORT, backend=SCHEDULE_PARSER_BACKEND,
+                            workers=PARSER_WORKERS, concurrency=PARSER_CONCURRENCY))
 
 
 if __name__ == "__main__":
-    processing_bot = multiprocessing.Process(target=run_bot)
-    processing_parser = multiprocessing.Process(target=run_parser)
+    schedule_changes = multiprocessing.Queue()
+    processing_bot = multiprocessing.Process(target=run_bot, args=(schedule_changes,))
+    processing_parser = multiprocessing.Process(target=run_parser, args=(schedule_changes,))
 
     processing_bot.start()
     processing_parser.start()
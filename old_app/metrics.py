@@ -0,0 +1,54 @@
+from loguru import logger
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+
+SCHEDULE_STAGE_SECONDS = Histogram(
+    "schedule_stage_seconds", "Тривалість етапів оновлення розкладу", ["stage"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+SCHEDULE_RUNS = Counter("schedule_runs_total", "Запуски оновлення розкладу за результатом", ["result"])
+SCHEDULE_LESSONS = Counter("schedule_lessons_total", "Змінені при синхронізації уроки", ["action"])
+SCHEDULE_SOURCE_SECONDS = Histogram(
+    "schedule_source_seconds", "Тривалість завантаження та розбору одного аркуша за результатом",
+    ["source", "result"], buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+SCHEDULE_GROUPS = Counter("schedule_groups_total", "Групи при синхронізації: пропущені, змінені, видалені", ["action"])
+
+CACHE_SIZE = Gauge("bot_cache_size", "Кількість записів у кешах бота", ["cache"])
+CACHE_REQUESTS = Counter("bot_cache_requests_total", "Звернення до кешів бота", ["cache", "result"])
+
+NOTIFICATION_SECONDS = Histogram(
+    "notification_fanout_seconds", "Тривалість розсилки одного уроку всім підписникам",
+    buckets=(0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+NOTIFICATION_RECIPIENTS = Histogram(
+    "notification_recipients", "Кількість отримувачів одного сповіщення",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000),
+)
+NOTIFICATION_MESSAGES = Counter("notification_messages_total", "Повідомлення розсилки за результатом", ["result"])
+SCHEDULER_LAG_SECONDS = Histogram(
+    "scheduler_lag_seconds", "Запізнення спрацювання слоту сповіщень відносно запланованого часу",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+
+WEBHOOK_QUEUE_SIZE = Gauge("bot_webhook_queue_size", "Оновлення webhook, що очікують обробки")
+WEBHOOK_UPDATES = Counter("bot_webhook_updates_total", "Оновлення webhook за результатом", ["result"])
+WEBHOOK_ENQUEUE_SECONDS = Histogram(
+    "bot_webhook_enqueue_wait_seconds", "Очікування місця в заповненій черзі webhook (backpressure)",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1, 2.5, 5),
+)
+WEBHOOK_QUEUE_SECONDS = Histogram(
+    "bot_webhook_queue_seconds", "Час оновлення в черзі до початку обробки",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+WEBHOOK_UPDATE_SECONDS = Histogram(
+    "bot_webhook_update_seconds", "Тривалість обробки одного оновлення",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5),
+)
+
+
+def start_metrics_server(port: int | None):
+    """Запускає HTTP-експортер метрик Prometheus процесу; 0 або None вимикає експортер."""
+    if not port:
+        return
+    start_http_server(port)
+    logger.info(f"Metrics exporter listening on :{port}")
@@ -1 +1,12 @@
-from .schedule_parser import ScheduleParser
+def __getattr__(name):
+    """Ліниві експорти: CsvScheduleParser не повинен тягнути за собою імпорт pandas."""
+    if name == "ScheduleParser":
+        from .schedule_parser import ScheduleParser
+        return ScheduleParser
+    if name == "CsvScheduleParser":
+        from .csv_parser import CsvScheduleParser
+        return CsvScheduleParser
+    if name == "MultiScheduleParser":
+        from .multi_parser import MultiScheduleParser
+        return MultiScheduleParser
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,125 @@
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from loguru import logger
+from app.core.profiling import profiler
+
+from ..database.session import AsyncSessionLocal
+from ..metrics import SCHEDULE_GROUPS, SCHEDULE_LESSONS, SCHEDULE_RUNS, SCHEDULE_STAGE_SECONDS
+from .fetcher import ScheduleFetcher
+from .sync_engine import LessonSyncEngine
+
+
+class BaseScheduleParser(ABC):
+    """Спільна частина парсерів розкладу без залежності від pandas:
+    структура аркуша, завантаження знімка, синхронізація з БД та публікація змін.
+
+    Підкласи реалізують prepare(): завантаження та розбір аркуша без запису в БД. Так кілька
+    аркушів можна підготувати паралельно та синхронізувати разом (див. MultiScheduleParser)."""
+
+    DAY_MAPPING = {"Пн": 0, "Вт": 1, "Ср": 2, "Чт": 3, "Пт": 4, "Сб": 5, "Нд": 6}
+    LESSON_NUMBER_MAPPING = {"I": 1, "II": 2, "III": 3, "IV": 4, "V": 5,
+                             "VI": 6, "VII": 7, "VIII": 8, "IX": 9, "X": 10}
+    WEEK_TYPE_MAPPING = {"чис.": "numerator", "знам.": "denominator"}
+    COMMON_COLUMNS = ("Unnamed: 1", "Unnamed: 2", "Unnamed: 3", "Шифр групи")
+
+    def __init__(self, google_sheet_id: str, url: str | None = None, snapshot_dir: str = "cache", changes=None):
+        """Ініціалізація парсера з ID Google Sheets. `url` дозволяє підставити інше джерело CSV,
+        `changes` - черга (multiprocessing.Queue), куди публікуються зміни розкладу для бота."""
+        self.google_sheet_id = google_sheet_id
+        self.source = google_sheet_id
+        self.changes = changes
+        self.url = url or f"https://docs.google.com/spreadsheets/d/e/{google_sheet_id}/pub?output=csv"
+        self.fetcher = ScheduleFetcher(self.url, Path(snapshot_dir) / f"schedule_{google_sheet_id}.csv")
+        self._snapshot_hash: str | None = None
+        self._loaded_hash: str | None = None
+        self._sheet_hash: str | None = None
+        self._group_hashes: dict[str, str] = {}
+        self.sync_engine = LessonSyncEngine()
+
+    @staticmethod
+    def detect_columns(columns: list[str]) -> tuple[list[str], dict[str, str]]:
+        """Визначає колонки груп та відповідні колонки для кімнат за назвами колонок аркуша."""
+        group_columns = [
+            column for column in columns[5:]
+            if not column.endswith(".1") and not column.startswith("Unnamed")
+        ]
+        room_columns = {group: group + ".1" for group in group_columns if group + ".1" in columns}
+        return group_columns, room_columns
+
+    @staticmethod
+    def hash_sheet(column_hashes: dict[str, str]) -> str:
+        """Хеш усього аркуша: назви колонок разом з хешами їх вмісту."""
+        return hashlib.blake2b(repr(list(column_hashes.items())).encode(), digest_size=16).hexdigest()
+
+    @abstractmethod
+    async def prepare(self) -> dict | None:
+        """Завантажує та розбирає аркуш. Повертає None, якщо розклад не змінився, інакше словник
+        з усіма групами аркуша (group_names), уроками змінених груп (lessons), кількістю пропущених
+        груп (skipped) та станом (state), який зберігається через commit() після синхронізації."""
+
+    def commit(self, prepared: dict):
+        """Запам'ятовує хеші синхронізованого аркуша, щоб наступний запуск пропустив незмінене."""
+        self._group_hashes, self._sheet_hash, self._snapshot_hash = prepared["state"]
+
+    async def sync(self, csv_lessons: dict[str, list[dict]], group_columns: list[str],
+                   sources: dict[str, str] | None = None, configured_sources: set[str] | None = None,
+                   complete: bool = True) -> dict:
+        """Синхронізує уроки змінених груп з БД однією транзакцією. Повертає статистику."""
+        with SCHEDULE_STAGE_SECONDS.labels("sync").time():
+            async with AsyncSessionLocal() as session:
+                async with session.begin():
+                    return await self.sync_engine.sync(
+                        session, csv_lessons, group_columns, sources, configured_sources, complete
+                    )
+
+    @profiler.profiled("parser.run")
+    async def run(self):
+        """Головний метод для оновлення розкладу. Незмінений розклад не синхронізується."""
+        start_time = time.time()
+        logger.info("Updating schedule...")
+        prepared = await self.prepare()
+        if prepared is None:
+            SCHEDULE_RUNS.labels("unchanged").inc()
+            return
+
+        group_names = prepared["group_names"]
+        stats = await self.sync(prepared["lessons"], group_names, dict.fromkeys(group_names, self.source),
+                                configured_sources={self.source})
+        stats["skipped"] = prepared["skipped"]
+        self.publish_changes(stats["changes"])
+        self.commit(prepared)
+        self.record_metrics(stats, time.time() - start_time)
+        self.log_stats(stats, len(group_names), time.time() - start_time)
+
+    def publish_changes(self, changes: dict):
+        """Надсилає боту перелік змінених груп та видалених уроків."""
+        if self.changes is None or not (changes["groups"] or changes["removed_groups"]):
+            return
+        self.changes.put(changes)
+        logger.info(f"Published changes for {len(changes['groups'])} groups, "
+                    f"{len(changes['removed_groups'])} removed groups")
+
+    @staticmethod
+    def record_metrics(stats: dict, duration: float, result: str = "updated"):
+        """Оновлює метрики Prometheus за статистикою синхронізації. `result` - підсумок запуску."""
+        SCHEDULE_RUNS.labels(result).inc()
+        SCHEDULE_STAGE_SECONDS.labels("run").observe(duration)
+        for action in ("inserted", "updated", "deleted"):
+            SCHEDULE_LESSONS.labels(action).inc(stats[action])
+        SCHEDULE_GROUPS.labels("skipped").inc(stats["skipped"])
+        SCHEDULE_GROUPS.labels("changed").inc(len(stats["changes"]["groups"]))
+        SCHEDULE_GROUPS.labels("removed").inc(stats["removed_groups"])
+
+    def close(self):
+        """Звільняє ресурси парсера (пули виконавців)."""
+
+    @staticmethod
+    def log_stats(stats: dict, groups: int, duration: float):
+        logger.success(
+            f"Schedule updated successfully in {duration:.3f}s: "
+            f"groups skipped {stats['skipped']}/{groups}, removed {stats['removed_groups']}; "
+            f"lessons inserted {stats['inserted']}, updated {stats['updated']}, deleted {stats['deleted']}"
+        )
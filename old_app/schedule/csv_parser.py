@@ -0,0 +1,158 @@
+import asyncio
+import csv
+import hashlib
+import time
+from typing import Iterable, Iterator
+
+from loguru import logger
+from ..metrics import SCHEDULE_STAGE_SECONDS
+from .base import BaseScheduleParser
+
+# Значення, які pandas.read_csv за замовчуванням вважає порожніми (NaN).
+NA_VALUES = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+})
+
+
+class CsvScheduleParser(BaseScheduleParser):
+    """Потоковий парсер розкладу на модулі csv без pandas.
+
+    Читає знімок рядок за рядком, тримаючи в пам'яті лише попередній рядок: пара
+    "рядок предмета + рядок викладача" обробляється одразу, уроки віддаються генератором.
+    Колонки визначаються за тими ж правилами, що й у ScheduleParser (назви "Unnamed: N"
+    для порожніх заголовків, ".1" для дубльованих - колонок аудиторій).
+
+    На відміну від pandas, значення клітинок не перетворюються на числа, тому номер
+    аудиторії "101" залишається "101", а не "101.0" в колонках з порожніми клітинками."""
+
+    @staticmethod
+    def make_columns(header: list[str]) -> list[str]:
+        """Назви колонок як у pandas.read_csv: порожні -> "Unnamed: N", повтори -> "назва.1", "назва.2"."""
+        columns, seen = [], set()
+        for index, name in enumerate(header):
+            name = name or f"Unnamed: {index}"
+            candidate, counter = name, 0
+            while candidate in seen:
+                counter += 1
+                candidate = f"{name}.{counter}"
+            seen.add(candidate)
+            columns.append(candidate)
+        return columns
+
+    @staticmethod
+    def clean_value(value: str | None) -> str | None:
+        """Очищує значення: порожні (NA) -> None, інакше strip()."""
+        if value is None or value in NA_VALUES:
+            return None
+        return value.strip()
+
+    def read_columns(self, rows: Iterator[list[str]]) -> list[str]:
+        """Пропускає заголовок аркуша та повертає назви колонок з другого рядка."""
+        next(rows, None)
+        return self.make_columns(next(rows, []))
+
+    def iter_lessons(self, rows: Iterator[list[str]], columns: list[str],
+                     groups: Iterable[str] | None = None) -> Iterator[tuple[str, dict]]:
+        """Генерує пари (група, урок) з рядків після шапки.
+
+        Урок починається в рядку з номером пари та предметом; наступний рядок - рядок викладача,
+        аудиторії та часу закінчення, і для цієї групи він вже не може бути початком уроку."""
+        group_columns, room_columns = self.detect_columns(columns)
+        if groups is not None:
+            selected = set(groups)
+            group_columns = [group_name for group_name in group_columns if group_name in selected]
+
+        position = {column: index for index, column in enumerate(columns)}
+        day_index, number_index, time_index, week_type_index = (position[column] for column in self.COMMON_COLUMNS)
+        targets = [
+            (group_name, position[group_name], position.get(room_columns.get(group_name)))
+            for group_name in group_columns
+        ]
+
+        def cell(row: list[str], index: int | None) -> str | None:
+            return self.clean_value(row[index]) if index is not None and index < len(row) else None
+
+        previous, consumed = None, set()
+        for row in rows:
+            if previous is not None:
+                emitted = set()
+                lesson_number = self.LESSON_NUMBER_MAPPING.get(cell(previous, number_index))
+                if lesson_number:
+                    slot = {
+                        "week_day": self.DAY_MAPPING.get(cell(previous, day_index)),
+                        "lesson_number": lesson_number,
+                        "week_type": self.WEEK_TYPE_MAPPING.get(cell(previous, week_type_index)),
+                        "start_time": cell(previous, time_index),
+                        "end_time": cell(row, time_index),
+                    }
+                    for group_name, group_index, room_index in targets:
+                        if group_name in consumed:
+                            continue
+                        subject = cell(previous, group_index)
+                        if subject:
+                            emitted.add(group_name)
+                            yield group_name, {
+                                **slot,
+                                "subject": subject,
+                                "teacher": cell(row, group_index),
+                                "room": cell(row, room_index),
+                            }
+                consumed = emitted
+            previous = row
+
+    def parse_lines(self, lines: Iterable[str], groups: Iterable[str] | None = None
+                    ) -> tuple[list[str], dict[str, list[dict]]]:
+        """Парсить потік рядків CSV. Повертає колонки груп та словник група -> список уроків."""
+        rows = (row for row in csv.reader(lines) if row)
+        columns = self.read_columns(rows)
+        group_columns, _ = self.detect_columns(columns)
+        lessons: dict[str, list[dict]] = {
+            group_name: [] for group_name in group_columns if groups is None or group_name in groups
+        }
+        for group_name, lesson in self.iter_lessons(rows, columns, groups):
+            lessons[group_name].append(lesson)
+        return group_columns, lessons
+
+    def parse_snapshot(self, snapshot_path) -> tuple[list[str], dict[str, list[dict]]]:
+        """Парсить файл знімка потоково (виконується в окремому потоці)."""
+        with open(snapshot_path, encoding="utf-8", newline="") as file:
+            return self.parse_lines(file)
+
+    @staticmethod
+    def hash_groups(lessons: dict[str, list[dict]]) -> dict[str, str]:
+        """Хеш розібраних уроків кожної групи."""
+        return {
+            group_name: hashlib.blake2b(repr(group_lessons).encode(), digest_size=16).hexdigest()
+            for group_name, group_lessons in lessons.items()
+        }
+
+    async def prepare(self) -> dict | None:
+        """Завантажує знімок, розбирає його потоково та відбирає групи, чиї уроки змінились."""
+        start_time = time.time()
+        with SCHEDULE_STAGE_SECONDS.labels("fetch").time():
+            snapshot_path, snapshot_hash = await self.fetcher.fetch()
+        if snapshot_hash == self._snapshot_hash:
+            logger.success(f"Schedule file not changed, checked in {time.time() - start_time:.3f}s")
+            return None
+
+        with SCHEDULE_STAGE_SECONDS.labels("parse").time():
+            group_columns, lessons = await asyncio.to_thread(self.parse_snapshot, snapshot_path)
+
+        group_hashes = self.hash_groups(lessons)
+        sheet_hash = self.hash_sheet(group_hashes)
+        if sheet_hash == self._sheet_hash:
+            self._snapshot_hash = snapshot_hash
+            logger.success(f"Schedule not changed, skipped all groups in {time.time() - start_time:.3f}s")
+            return None
+
+        changed = {
+            group_name: group_lessons for group_name, group_lessons in lessons.items()
+            if self._group_hashes.get(group_name) != group_hashes[group_name]
+        }
+        return {
+            "group_names": group_columns,
+            "lessons": changed,
+            "skipped": len(group_columns) - len(changed),
+            "state": (group_hashes, sheet_hash, snapshot_hash),
+        }
@@ -0,0 +1,105 @@
+import asyncio
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import aiohttp
+from loguru import logger
+
+
+class ScheduleFetcher:
+    """Завантаження CSV розкладу з умовними запитами (ETag / Last-Modified) та локальним знімком.
+
+    Знімок зберігається на диску разом з метаданими і використовується як запасний варіант,
+    якщо сервер недоступний."""
+
+    CHUNK_SIZE = 64 * 1024
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, url: str, snapshot_path: str | Path, timeout: float = 30, retries: int = 3,
+                 backoff: float = 2.0):
+        self.url = url
+        self.snapshot_path = Path(snapshot_path)
+        self.metadata_path = self.snapshot_path.with_name(self.snapshot_path.name + ".json")
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self._metadata = self._load_metadata()
+
+    def _load_metadata(self) -> dict:
+        """Читає ETag, Last-Modified та хеш останнього знімка."""
+        if not self.snapshot_path.exists() or not self.metadata_path.exists():
+            return {}
+        try:
+            return json.loads(self.metadata_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _save_metadata(self):
+        self.metadata_path.write_text(json.dumps(self._metadata))
+
+    def _conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self._metadata.get("etag"):
+            headers["If-None-Match"] = self._metadata["etag"]
+        if self._metadata.get("last_modified"):
+            headers["If-Modified-Since"] = self._metadata["last_modified"]
+        return headers
+
+    async def _download(self, session: aiohttp.ClientSession) -> bool:
+        """Один умовний запит. Повертає True, якщо отримано нову версію файлу."""
+        async with session.get(self.url, headers=self._conditional_headers()) as response:
+            if response.status == 304:
+                logger.info("Schedule not modified (304)")
+                return False
+            response.raise_for_status()
+
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.snapshot_path.with_name(self.snapshot_path.name + ".part")
+            digest = hashlib.sha256()
+            with open(temp_path, "wb") as file:
+                async for chunk in response.content.iter_chunked(self.CHUNK_SIZE):
+                    digest.update(chunk)
+                    file.write(chunk)
+
+            content_hash = digest.hexdigest()
+            changed = content_hash != self._metadata.get("sha256")
+            if changed:
+                os.replace(temp_path, self.snapshot_path)
+            else:
+                os.remove(temp_path)
+                logger.info("Schedule content not changed")
+
+            self._metadata = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "sha256": content_hash,
+            }
+            self._save_metadata()
+            return changed
+
+    async def fetch(self) -> tuple[Path, str]:
+        """Оновлює локальний знімок розкладу. Повертає шлях до знімка та хеш його вмісту.
+
+        Після невдалих спроб (з експоненційною затримкою) повертає попередній знімок, якщо він є.
+        Відповіді 4xx, крім 429, не повторюються: помилка запиту (доступ, адреса) сама не мине,
+        тому одразу використовується знімок, а без нього помилка передається далі."""
+        async with aiohttp.ClientSession(timeout=self.timeout) as session:
+            for attempt in range(self.retries + 1):
+                try:
+                    await self._download(session)
+                    break
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    permanent = isinstance(e, aiohttp.ClientResponseError) and e.status not in self.RETRY_STATUSES
+                    if permanent or attempt == self.retries:
+                        if not self._metadata.get("sha256"):
+                            raise
+                        log = logger.error if permanent else logger.warning
+                        log(f"Schedule fetch failed, using local snapshot: {e}")
+                        break
+                    delay = self.backoff * 2 ** attempt
+                    logger.warning(f"Schedule fetch failed ({e}), retry in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+
+        return self.snapshot_path, self._metadata["sha256"]
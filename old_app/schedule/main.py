@@ -1,19 +1,66 @@
 import asyncio
+import multiprocessing
+import os
 from loguru import logger
 
-from .schedule_parser import ScheduleParser
 from ..database import init_db
+from ..metrics import SCHEDULE_RUNS, start_metrics_server
 
 
-async def parser_init(schedule_id, interval = 12 * 60 * 60):
+def make_parser(schedule_id, url=None, snapshot_dir="cache", changes=None, backend="pandas", workers=None,
+                executor=None):
+    if backend == "csv":
+        from .csv_parser import CsvScheduleParser
+        return CsvScheduleParser(schedule_id, url=url, snapshot_dir=snapshot_dir, changes=changes)
+    from .schedule_parser import ScheduleParser
+    return ScheduleParser(schedule_id, url=url, snapshot_dir=snapshot_dir, changes=changes,
+                          workers=workers, executor=executor)
+
+
+async def parser_init(schedule_id, interval = 12 * 60 * 60, url=None, snapshot_dir="cache", changes=None,
+                      metrics_port=None, backend="pandas", workers=None, concurrency=4):
+    """Запускає періодичне оновлення розкладу. `schedule_id` - ID аркуша або список ID кількох аркушів;
+    для кількох аркушів `url` не використовується, а пул процесів розбору спільний."""
     await init_db()
-    parser = ScheduleParser(schedule_id)
-    while True:
+    start_metrics_server(metrics_port)
+    executor = None
+    if isinstance(schedule_id, (list, tuple)) and len(schedule_id) > 1:
+        from .multi_parser import MultiScheduleParser
+        if backend != "csv":
+            from concurrent.futures import ProcessPoolExecutor
+            workers = workers or os.cpu_count() or 1
+            executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+        parser = MultiScheduleParser(
+            [make_parser(sheet_id, snapshot_dir=snapshot_dir, backend=backend, workers=workers, executor=executor)
+             for sheet_id in schedule_id],
+            concurrency=concurrency, changes=changes,
+        )
+    else:
+        if isinstance(schedule_id, (list, tuple)):
+            schedule_id = schedule_id[0]
+        parser = make_parser(schedule_id, url=url, snapshot_dir=snapshot_dir, changes=changes,
+                             backend=backend, workers=workers)
+    try:
+        await run_forever(parser, interval)
+    finally:
+        parser.close()
+        if executor is not None:
+            executor.shutdown()
 
+
+async def run_forever(parser, interval: int, retry_delay: float = 60):
+    """Оновлює розклад кожні `interval` секунд. Після помилки запуск повторюється раніше: через
+    `retry_delay` секунд, з подвоєнням затримки після кожної наступної помилки, але не довше `interval`."""
+    delay = retry_delay
+    while True:
         try:
             await parser.run()
         except Exception as e:
-            logger.error(f"Parser error: {e}")
+            SCHEDULE_RUNS.labels("failed").inc()
+            logger.error(f"Parser error: {e}, retry in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, interval)
             continue
+        delay = retry_delay
         logger.info(f"Next parsing in {interval // (60 * 60)} hours.")
-        await asyncio.sleep(interval)
\ No newline at end of file
+        await asyncio.sleep(interval)
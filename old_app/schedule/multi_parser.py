@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+from loguru import logger
+from app.core.profiling import profiler
+from ..metrics import SCHEDULE_RUNS, SCHEDULE_SOURCE_SECONDS
+from .base import BaseScheduleParser
+from .sync_engine import LessonSyncEngine
+
+
+class MultiScheduleParser:
+    """Оновлення розкладу з кількох аркушів (факультети, сесії) одним процесом.
+
+    Аркуші завантажуються та розбираються паралельно, не більше `concurrency` одночасно, кожен своїм
+    парсером. Змінені аркуші синхронізуються однією транзакцією, і видаляються лише групи тих самих
+    аркушів. Помилка одного аркуша не зупиняє інші: його групи лишаються в БД без змін, а хеші не
+    зберігаються, тож наступний запуск спробує аркуш знову. Групи аркушів, прибраних з налаштувань,
+    видаляються при першому запуску, в якому всі аркуші розібрано успішно."""
+
+    sync = BaseScheduleParser.sync
+    publish_changes = BaseScheduleParser.publish_changes
+
+    def __init__(self, parsers: list[BaseScheduleParser], concurrency: int = 4, changes=None):
+        self.parsers = parsers
+        self.changes = changes
+        self.sync_engine = LessonSyncEngine()
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def prepare_source(self, parser: BaseScheduleParser) -> dict | None:
+        """Готує один аркуш з обмеженням паралельності та записує його час і результат."""
+        async with self._semaphore:
+            start_time = time.time()
+            try:
+                prepared = await parser.prepare()
+                if prepared is not None and not prepared["group_names"]:
+                    raise ValueError("no group columns found")
+            except Exception as e:
+                duration = time.time() - start_time
+                SCHEDULE_SOURCE_SECONDS.labels(parser.source, "failed").observe(duration)
+                logger.error(f"Schedule source {parser.source} failed in {duration:.3f}s: {e}")
+                raise
+
+        duration = time.time() - start_time
+        result = "unchanged" if prepared is None else "changed"
+        SCHEDULE_SOURCE_SECONDS.labels(parser.source, result).observe(duration)
+        logger.info(f"Schedule source {parser.source} {result} in {duration:.3f}s")
+        return prepared
+
+    def merge(self, prepared_sources: list[tuple[BaseScheduleParser, dict]]) -> tuple[dict, list[str], dict]:
+        """Об'єднує розібрані аркуші. Група, що є в кількох аркушах, належить першому з них."""
+        csv_lessons, sources = {}, {}
+        for parser, prepared in prepared_sources:
+            for group_name in prepared["group_names"]:
+                if group_name in sources:
+                    if sources[group_name] != parser.source:
+                        logger.warning(f"Group {group_name} is in sources {sources[group_name]} and "
+                                       f"{parser.source}, keeping {sources[group_name]}")
+                    continue
+                sources[group_name] = parser.source
+                if group_name in prepared["lessons"]:
+                    csv_lessons[group_name] = prepared["lessons"][group_name]
+        return csv_lessons, list(sources), sources
+
+    def run_result(self, failed: list[str], updated: bool) -> str:
+        """Один підсумок запуску для SCHEDULE_RUNS; невдалі аркуші окремо рахує SCHEDULE_SOURCE_SECONDS."""
+        if len(failed) == len(self.parsers):
+            return "failed"
+        if failed:
+            return "partial"
+        return "updated" if updated else "unchanged"
+
+    @profiler.profiled("parser.run")
+    async def run(self):
+        """Оновлює всі аркуші. Незмінені та невдалі аркуші не синхронізуються."""
+        start_time = time.time()
+        logger.info(f"Updating schedule from {len(self.parsers)} sources...")
+        results = await asyncio.gather(*(self.prepare_source(parser) for parser in self.parsers),
+                                       return_exceptions=True)
+        failed = [parser.source for parser, result in zip(self.parsers, results) if isinstance(result, Exception)]
+        prepared_sources = [
+            (parser, result) for parser, result in zip(self.parsers, results)
+            if result is not None and not isinstance(result, Exception)
+        ]
+        if not prepared_sources:
+            SCHEDULE_RUNS.labels(self.run_result(failed, updated=False)).inc()
+            logger.success(f"No schedule sources changed ({len(failed)} failed), "
+                           f"checked in {time.time() - start_time:.3f}s")
+            return
+
+        csv_lessons, group_names, sources = self.merge(prepared_sources)
+        stats = await self.sync(csv_lessons, group_names, sources,
+                                configured_sources={parser.source for parser in self.parsers}, complete=not failed)
+        stats["skipped"] = sum(prepared["skipped"] for _, prepared in prepared_sources)
+        self.publish_changes(stats["changes"])
+        for parser, prepared in prepared_sources:
+            parser.commit(prepared)
+        BaseScheduleParser.record_metrics(stats, time.time() - start_time, self.run_result(failed, updated=True))
+        BaseScheduleParser.log_stats(stats, len(group_names), time.time() - start_time)
+
+    def close(self):
+        for parser in self.parsers:
+            parser.close()
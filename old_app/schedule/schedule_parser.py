@@ -1,42 +1,52 @@
+import asyncio
+import multiprocessing
+import os
 import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
 from loguru import logger
-from sqlalchemy.future import select
-from ..database.models import Lesson, Group
-from ..database.session import AsyncSessionLocal
+from ..metrics import SCHEDULE_STAGE_SECONDS
+from .base import BaseScheduleParser
 
 
-class ScheduleParser:
-    """Парсер розкладу з Google Sheets у базу даних. Повна синхронізація CSV -> БД з оптимізаціями."""
+class ScheduleParser(BaseScheduleParser):
+    """Парсер розкладу з Google Sheets у базу даних. Повна синхронізація CSV -> БД з оптимізаціями.
 
-    DAY_MAPPING = {"Пн": 0, "Вт": 1, "Ср": 2, "Чт": 3, "Пт": 4, "Сб": 5, "Нд": 6}
-    LESSON_NUMBER_MAPPING = {"I": 1, "II": 2, "III": 3, "IV": 4, "V": 5,
-                             "VI": 6, "VII": 7, "VIII": 8, "IX": 9, "X": 10}
-    WEEK_TYPE_MAPPING = {"чис.": "numerator", "знам.": "denominator"}
+    Читання, хешування та розбір виконуються поза циклом подій: у потоці, а при великій
+    кількості змінених груп - частинами по групах у пулі з `workers` процесів. Пул можна
+    передати ззовні (`executor`), щоб кілька парсерів аркушів ділили один пул."""
 
-    def __init__(self, google_sheet_id: str):
-        """Ініціалізація парсера з ID Google Sheets."""
-        self.google_sheet_id = google_sheet_id
+    MIN_GROUPS_PER_WORKER = 50
 
-    async def load_schedule(self) -> pd.DataFrame:
-        """Завантажує розклад з Google Sheets у DataFrame."""
+    def __init__(self, *args, workers: int | None = None, executor: ProcessPoolExecutor | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._loaded_path = None
+
+    async def load_schedule(self) -> pd.DataFrame | None:
+        """Завантажує розклад з Google Sheets у DataFrame. Повертає None, якщо файл не змінився."""
         logger.info("Loading schedule from Google Sheets...")
         start_time = time.time()
-        df = pd.read_csv(
-            f"https://docs.google.com/spreadsheets/d/e/{self.google_sheet_id}/pub?output=csv",
-            header=1
-        )
+        with SCHEDULE_STAGE_SECONDS.labels("fetch").time():
+            snapshot_path, snapshot_hash = await self.fetcher.fetch()
+        if snapshot_hash == self._snapshot_hash:
+            logger.success(f"Schedule file not changed, checked in {time.time() - start_time:.3f}s")
+            return None
+
+        with SCHEDULE_STAGE_SECONDS.labels("read").time():
+            df = await asyncio.to_thread(pd.read_csv, snapshot_path, header=1)
+        self._loaded_hash = snapshot_hash
+        self._loaded_path = snapshot_path
         logger.success(f"Schedule loaded in {time.time() - start_time:.3f}s")
         return df
 
     async def detect_groups_and_rooms(self, df: pd.DataFrame) -> tuple[list[str], dict[str, str]]:
         """Визначає колонки груп та відповідні колонки для кімнат."""
-        group_columns = [
-            column for column in df.columns[5:]
-            if not column.endswith(".1") and not column.startswith("Unnamed")
-        ]
-        room_columns = {group: group + ".1" for group in group_columns if group + ".1" in df.columns}
-        return group_columns, room_columns
+        return self.detect_columns(list(df.columns))
 
     @staticmethod
     def clean_value(value: any) -> str | None:
@@ -45,101 +55,155 @@ class ScheduleParser:
             return None
         return str(value).strip()
 
-    def parse_lesson_row(self, df: pd.DataFrame, row_index: int, group_name: str, room_column: str | None) -> dict | None:
-        """Парсить один урок із DataFrame. Повертає словник з даними уроку або None."""
-        main_row = df.iloc[row_index]
-        teacher_row = df.iloc[row_index + 1]
-        start_time = self.clean_value(main_row["Unnamed: 3"])
-        end_time = self.clean_value(teacher_row["Unnamed: 3"])
-        week_day = self.DAY_MAPPING.get(self.clean_value(main_row["Unnamed: 1"]))
-        lesson_number = self.LESSON_NUMBER_MAPPING.get(self.clean_value(main_row["Unnamed: 2"]))
-        week_type = self.WEEK_TYPE_MAPPING.get(self.clean_value(main_row["Шифр групи"]))
-        subject = self.clean_value(main_row[group_name])
-        teacher = self.clean_value(teacher_row[group_name])
-        room = self.clean_value(teacher_row[room_column]) if room_column else None
-
-        if not lesson_number or not subject:
-            return None
+    @staticmethod
+    def clean_frame(frame: pd.DataFrame) -> np.ndarray:
+        """Векторна версія clean_value для всієї таблиці: NaN -> None, інакше str().strip()."""
+        values = frame.to_numpy(dtype=object)
+        missing = pd.isna(values)
+        cleaned = np.char.strip(values.astype(str)).astype(object)
+        cleaned[missing] = None
+        return cleaned
 
+    @staticmethod
+    def select_main_rows(valid: np.ndarray) -> np.ndarray:
+        """Відбирає рядки-початки уроків так само, як послідовний обхід.
+
+        Після знайденого уроку наступний рядок вважається рядком викладача і пропускається,
+        тому в серії підряд валідних рядків беруться лише парні за позицією."""
+        counter = np.cumsum(valid, axis=0)
+        resets = np.maximum.accumulate(np.where(valid, 0, counter), axis=0)
+        position = counter - resets - 1
+        return valid & (position % 2 == 0)
+
+    @classmethod
+    def parse_lessons(cls, df: pd.DataFrame, group_columns: list[str], room_columns: dict) -> dict[str, list[dict]]:
+        """Парсить уроки всіх груп за один прохід. Повертає словник група -> список уроків."""
+        lessons: dict[str, list[dict]] = {group_name: [] for group_name in group_columns}
+        if len(df) < 2 or not group_columns:
+            return lessons
+
+        main_rows, teacher_rows = df.iloc[:-1], df.iloc[1:]
+
+        days, numbers, start_times, week_types = cls.clean_frame(
+            main_rows[list(cls.COMMON_COLUMNS)]
+        ).T
+        end_times = cls.clean_frame(teacher_rows[["Unnamed: 3"]])[:, 0]
+        week_days = [cls.DAY_MAPPING.get(value) for value in days]
+        lesson_numbers = [cls.LESSON_NUMBER_MAPPING.get(value) for value in numbers]
+        week_types = [cls.WEEK_TYPE_MAPPING.get(value) for value in week_types]
+
+        subjects = cls.clean_frame(main_rows[group_columns])
+        teachers = cls.clean_frame(teacher_rows[group_columns])
+
+        rooms = np.full(subjects.shape, None, dtype=object)
+        room_positions = [index for index, group_name in enumerate(group_columns) if room_columns.get(group_name)]
+        if room_positions:
+            rooms[:, room_positions] = cls.clean_frame(
+                teacher_rows[[room_columns[group_columns[index]] for index in room_positions]]
+            )
+
+        has_number = np.array([bool(number) for number in lesson_numbers])
+        has_subject = np.not_equal(subjects, None) & np.not_equal(subjects, "")
+        selected = cls.select_main_rows(has_number[:, None] & has_subject)
+
+        group_index, row_index = np.nonzero(selected.T)
+        for group_position, row, subject, teacher, room in zip(
+            group_index.tolist(),
+            row_index.tolist(),
+            subjects.T[selected.T].tolist(),
+            teachers.T[selected.T].tolist(),
+            rooms.T[selected.T].tolist(),
+        ):
+            lessons[group_columns[group_position]].append({
+                "week_day": week_days[row],
+                "lesson_number": lesson_numbers[row],
+                "week_type": week_types[row],
+                "start_time": start_times[row],
+                "end_time": end_times[row],
+                "subject": subject,
+                "teacher": teacher,
+                "room": room
+            })
+        return lessons
+
+    @staticmethod
+    def hash_columns(df: pd.DataFrame) -> dict[str, str]:
+        """Рахує хеш вмісту кожної колонки таблиці за один векторний прохід."""
+        values = df.to_numpy(dtype=object)
+        cell_hashes = pd.util.hash_array(values.ravel(order="F")).reshape(values.shape[1], values.shape[0])
         return {
-            "week_day": week_day,
-            "lesson_number": lesson_number,
-            "week_type": week_type,
-            "start_time": start_time,
-            "end_time": end_time,
-            "subject": subject,
-            "teacher": teacher,
-            "room": room
+            column: hashlib.blake2b(column_hashes.tobytes(), digest_size=16).hexdigest()
+            for column, column_hashes in zip(df.columns, cell_hashes)
         }
 
-    async def get_or_create_group(self, session, group_name: str) -> Group:
-        """Отримує групу з бази даних або створює нову."""
-        result = await session.execute(select(Group).where(Group.name == group_name))
-        group = result.scalars().first()
-        if not group:
-            group = Group(name=group_name)
-            session.add(group)
-            await session.flush()
-        return group
-
-    async def process_group(self, df: pd.DataFrame, group_name: str, room_columns: dict, session):
-        """Синхронізує уроки однієї групи з CSV."""
-        group = await self.get_or_create_group(session, group_name)
-        room_column = room_columns.get(group_name)
-
-        csv_lessons = []
-        row_index = 0
-        while row_index < len(df) - 1:
-            lesson_data = self.parse_lesson_row(df, row_index, group_name, room_column)
-            if lesson_data:
-                csv_lessons.append(lesson_data)
-                row_index += 2
-            else:
-                row_index += 1
-
-        result = await session.execute(select(Lesson).where(Lesson.group_id == group.id))
-        db_lessons = {(l.week_day, l.lesson_number, l.week_type): l for l in result.scalars().all()}
-
-        csv_keys = {(l["week_day"], l["lesson_number"], l["week_type"]) for l in csv_lessons}
-        for key, db_lesson in db_lessons.items():
-            if key not in csv_keys:
-                await session.delete(db_lesson)
-
-        for lesson_data in csv_lessons:
-            key = (lesson_data["week_day"], lesson_data["lesson_number"], lesson_data["week_type"])
-            db_lesson = db_lessons.get(key)
-            if db_lesson:
-                changed = any(
-                    getattr(db_lesson, field) != lesson_data[field]
-                    for field in ["start_time", "end_time", "subject", "teacher", "room"]
-                )
-                if changed:
-                    for field in ["start_time", "end_time", "subject", "teacher", "room"]:
-                        setattr(db_lesson, field, lesson_data[field])
-            else:
-                session.add(Lesson(group_id=group.id, **lesson_data))
-
-    async def process_all_groups(self, df: pd.DataFrame, group_columns: list[str], room_columns: dict):
-        """Обробляє всі групи та синхронізує базу повністю."""
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(select(Group))
-            db_groups = {g.name: g for g in result.scalars().all()}
-
-            csv_group_names = set(group_columns)
-            for name, group in db_groups.items():
-                if name not in csv_group_names:
-                    await session.delete(group)
-
-            for group_name in group_columns:
-                await self.process_group(df, group_name, room_columns, session)
-
-            await session.commit()
-
-    async def run(self):
-        """Головний метод для повного оновлення розкладу."""
+    @classmethod
+    def hash_groups(cls, column_hashes: dict[str, str], group_columns: list[str], room_columns: dict) -> dict[str, str]:
+        """Хеш кожної групи: її колонка, колонка кімнат та спільні колонки (дні, пари, час, тип тижня)."""
+        common_hash = ":".join(column_hashes[column] for column in cls.COMMON_COLUMNS)
+        return {
+            group_name: f"{common_hash}:{column_hashes[group_name]}:{column_hashes.get(room_columns.get(group_name))}"
+            for group_name in group_columns
+        }
+
+    async def parse_groups(self, df: pd.DataFrame, group_columns: list[str], room_columns: dict) -> dict[str, list[dict]]:
+        """Розбирає групи поза циклом подій: невелику кількість - у потоці, решту - частинами у процесах пулу.
+        Кожен процес сам читає зі знімка лише колонки своїх груп, тож DataFrame між процесами не передається."""
+        chunks = min(self.workers, len(group_columns) // self.MIN_GROUPS_PER_WORKER)
+        if chunks < 2:
+            return await asyncio.to_thread(self.parse_lessons, df, group_columns, room_columns)
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        loop = asyncio.get_running_loop()
+        size = -(-len(group_columns) // chunks)
+        parts = await asyncio.gather(*(
+            loop.run_in_executor(
+                self._executor, parse_snapshot_chunk, self._loaded_path, chunk,
+                {group_name: room_columns[group_name] for group_name in chunk if group_name in room_columns},
+            )
+            for chunk in (group_columns[start:start + size] for start in range(0, len(group_columns), size))
+        ))
+
+        lessons = {}
+        for part in parts:
+            lessons.update(part)
+        return lessons
+
+    def close(self):
+        """Зупиняє власний пул процесів розбору."""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def prepare(self) -> dict | None:
+        """Завантажує аркуш і розбирає лише групи, вміст яких змінився з попереднього запуску."""
         start_time = time.time()
-        logger.info("Updating schedule...")
         df = await self.load_schedule()
+        if df is None:
+            return None
+
+        column_hashes = await asyncio.to_thread(self.hash_columns, df)
+        sheet_hash = self.hash_sheet(column_hashes)
+        if sheet_hash == self._sheet_hash:
+            self._snapshot_hash = self._loaded_hash
+            logger.success(f"Schedule not changed, skipped all groups in {time.time() - start_time:.3f}s")
+            return None
+
         group_columns, room_columns = await self.detect_groups_and_rooms(df)
-        await self.process_all_groups(df, group_columns, room_columns)
-        logger.success(f"Schedule updated successfully in {time.time() - start_time:.3f}s")
+        group_hashes = self.hash_groups(column_hashes, group_columns, room_columns)
+        changed_groups = [name for name in group_columns if self._group_hashes.get(name) != group_hashes[name]]
+        with SCHEDULE_STAGE_SECONDS.labels("parse").time():
+            csv_lessons = await self.parse_groups(df, changed_groups, room_columns)
+        return {
+            "group_names": group_columns,
+            "lessons": csv_lessons,
+            "skipped": len(group_columns) - len(changed_groups),
+            "state": (group_hashes, sheet_hash, self._loaded_hash),
+        }
+
+
+def parse_snapshot_chunk(snapshot_path, group_columns: list[str], room_columns: dict) -> dict[str, list[dict]]:
+    """Виконується у процесі пулу: читає зі знімка лише спільні колонки та колонки вказаних груп і розбирає їх."""
+    columns = [*ScheduleParser.COMMON_COLUMNS, *group_columns, *room_columns.values()]
+    df = pd.read_csv(snapshot_path, header=1, usecols=columns)
+    return ScheduleParser.parse_lessons(df, group_columns, room_columns)
@@ -0,0 +1,138 @@
+from sqlalchemy import delete, insert, select, update
+
+from app.core.bulk import batches, upsert
+from ..database.models import Lesson, Group, Subscription
+
+
+class LessonSyncEngine:
+    """Пакетна синхронізація уроків: різниця рахується в пам'яті, а застосовується кількома запитами."""
+
+    KEY_FIELDS = ("week_day", "lesson_number", "week_type")
+    DATA_FIELDS = ("start_time", "end_time", "subject", "teacher", "room")
+
+    async def load_groups(self, session, names: list[str] | None = None) -> dict[str, int]:
+        """Повертає словник назва групи -> id (всі групи або лише вказані)."""
+        if names is None:
+            result = await session.execute(select(Group.name, Group.id))
+            return dict(result.all())
+
+        groups = {}
+        for batch in batches(names):
+            result = await session.execute(select(Group.name, Group.id).where(Group.name.in_(batch)))
+            groups.update(result.all())
+        return groups
+
+    async def load_group_sources(self, session) -> dict[str, tuple[int, str | None]]:
+        """Повертає словник назва групи -> (id, джерело)."""
+        result = await session.execute(select(Group.name, Group.id, Group.source))
+        return {name: (group_id, source) for name, group_id, source in result.all()}
+
+    async def load_lessons(self, session, group_ids: list[int]) -> dict[tuple, dict]:
+        """Повертає уроки вказаних груп, ключ -> (group_id, week_day, lesson_number, week_type)."""
+        columns = [Lesson.id, Lesson.group_id, *(getattr(Lesson, field) for field in self.KEY_FIELDS + self.DATA_FIELDS)]
+        lessons = {}
+        for batch in batches(group_ids):
+            result = await session.execute(select(*columns).where(Lesson.group_id.in_(batch)))
+            for row in result.mappings():
+                lessons[(row["group_id"], *(row[field] for field in self.KEY_FIELDS))] = dict(row)
+        return lessons
+
+    def diff(self, csv_lessons: dict[str, list[dict]], group_ids: dict[str, int], db_lessons: dict[tuple, dict]):
+        """Рахує, які уроки вставити/оновити (upsert) та які видалити."""
+        csv_rows = {}
+        for group_name, lessons in csv_lessons.items():
+            for lesson_data in lessons:
+                row = {"group_id": group_ids[group_name], **lesson_data}
+                csv_rows[(row["group_id"], *(row[field] for field in self.KEY_FIELDS))] = row
+
+        inserted = [row for key, row in csv_rows.items() if key not in db_lessons]
+        updated = [
+            row for key, row in csv_rows.items()
+            if key in db_lessons and any(db_lessons[key][field] != row[field] for field in self.DATA_FIELDS)
+        ]
+        deleted = [lesson for key, lesson in db_lessons.items() if key not in csv_rows]
+        return inserted, updated, deleted
+
+    async def remove_groups(self, session, group_ids: list[int]):
+        """Видаляє групи разом з їх уроками та підписками."""
+        for batch in batches(group_ids):
+            await session.execute(delete(Lesson).where(Lesson.group_id.in_(batch)))
+            await session.execute(delete(Subscription).where(Subscription.group_id.in_(batch)))
+            await session.execute(delete(Group).where(Group.id.in_(batch)))
+
+    async def upsert_lessons(self, session, rows: list[dict]):
+        """INSERT ... ON CONFLICT (група, день, пара, тип тижня) DO UPDATE пакетами."""
+        stmt = upsert(session, Lesson, ["group_id", *self.KEY_FIELDS], list(self.DATA_FIELDS))
+        for batch in batches(rows):
+            await session.execute(stmt, batch)
+
+    async def assign_sources(self, session, groups: dict[str, tuple[int, str | None]], sources: dict[str, str]):
+        """Записує джерело групам, що перейшли в інший аркуш або ще не мали джерела."""
+        moved = {}
+        for name, source in sources.items():
+            if name in groups and groups[name][1] != source:
+                moved.setdefault(source, []).append(groups[name][0])
+        for source, group_ids in moved.items():
+            for batch in batches(group_ids):
+                await session.execute(update(Group).where(Group.id.in_(batch)).values(source=source))
+
+    async def sync(self, session, csv_lessons: dict[str, list[dict]], group_names: list[str],
+                   sources: dict[str, str] | None = None, configured_sources: set[str] | None = None,
+                   complete: bool = True) -> dict:
+        """Синхронізує уроки груп із csv_lessons та видаляє групи, яких немає в group_names.
+        `sources` - джерело (аркуш) кожної групи з group_names: тоді видаляються лише групи тих самих
+        джерел, а групи інших налаштованих аркушів (`configured_sources`; незмінених чи тих, що не вдалося
+        розібрати) не чіпаються. Групи без джерела (створені до багатоаркушевого режиму) та групи аркушів,
+        яких більше немає в налаштуваннях, видаляються лише при `complete` - коли всі аркуші розібрано.
+        Усі зміни виконуються в межах однієї транзакції сесії.
+        Повертає статистику та перелік змін (changes) для сповіщення бота."""
+        db_group_sources = await self.load_group_sources(session)
+        db_groups = {name: group_id for name, (group_id, _) in db_group_sources.items()}
+
+        sheet_groups = set(group_names)
+        synced_sources = set(sources.values()) if sources is not None else None
+        configured_sources = configured_sources or synced_sources
+
+        def removable(source: str | None) -> bool:
+            if synced_sources is None or source in synced_sources:
+                return True
+            return complete and source not in configured_sources
+
+        removed_groups = {
+            group_id: name for name, (group_id, source) in db_group_sources.items()
+            if name not in sheet_groups and removable(source)
+        }
+        await self.remove_groups(session, list(removed_groups))
+        if sources is not None:
+            await self.assign_sources(session, db_group_sources, sources)
+
+        new_groups = [name for name in csv_lessons if name not in db_groups]
+        for batch in batches(new_groups):
+            await session.execute(insert(Group), [
+                {"name": name, "source": sources[name] if sources is not None else None} for name in batch
+            ])
+        group_ids = {name: db_groups[name] for name in csv_lessons if name in db_groups}
+        group_ids.update(await self.load_groups(session, new_groups) if new_groups else {})
+
+        db_lessons = await self.load_lessons(session, [db_groups[name] for name in csv_lessons if name in db_groups])
+        inserted, updated, deleted = self.diff(csv_lessons, group_ids, db_lessons)
+
+        deleted_ids = [lesson["id"] for lesson in deleted]
+        for batch in batches(deleted_ids):
+            await session.execute(delete(Lesson).where(Lesson.id.in_(batch)))
+        await self.upsert_lessons(session, inserted + updated)
+
+        group_names_by_id = {group_id: name for name, group_id in group_ids.items()}
+        changed_group_ids = {row["group_id"] for row in inserted + updated + deleted}
+        changed_group_ids.update(group_ids[name] for name in new_groups)
+        return {
+            "inserted": len(inserted),
+            "updated": len(updated),
+            "deleted": len(deleted_ids),
+            "removed_groups": len(removed_groups),
+            "changes": {
+                "groups": sorted(group_names_by_id[group_id] for group_id in changed_group_ids),
+                "removed_groups": sorted(removed_groups.values()),
+                "deleted_lessons": deleted_ids,
+            },
+        }
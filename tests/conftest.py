@@ -0,0 +1,44 @@
+import os
+import tempfile
+from pathlib import Path
+
+# Обидва застосунки створюють engine з DATABASE_URL під час імпорту, тому тимчасова БД
+# задається до будь-яких імпортів app / old_app.
+DATABASE_PATH = Path(tempfile.mkdtemp()) / "tests.db"
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DATABASE_PATH}"
+os.environ.pop("DATABASE_READ_URL", None)
+
+import pytest
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+async def reset_database():
+    """Закриває з'єднання обох застосунків і видаляє файл БД: кожен тест починає з порожньої схеми."""
+    import app.core.database as api_database
+    import old_app.database.session as bot_database
+    for engine in (api_database.engine, api_database.read_engine, bot_database.engine, bot_database.read_engine):
+        await engine.dispose()
+    for path in DATABASE_PATH.parent.glob(f"{DATABASE_PATH.name}*"):
+        path.unlink()
+
+
+@pytest.fixture
+async def bot_db(anyio_backend):
+    """Порожня БД бота та парсера (old_app) з усіма міграціями."""
+    from old_app.database import init_db
+    await reset_database()
+    await init_db()
+
+
+@pytest.fixture
+async def api_db(anyio_backend):
+    """Порожня БД API (app) з усіма міграціями."""
+    from app.core.database import init_db
+    from app.migrations import migrate_db
+    await reset_database()
+    await init_db()
+    await migrate_db()
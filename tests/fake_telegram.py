@@ -0,0 +1,50 @@
+import asyncio
+from collections import defaultdict
+
+from aiohttp import web
+
+
+class FakeTelegramServer:
+    """Локальний мінімальний Bot API: sendMessage повертає повідомлення й записує текст по чатах,
+    решта методів повертає True. `api_delay` імітує затримку відповіді Telegram."""
+
+    def __init__(self, api_delay: float = 0.005):
+        self.api_delay = api_delay
+        self.messages: dict[int, list[str]] = defaultdict(list)
+        self._runner: web.AppRunner | None = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        data = await request.post()
+        await asyncio.sleep(self.api_delay)
+        if request.match_info["method"].lower() != "sendmessage":
+            return web.json_response({"ok": True, "result": True})
+        chat_id = int(data["chat_id"])
+        self.messages[chat_id].append(data["text"])
+        return web.json_response({"ok": True, "result": {
+            "message_id": len(self.messages[chat_id]), "date": 0,
+            "chat": {"id": chat_id, "type": "private"}, "text": data["text"],
+        }})
+
+    async def start(self) -> str:
+        """Запускає сервер на вільному порту та повертає його базову адресу для TelegramAPIServer."""
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self.handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", 0).start()
+        return f"http://127.0.0.1:{self._runner.addresses[0][1]}"
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+
+def make_update(update_id: int, chat_id: int, text: str) -> dict:
+    """Оновлення з текстовим повідомленням від приватного чату `chat_id`."""
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id, "date": 0, "text": text,
+            "chat": {"id": chat_id, "type": "private"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": "Test"},
+        },
+    }
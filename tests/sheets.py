@@ -0,0 +1,72 @@
+import csv
+import io
+from pathlib import Path
+
+import pandas as pd
+
+from old_app.schedule.schedule_parser import ScheduleParser
+
+COMMON_HEADER = ["", "", "", "", "Шифр групи"]
+
+
+def make_csv(groups: list[str], rows: list[list[str]], rooms: bool = True) -> str:
+    """CSV у форматі опублікованого аркуша: рядок заголовка, шапка колонок і `rows`.
+
+    Кожен рядок - день, пара, час, тип тижня та клітинки груп (по дві на групу, якщо `rooms`)."""
+    header = list(COMMON_HEADER)
+    for name in groups:
+        header += [name, name] if rooms else [name]
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["Розклад"] + [""] * (len(header) - 1))
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow([""] + row + [""] * (len(header) - 1 - len(row)))
+    return out.getvalue()
+
+
+def lesson_rows(groups: list[str], day: str = "Пн", number: str = "I", week_type: str = "чис.",
+                subject: str = "Предмет", teacher: str = "Викладач", room: str = "101") -> list[list[str]]:
+    """Пара рядків одного уроку, однакового для всіх груп (предмет/початок, викладач/аудиторія/кінець)."""
+    main = [day, number, "08:30", week_type]
+    second = ["", "", "09:50", ""]
+    for name in groups:
+        main += [f"{subject} {name}", ""]
+        second += [teacher, room]
+    return [main, second]
+
+
+def serve_sheet(parser, path: Path, text: str):
+    """Підміняє завантаження аркуша парсером: знімок береться з файлу `path` з текстом `text`."""
+    path.write_text(text, encoding="utf-8")
+
+    async def fetch():
+        return path, str(hash(path.read_text(encoding="utf-8")))
+
+    parser.fetcher.fetch = fetch
+
+
+def process_group(df: pd.DataFrame, group_name: str, room_column: str | None) -> list[dict]:
+    """Попередній послідовний розбір однієї групи, з яким порівнюється векторний parse_lessons."""
+    clean_value = ScheduleParser.clean_value
+    lessons = []
+    row_index = 0
+    while row_index < len(df) - 1:
+        main_row, teacher_row = df.iloc[row_index], df.iloc[row_index + 1]
+        lesson_number = ScheduleParser.LESSON_NUMBER_MAPPING.get(clean_value(main_row["Unnamed: 2"]))
+        subject = clean_value(main_row[group_name])
+        if not lesson_number or not subject:
+            row_index += 1
+            continue
+        lessons.append({
+            "week_day": ScheduleParser.DAY_MAPPING.get(clean_value(main_row["Unnamed: 1"])),
+            "lesson_number": lesson_number,
+            "week_type": ScheduleParser.WEEK_TYPE_MAPPING.get(clean_value(main_row["Шифр групи"])),
+            "start_time": clean_value(main_row["Unnamed: 3"]),
+            "end_time": clean_value(teacher_row["Unnamed: 3"]),
+            "subject": subject,
+            "teacher": clean_value(teacher_row[group_name]),
+            "room": clean_value(teacher_row[room_column]) if room_column else None,
+        })
+        row_index += 2
+    return lessons
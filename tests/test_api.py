@@ -0,0 +1,144 @@
+import csv
+import io
+import json
+
+import httpx
+import pytest
+
+from app.main import app
+from app.routers.lesson import EXPORT_COLUMNS
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def client(api_db):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+async def test_empty_update_returns_current_row(client):
+    group = (await client.post("/v1/groups/", json={"name": "ІТ-11", "course": 1})).json()
+
+    response = await client.put(f"/v1/groups/{group['id']}", json={})
+
+    assert response.status_code == 202
+    assert response.json() == group
+
+
+async def test_partial_update_keeps_other_fields(client):
+    group = (await client.post("/v1/groups/", json={"name": "ІТ-11", "course": 1})).json()
+
+    response = await client.put(f"/v1/groups/{group['id']}", json={"specialty": "ІТ"})
+
+    assert response.json() == {**group, "specialty": "ІТ"}
+
+
+@pytest.mark.parametrize("path, payload", [
+    ("/v1/groups/1", {"name": None}),
+    ("/v1/users/1", {"username": None}),
+    ("/v1/lessons/1", {"lesson_number": None}),
+    ("/v1/subscription/1", {"is_active": None}),
+])
+async def test_null_for_not_null_column_is_rejected(client, path, payload):
+    response = await client.put(path, json=payload)
+
+    assert response.status_code == 422
+
+
+async def test_nullable_column_can_be_cleared(client):
+    group = (await client.post("/v1/groups/", json={"name": "ІТ-11", "course": 1})).json()
+
+    response = await client.put(f"/v1/groups/{group['id']}", json={"course": None})
+
+    assert response.json()["course"] is None
+
+
+async def test_duplicate_create_returns_409(client):
+    assert (await client.post("/v1/groups/", json={"name": "ІТ-11"})).status_code == 201
+
+    response = await client.post("/v1/groups/", json={"name": "ІТ-11"})
+
+    assert response.status_code == 409
+    assert (await client.get("/v1/groups/")).json()["items"][0]["name"] == "ІТ-11"
+
+
+async def test_duplicate_update_returns_409(client):
+    await client.post("/v1/groups/", json={"name": "ІТ-11"})
+    group = (await client.post("/v1/groups/", json={"name": "ІТ-12"})).json()
+
+    response = await client.put(f"/v1/groups/{group['id']}", json={"name": "ІТ-11"})
+
+    assert response.status_code == 409
+    assert (await client.get(f"/v1/groups/{group['id']}")).json()["name"] == "ІТ-12"
+
+
+async def create_schedule(client) -> list[dict]:
+    groups = [(await client.post("/v1/groups/", json={"name": name})).json() for name in ("ІТ-11", "ІТ-12")]
+    for group in groups:
+        for week_type, lesson_number in (("numerator", 2), ("numerator", 1), ("denominator", 1)):
+            await client.post("/v1/lessons/", json={
+                "week_day": 0, "lesson_number": lesson_number, "week_type": week_type,
+                "subject": f"Предмет {lesson_number}", "teacher": "Викладач", "room": "101",
+                "group_id": group["id"], "start_time": "08:30", "end_time": "09:50",
+            })
+    return groups
+
+
+async def test_batch_keeps_request_order_and_reports_missing_groups(client):
+    first, second = await create_schedule(client)
+
+    response = await client.post("/v1/lessons/batch", json={
+        "group_ids": [second["id"], 999, first["id"]], "group_names": ["ІТ-99", "ІТ-11"],
+    })
+
+    body = response.json()
+    assert response.status_code == 200
+    assert [group["group_name"] for group in body["groups"]] == ["ІТ-12", "ІТ-11"]
+    assert body["not_found"] == [999, "ІТ-99"]
+    assert [(lesson["week_type"], lesson["lesson_number"]) for lesson in body["groups"][0]["lessons"]] == [
+        ("denominator", 1), ("numerator", 1), ("numerator", 2),
+    ]
+
+
+async def test_batch_filters_week_types(client):
+    first, _ = await create_schedule(client)
+
+    response = await client.post("/v1/lessons/batch", json={"group_ids": [first["id"]], "week_types": ["numerator"]})
+
+    lessons = response.json()["groups"][0]["lessons"]
+    assert [lesson["lesson_number"] for lesson in lessons] == [1, 2]
+    assert {lesson["week_type"] for lesson in lessons} == {"numerator"}
+
+
+@pytest.mark.parametrize("field, value", [("group_ids", 1), ("group_names", "ІТ-11")])
+async def test_batch_rejects_more_than_500_groups(client, field, value):
+    assert (await client.post("/v1/lessons/batch", json={field: [value] * 500})).status_code == 200
+
+    response = await client.post("/v1/lessons/batch", json={field: [value] * 501})
+
+    assert response.status_code == 422
+
+
+async def test_export_csv(client):
+    first, _ = await create_schedule(client)
+
+    response = await client.get("/v1/lessons/export", params={"format": "csv", "group_id": first["id"]})
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert response.headers["content-type"].startswith("text/csv")
+    assert list(rows[0]) == EXPORT_COLUMNS
+    assert len(rows) == 3
+    assert {row["group_id"] for row in rows} == {str(first["id"])}
+
+
+async def test_export_ndjson(client):
+    await create_schedule(client)
+
+    response = await client.get("/v1/lessons/export", params={"week_type": "denominator"})
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert len(rows) == 2
+    assert all(list(row) == EXPORT_COLUMNS and row["week_type"] == "denominator" for row in rows)
+    assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
@@ -0,0 +1,21 @@
+from prometheus_client import REGISTRY
+
+from old_app.bot.bot import NotifierBot
+from old_app.bot.schedule_service import ScheduleService
+from old_app.bot.subscriptions_service import SubscriptionService
+
+
+def cache_size(name: str) -> float:
+    return REGISTRY.get_sample_value("bot_cache_size", {"cache": name})
+
+
+def test_cache_gauges_follow_service_sizes(tmp_path):
+    schedule_service = ScheduleService()
+    subscribe_service = SubscriptionService(journal_path=tmp_path / "subscriptions.journal")
+    NotifierBot(None, None, subscribe_service, schedule_service, keyboards=None)
+
+    subscribe_service._set_cache(1, {"group_name": "ІТ-11", "week_type": "numerator"})
+
+    sizes = {**schedule_service.cache_sizes(), **subscribe_service.cache_sizes()}
+    assert sizes["subscriptions"] == 1
+    assert {name: cache_size(name) for name in sizes} == sizes
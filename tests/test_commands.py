@@ -0,0 +1,83 @@
+import pytest
+from aiogram import Bot, Dispatcher
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.types import Update
+
+from old_app.bot.command import CommandHandlers
+from tests.fake_telegram import FakeTelegramServer, make_update
+
+pytestmark = pytest.mark.anyio
+
+BOT_ID = 123456
+CHAT_ID = 42
+
+
+class FakeKeyboards:
+    def __init__(self):
+        self.queries = []
+
+    async def search_keyboard(self, query: str):
+        self.queries.append(query)
+        return None
+
+
+@pytest.fixture
+async def bot_setup(anyio_backend):
+    telegram = FakeTelegramServer(api_delay=0)
+    api_base = await telegram.start()
+    bot = Bot(f"{BOT_ID}:TEST", session=AiohttpSession(api=TelegramAPIServer.from_base(api_base)))
+    dispatcher = Dispatcher()
+    keyboards = FakeKeyboards()
+    CommandHandlers(dispatcher, keyboards, subscribe_manager=None, schedule_service=None)
+
+    async def send(text: str, chat_type: str = "private", via_bot: int | None = None):
+        update = make_update(len(keyboards.queries) + 1, CHAT_ID, text)
+        update["message"]["chat"]["type"] = chat_type
+        if via_bot is not None:
+            update["message"]["via_bot"] = {"id": via_bot, "is_bot": True, "first_name": "Bot"}
+        await dispatcher.feed_update(bot, Update.model_validate(update, context={"bot": bot}))
+
+    yield send, keyboards, telegram
+    await bot.session.close()
+    await telegram.stop()
+
+
+async def test_plain_text_is_not_a_search(bot_setup):
+    send, keyboards, telegram = bot_setup
+
+    await send("ІТ-11")
+    await send("ІТ-11", chat_type="group")
+
+    assert keyboards.queries == []
+    assert not telegram.messages
+
+
+async def test_search_command_with_query(bot_setup):
+    send, keyboards, telegram = bot_setup
+
+    await send("/search ІТ-11")
+
+    assert keyboards.queries == ["ІТ-11"]
+    assert telegram.messages[CHAT_ID] == ["Групу не знайдено 🤯"]
+
+
+async def test_search_command_waits_for_query_once(bot_setup):
+    send, keyboards, telegram = bot_setup
+
+    await send("/search")
+    await send("ІТ-11")
+    await send("привіт")
+
+    assert keyboards.queries == ["ІТ-11"]
+    assert telegram.messages[CHAT_ID] == ["Введіть назву групи:", "Групу не знайдено 🤯"]
+
+
+async def test_inline_result_of_this_bot_is_searched(bot_setup):
+    send, keyboards, _ = bot_setup
+
+    await send("ІТ-11", via_bot=BOT_ID)
+    await send("ІТ-12", via_bot=BOT_ID + 1)
+    await send("ІТ-13", chat_type="group", via_bot=BOT_ID)
+
+    assert keyboards.queries == ["ІТ-11"]
@@ -0,0 +1,145 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from old_app.schedule import main
+from old_app.schedule.fetcher import ScheduleFetcher
+
+pytestmark = pytest.mark.anyio
+
+SHEET = "a,b\n1,2\n"
+
+
+class SheetServer:
+    """Локальний HTTP-сервер аркуша: віддає статуси з `statuses` по черзі, далі 200 з ETag."""
+
+    def __init__(self, statuses=(), body: str = SHEET, etag: str = '"v1"'):
+        self.statuses = list(statuses)
+        self.body = body
+        self.etag = etag
+        self.requests: list[dict] = []
+        self._runner = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests.append(dict(request.headers))
+        if self.statuses:
+            return web.Response(status=self.statuses.pop(0))
+        if request.headers.get("If-None-Match") == self.etag:
+            return web.Response(status=304)
+        return web.Response(text=self.body, headers={"ETag": self.etag})
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get("/sheet.csv", self.handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", 0).start()
+        return f"http://127.0.0.1:{self._runner.addresses[0][1]}/sheet.csv"
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+
+@pytest.fixture
+async def serve(anyio_backend, tmp_path):
+    servers = []
+
+    async def serve(**kwargs) -> tuple[SheetServer, ScheduleFetcher]:
+        server = SheetServer(**kwargs)
+        servers.append(server)
+        url = await server.start()
+        return server, ScheduleFetcher(url, tmp_path / "sheet.csv", retries=2, backoff=0)
+
+    yield serve
+    for server in servers:
+        await server.stop()
+
+
+async def test_downloads_snapshot(serve):
+    server, fetcher = await serve()
+
+    path, content_hash = await fetcher.fetch()
+
+    assert path.read_text() == SHEET
+    assert content_hash
+    assert len(server.requests) == 1
+
+
+async def test_replays_etag_and_keeps_snapshot_on_304(serve, tmp_path):
+    server, fetcher = await serve()
+    _, first_hash = await fetcher.fetch()
+
+    # Новий екземпляр читає ETag зі збережених метаданих, як після перезапуску процесу.
+    fetcher = ScheduleFetcher(fetcher.url, tmp_path / "sheet.csv", retries=2, backoff=0)
+    path, content_hash = await fetcher.fetch()
+
+    assert server.requests[-1]["If-None-Match"] == '"v1"'
+    assert content_hash == first_hash
+    assert path.read_text() == SHEET
+
+
+async def test_retries_server_errors(serve):
+    server, fetcher = await serve(statuses=[503, 503])
+
+    path, _ = await fetcher.fetch()
+
+    assert len(server.requests) == 3
+    assert path.read_text() == SHEET
+
+
+async def test_does_not_retry_client_errors(serve):
+    server, fetcher = await serve(statuses=[404])
+
+    with pytest.raises(aiohttp.ClientResponseError) as error:
+        await fetcher.fetch()
+
+    assert error.value.status == 404
+    assert len(server.requests) == 1
+
+
+async def test_client_error_falls_back_to_snapshot_without_retries(serve):
+    server, fetcher = await serve()
+    _, first_hash = await fetcher.fetch()
+    server.statuses = [403]
+
+    path, content_hash = await fetcher.fetch()
+
+    assert content_hash == first_hash
+    assert path.read_text() == SHEET
+    assert len(server.requests) == 2
+
+
+async def test_falls_back_to_snapshot_when_retries_run_out(serve):
+    server, fetcher = await serve()
+    _, first_hash = await fetcher.fetch()
+    server.statuses = [503, 503, 503]
+
+    path, content_hash = await fetcher.fetch()
+
+    assert content_hash == first_hash
+    assert len(server.requests) == 4
+
+
+async def test_failed_runs_are_retried_with_backoff(monkeypatch):
+    delays = []
+
+    class FailingParser:
+        runs = 0
+
+        async def run(self):
+            self.runs += 1
+            if self.runs == 5:
+                raise asyncio.CancelledError
+            if self.runs != 3:
+                raise OSError("sheet unavailable")
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(main.asyncio, "sleep", sleep)
+    with pytest.raises(asyncio.CancelledError):
+        await main.run_forever(FailingParser(), interval=300, retry_delay=100)
+
+    assert delays == [100, 200, 300, 100]
@@ -0,0 +1,26 @@
+import pytest
+from sqlalchemy import inspect, text
+
+from app.core.database import engine
+from app.migrations import migrate_db
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_duplicate_subscriptions_are_removed_before_unique_index(api_db):
+    # БД з часів до унікального індексу: у користувача 1 дві підписки.
+    async with engine.begin() as connection:
+        await connection.execute(text("DROP INDEX uq_subscriptions_user"))
+        await connection.execute(text("DELETE FROM api_schema_migrations WHERE version = 3"))
+        await connection.execute(text(
+            "INSERT INTO subscriptions (id, week_type, is_active, group_id, user_id) "
+            "VALUES (1, 'numerator', 1, 1, 1), (2, 'denominator', 1, 2, 1), (3, NULL, 1, 1, 2)"
+        ))
+
+    await migrate_db()
+
+    async with engine.connect() as connection:
+        rows = (await connection.execute(text("SELECT id, user_id FROM subscriptions ORDER BY id"))).all()
+        indexes = await connection.run_sync(lambda sync: inspect(sync).get_indexes("subscriptions"))
+    assert rows == [(1, 1), (3, 2)]
+    assert any(index["name"] == "uq_subscriptions_user" and index["unique"] for index in indexes)
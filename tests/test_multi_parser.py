@@ -0,0 +1,56 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from old_app.schedule.base import BaseScheduleParser
+from old_app.schedule.csv_parser import CsvScheduleParser
+from old_app.schedule.multi_parser import MultiScheduleParser
+
+from .sheets import lesson_rows, make_csv, serve_sheet
+
+pytestmark = pytest.mark.anyio
+
+RESULTS = ("updated", "unchanged", "partial", "failed")
+
+
+def runs() -> dict[str, float]:
+    return {result: REGISTRY.get_sample_value("schedule_runs_total", {"result": result}) or 0 for result in RESULTS}
+
+
+async def count_runs(parser) -> dict[str, float]:
+    """Приріст SCHEDULE_RUNS за один запуск парсера."""
+    before = runs()
+    await parser.run()
+    return {result: count - before[result] for result, count in runs().items() if count != before[result]}
+
+
+def test_base_parser_requires_prepare():
+    with pytest.raises(TypeError):
+        BaseScheduleParser("sheet")
+
+
+async def test_runs_are_counted_once_per_run(bot_db, tmp_path):
+    parsers = [CsvScheduleParser(source, snapshot_dir=str(tmp_path)) for source in ("a", "b", "c")]
+    for parser, group_name in zip(parsers, ("ІТ-11", "ІТ-21", "ІТ-31")):
+        serve_sheet(parser, tmp_path / f"{parser.source}.csv", make_csv([group_name], lesson_rows([group_name])))
+    multi_parser = MultiScheduleParser(parsers)
+
+    async def unavailable():
+        raise OSError("sheet unavailable")
+
+    assert await count_runs(multi_parser) == {"updated": 1}
+    assert await count_runs(multi_parser) == {"unchanged": 1}
+
+    parsers[0].fetcher.fetch = unavailable
+    parsers[1].fetcher.fetch = unavailable
+    assert await count_runs(multi_parser) == {"partial": 1}
+
+    parsers[2].fetcher.fetch = unavailable
+    assert await count_runs(multi_parser) == {"failed": 1}
+
+
+async def test_single_parser_counts_unchanged_run(bot_db, tmp_path):
+    parser = CsvScheduleParser("sheet", snapshot_dir=str(tmp_path))
+    serve_sheet(parser, tmp_path / "sheet.csv", make_csv(["ІТ-11"], lesson_rows(["ІТ-11"])))
+
+    assert await count_runs(parser) == {"updated": 1}
+    assert await count_runs(parser) == {"unchanged": 1}
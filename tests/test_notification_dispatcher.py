@@ -0,0 +1,93 @@
+import time
+
+import pytest
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError, TelegramRetryAfter
+from aiogram.methods import SendMessage
+
+from old_app.bot.notification_dispatcher import NotificationDispatcher, TokenBucket
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeBot:
+    """send_message, що записує доставлені повідомлення та кидає задані помилки для окремих чатів."""
+
+    def __init__(self, errors: dict[int, list[str]] | None = None):
+        self.errors = errors or {}
+        self.sent: list[tuple[int, float]] = []
+        self.calls: dict[int, int] = {}
+
+    async def send_message(self, chat_id: int, text: str):
+        self.calls[chat_id] = self.calls.get(chat_id, 0) + 1
+        method = SendMessage(chat_id=chat_id, text=text)
+        errors = self.errors.get(chat_id)
+        if errors:
+            error = errors.pop(0)
+            if error == "retry_after":
+                raise TelegramRetryAfter(method, "Too Many Requests", retry_after=0)
+            if error == "forbidden":
+                raise TelegramForbiddenError(method, "bot was blocked by the user")
+            raise TelegramBadRequest(method, "chat not found")
+        self.sent.append((chat_id, time.monotonic()))
+
+
+async def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=5)
+    start_time = time.monotonic()
+    for _ in range(15):
+        await bucket.acquire()
+
+    # 5 токенів із запасу, ще 10 - по 1/50 с.
+    assert time.monotonic() - start_time >= 10 / 50 * 0.9
+
+
+async def test_global_rate_limit():
+    bot = FakeBot()
+    dispatcher = NotificationDispatcher(bot, concurrency=20, global_rate=100, chat_rate=100)
+
+    stats = await dispatcher.send(range(150), "text")
+
+    assert stats["sent"] == 150
+    assert stats["duration"] >= 50 / 100 * 0.9
+    # Запас bucket-а (100) плюс не більше 100 повідомлень за секунду після нього.
+    early = [sent_at for _, sent_at in bot.sent if sent_at - bot.sent[0][1] < 0.25]
+    assert len(early) <= 100 + 0.25 * 100 + 1
+
+
+async def test_chat_rate_limit_applies_to_retries():
+    bot = FakeBot(errors={1: ["retry_after"]})
+    dispatcher = NotificationDispatcher(bot, global_rate=1000, chat_rate=5)
+
+    stats = await dispatcher.send([1], "text")
+
+    assert stats["sent"] == 1 and stats["retried"] == 1
+    assert stats["duration"] >= 1 / 5 * 0.9
+
+
+async def test_retry_after_is_retried_up_to_max_retries():
+    bot = FakeBot(errors={1: ["retry_after"] * 2, 2: ["retry_after"] * 3})
+    dispatcher = NotificationDispatcher(bot, global_rate=1000, chat_rate=1000, max_retries=2)
+
+    stats = await dispatcher.send([1, 2, 3], "text")
+
+    assert sorted(chat_id for chat_id, _ in bot.sent) == [1, 3]
+    assert bot.calls == {1: 3, 2: 3, 3: 1}
+    assert stats | {"duration": 0} == {
+        "total": 3, "sent": 2, "failed": 1, "blocked": 0, "retried": 4, "duration": 0,
+    }
+
+
+async def test_blocked_chats_are_reported_and_not_retried():
+    blocked = []
+
+    async def on_blocked(chat_id: int):
+        blocked.append(chat_id)
+
+    bot = FakeBot(errors={2: ["forbidden"], 3: ["bad_request"]})
+    dispatcher = NotificationDispatcher(bot, global_rate=1000, chat_rate=1000, on_blocked=on_blocked)
+
+    stats = await dispatcher.send([1, 2, 3, 1], "text")
+
+    assert blocked == [2]
+    assert bot.calls == {1: 1, 2: 1, 3: 1}
+    assert (stats["total"], stats["sent"], stats["blocked"], stats["failed"]) == (3, 1, 1, 1)
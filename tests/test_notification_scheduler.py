@@ -0,0 +1,92 @@
+from datetime import datetime
+
+import pytest
+
+from old_app.bot.notification_scheduler import MINUTES_PER_DAY, MINUTES_PER_WEEK, NotificationScheduler
+from old_app.bot.schedule_service import LessonRecord
+
+# 2026-10-19 - понеділок.
+MONDAY = datetime(2026, 10, 19)
+
+
+def lesson(lesson_id: int, week_day: int | None, start_time: str | None, group_name: str = "ІТ-11",
+           week_type: str = "numerator") -> LessonRecord:
+    return LessonRecord(lesson_id, group_name, week_day, 1, week_type, "Предмет", None, None, start_time, None)
+
+
+async def noop(*args):
+    pass
+
+
+def make_scheduler(*lessons, lead_minutes: int = 5) -> NotificationScheduler:
+    scheduler = NotificationScheduler(noop, lead_minutes=lead_minutes)
+    scheduler.load(lessons)
+    return scheduler
+
+
+def test_next_fire_is_strictly_after_now():
+    scheduler = make_scheduler(lesson(1, 0, "08:30"), lesson(2, 0, "10:10"))
+
+    assert scheduler.next_fire(MONDAY.replace(hour=7)) == (8 * 60 + 25, MONDAY.replace(hour=8, minute=25))
+    assert scheduler.next_fire(MONDAY.replace(hour=8, minute=25)) == (10 * 60 + 5, MONDAY.replace(hour=10, minute=5))
+
+
+def test_next_fire_wraps_past_end_of_week():
+    scheduler = make_scheduler(lesson(1, 0, "08:30"), lesson(2, 4, "18:00"))
+
+    slot, fire_at = scheduler.next_fire(datetime(2026, 10, 24, 12, 0))  # субота
+
+    assert slot == 8 * 60 + 25
+    assert fire_at == datetime(2026, 10, 26, 8, 25)
+
+
+def test_lead_time_before_midnight_moves_slot_to_previous_day():
+    scheduler = make_scheduler(lesson(1, 0, "00:03"), lesson(2, 3, "00:02"))
+
+    assert scheduler.slot_for(lesson(1, 0, "00:03")) == MINUTES_PER_WEEK - 2
+    assert scheduler.slot_for(lesson(2, 3, "00:02")) == 3 * MINUTES_PER_DAY - 3
+    # Нагадування про урок понеділка о 00:03 - у неділю о 23:58 того самого тижня.
+    assert scheduler.next_fire(datetime(2026, 10, 25, 23, 0))[1] == datetime(2026, 10, 25, 23, 58)
+    # Після нього - урок четверга о 00:02: нагадування в середу о 23:57 наступного тижня.
+    assert scheduler.next_fire(datetime(2026, 10, 25, 23, 58))[1] == datetime(2026, 10, 28, 23, 57)
+
+
+def test_lessons_without_day_or_time_are_not_scheduled():
+    scheduler = make_scheduler(lesson(1, None, "08:30"), lesson(2, 0, None), lesson(3, 0, "вранці"))
+
+    assert scheduler.next_fire(MONDAY) is None
+
+
+def test_update_and_remove_lessons_rebuild_timeline():
+    scheduler = make_scheduler(lesson(1, 0, "08:30"), lesson(2, 0, "08:30", "ІТ-12"), lesson(3, 1, "10:10"))
+    assert scheduler._timeline == [8 * 60 + 25, MINUTES_PER_DAY + 10 * 60 + 5]
+
+    scheduler.update_lessons([lesson(1, 2, "12:00"), lesson(4, 0, "08:30", "ІТ-13")])
+    assert scheduler._timeline == [8 * 60 + 25, MINUTES_PER_DAY + 10 * 60 + 5, 2 * MINUTES_PER_DAY + 11 * 60 + 55]
+    assert scheduler._slots[8 * 60 + 25] == {2: ("ІТ-12", "numerator"), 4: ("ІТ-13", "numerator")}
+
+    scheduler.remove_lessons([2, 4, 3, 99])
+    assert scheduler._timeline == [2 * MINUTES_PER_DAY + 11 * 60 + 55]
+    assert scheduler.next_fire(MONDAY)[1] == datetime(2026, 10, 21, 11, 55)
+
+    scheduler.load([lesson(5, 6, "09:00")])
+    assert scheduler._timeline == [6 * MINUTES_PER_DAY + 8 * 60 + 55]
+    assert scheduler._slots == {6 * MINUTES_PER_DAY + 8 * 60 + 55: {5: ("ІТ-11", "numerator")}}
+
+
+@pytest.mark.anyio
+async def test_fire_sends_all_lessons_of_slot(anyio_backend):
+    sent = []
+
+    async def callback(group_name: str, week_type: str, lesson_id: int):
+        if lesson_id == 2:
+            raise RuntimeError("send failed")
+        sent.append((group_name, week_type, lesson_id))
+
+    scheduler = NotificationScheduler(callback)
+    scheduler.load([lesson(1, 0, "08:30"), lesson(2, 0, "08:30", "ІТ-12"),
+                    lesson(3, 0, "08:30", "ІТ-13", "denominator"), lesson(4, 0, "10:10")])
+
+    await scheduler.fire(8 * 60 + 25)
+
+    assert sorted(sent) == [("ІТ-11", "numerator", 1), ("ІТ-13", "denominator", 3)]
@@ -0,0 +1,15 @@
+import pytest
+
+from old_app.database.migrations import HOT_QUERIES
+from old_app.database.session import engine
+from app.core.migrations import find_full_scans
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+async def test_hot_query_uses_index(bot_db, name):
+    async with engine.connect() as connection:
+        full_scans = await connection.run_sync(find_full_scans, HOT_QUERIES[name])
+
+    assert full_scans == []
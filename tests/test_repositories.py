@@ -0,0 +1,98 @@
+import pytest
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.models import Group
+from app.repositories import Repository
+
+pytestmark = pytest.mark.anyio
+
+
+async def group_names() -> list[str]:
+    async with AsyncSessionLocal() as session:
+        return list(await session.scalars(select(Group.name).order_by(Group.id)))
+
+
+async def test_create_inside_transaction_commits_once(api_db):
+    async with AsyncSessionLocal() as session:
+        repository = Repository(Group, session)
+        async with repository.transaction():
+            first = await repository.create(name="ІТ-11")
+            second = await repository.create(name="ІТ-12", course=1)
+            assert first.id is not None and second.course == 1
+            assert await group_names() == []
+
+    assert await group_names() == ["ІТ-11", "ІТ-12"]
+
+
+async def test_transaction_rolls_back_created_items(api_db):
+    async with AsyncSessionLocal() as session:
+        repository = Repository(Group, session)
+        with pytest.raises(RuntimeError):
+            async with repository.transaction():
+                await repository.create(name="ІТ-11")
+                await repository.create_many([{"name": "ІТ-12"}])
+                raise RuntimeError("abort")
+
+    assert await group_names() == []
+
+
+async def test_create_outside_transaction_commits(api_db):
+    async with AsyncSessionLocal() as session:
+        group = await Repository(Group, session).create(name="ІТ-11")
+
+    assert group.id is not None
+    assert await group_names() == ["ІТ-11"]
+
+
+async def test_upsert_many_updates_existing_rows(api_db):
+    async with AsyncSessionLocal() as session:
+        repository = Repository(Group, session)
+        await repository.create_many([{"name": "ІТ-11", "course": 1}])
+        await repository.upsert_many([{"name": "ІТ-11", "course": 2}, {"name": "ІТ-12", "course": 1}], ["name"])
+
+        groups = await repository.get_many()
+    assert [(group.name, group.course) for group in groups] == [("ІТ-11", 2), ("ІТ-12", 1)]
+
+
+async def test_update_many_by_id(api_db):
+    async with AsyncSessionLocal() as session:
+        repository = Repository(Group, session)
+        await repository.create_many([{"name": "ІТ-11"}, {"name": "ІТ-12"}, {"name": "ІТ-13"}])
+        first, second, _ = await repository.get_many()
+        await repository.update_many([{"id": first.id, "course": 1}, {"id": second.id, "course": 2}])
+
+    async with AsyncSessionLocal() as session:
+        groups = await Repository(Group, session).get_many()
+    assert [group.course for group in groups] == [1, 2, None]
+
+
+async def test_delete_many_with_list_filter(api_db):
+    async with AsyncSessionLocal() as session:
+        repository = Repository(Group, session)
+        await repository.create_many([{"name": f"ІТ-1{index}", "course": index} for index in range(1, 5)])
+        first_id = (await repository.get_many())[0].id
+
+        assert await repository.delete_many(name=["ІТ-12", "ІТ-13"], course=None) == 2
+        assert await repository.delete_many(ids=[first_id]) == 1
+
+    assert await group_names() == ["ІТ-14"]
+
+
+async def test_delete_many_requires_filters(api_db):
+    async with AsyncSessionLocal() as session:
+        repository = Repository(Group, session)
+        await repository.create(name="ІТ-11")
+        with pytest.raises(ValueError):
+            await repository.delete_many(course=None)
+
+    assert await group_names() == ["ІТ-11"]
+
+
+async def test_iter_all_streams_every_row(api_db):
+    async with AsyncSessionLocal() as session:
+        repository = Repository(Group, session)
+        await repository.create_many([{"name": f"ІТ-{index}"} for index in range(5)])
+
+        names = [group.name async for group in repository.iter_all(batch_size=2)]
+    assert names == [f"ІТ-{index}" for index in range(5)]
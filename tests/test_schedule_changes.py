@@ -0,0 +1,69 @@
+import queue
+
+import pytest
+from sqlalchemy import select
+
+from old_app.bot.bot import NotifierBot
+from old_app.bot.keyboards import Keyboards
+from old_app.bot.notification_scheduler import MINUTES_PER_DAY
+from old_app.bot.schedule_service import ScheduleService
+from old_app.bot.subscriptions_service import SubscriptionService
+from old_app.database import AsyncSessionLocal, Lesson
+from old_app.schedule.csv_parser import CsvScheduleParser
+
+from .sheets import lesson_rows, make_csv, serve_sheet
+
+pytestmark = pytest.mark.anyio
+
+
+async def db_lesson_ids() -> set[int]:
+    async with AsyncSessionLocal() as session:
+        return set(await session.scalars(select(Lesson.id)))
+
+
+async def test_changes_feed_updates_bot_caches_and_scheduler(bot_db, tmp_path):
+    changes = queue.Queue()
+    parser = CsvScheduleParser("sheet", snapshot_dir=str(tmp_path), changes=changes)
+    serve_sheet(parser, tmp_path / "sheet.csv", make_csv(["ІТ-11", "ІТ-12"], lesson_rows(["ІТ-11", "ІТ-12"])))
+    await parser.run()
+    changes.get_nowait()
+
+    schedule_service = ScheduleService()
+    subscribe_service = SubscriptionService(journal_path=tmp_path / "subscriptions.journal")
+    keyboards = Keyboards()
+    bot = NotifierBot(None, None, subscribe_service, schedule_service, keyboards)
+    await schedule_service.load_cache()
+    await subscribe_service.load_cache()
+    await keyboards.load_groups()
+    await bot.schedule_notifications()
+    await subscribe_service.set_group(1, "ІТ-12")
+    unchanged_week = schedule_service.get_week_text("ІТ-11", "numerator")
+
+    # ІТ-11 переходить на вівторок з іншим предметом, ІТ-12 зникає з аркуша, з'являється ІТ-13.
+    serve_sheet(parser, tmp_path / "sheet.csv", make_csv(
+        ["ІТ-11", "ІТ-13"], lesson_rows(["ІТ-11", "ІТ-13"], day="Вт", subject="Новий предмет"),
+    ))
+    await parser.run()
+    message = changes.get_nowait()
+    assert message["groups"] == ["ІТ-11", "ІТ-13"]
+    assert message["removed_groups"] == ["ІТ-12"]
+
+    await bot.apply_changes(message)
+
+    week = schedule_service.get_week_text("ІТ-11", "numerator")
+    assert week != unchanged_week and "Вівторок" in week and "Новий предмет ІТ-11" in week
+    assert "Новий предмет ІТ-13" in schedule_service.get_week_text("ІТ-13", "numerator")
+    assert schedule_service.get_week_text("ІТ-12", "numerator") == "😱 Занять немає."
+    assert await schedule_service.get_week_schedule("ІТ-12", "numerator") == {}
+    assert schedule_service.cache_sizes()["schedule_groups"] == 2
+
+    lesson_ids = await db_lesson_ids()
+    assert set(bot.scheduler._lesson_slots) == lesson_ids
+    assert set(bot.scheduler._lesson_slots.values()) == {MINUTES_PER_DAY + 8 * 60 + 25}
+    assert sorted(group for group, _ in bot.scheduler._slots[MINUTES_PER_DAY + 8 * 60 + 25].values()) == [
+        "ІТ-11", "ІТ-13",
+    ]
+
+    assert await subscribe_service.get_users_from_options("ІТ-12", "numerator") == []
+    assert keyboards._groups == ["ІТ-11", "ІТ-13"]
+    await subscribe_service.close()
@@ -0,0 +1,86 @@
+import csv
+import io
+import random
+
+import pandas as pd
+import pytest
+
+from old_app.schedule.schedule_parser import ScheduleParser
+
+from .sheets import process_group
+
+HEADER = ["", "", "", "", "Шифр групи", "ІТ-11", "ІТ-11", "ІТ-12", "ІТ-12", "ІТ-13"]
+
+# День, пара, час, тип тижня, ІТ-11 (предмет/викладач, аудиторія), ІТ-12 (те саме), ІТ-13 (без аудиторій).
+# Об'єднані клітинки дня та пари в опублікованому CSV порожні, як і рядки без викладача.
+FIXTURE_ROWS = [
+    ["Пн", "I", "08:30", "чис.", "Математика", "", "Фізика", "", "Хімія"],
+    ["", "", "09:50", "", "Іваненко", "101", "", "", " Петренко "],
+    ["", "", "10:00", "знам.", "Історія", "", "", "", ""],
+    ["", "", "11:20", "", "Сидоренко", "102", "", "", ""],
+    ["", "II", "11:30", "чис.", "Програмування", "", "Фізика", "", ""],
+    ["", "", "12:50", "", "", "", "Коваль", "203а", ""],
+    ["", "III", "13:00", "", " Англійська ", "", "Англійська", "", "Біологія"],
+    ["", "III", "14:20", "", "Мельник", "104", "", "", "Шевченко"],
+    ["Вт", "I", "08:30", "знам.", "Фізкультура", "", "", "", "Фізкультура"],
+    ["", "", "09:50", "", "", "", "", "", ""],
+    ["", "IV", "", "", "Лише предмет", "", "Лише предмет", "", ""],
+]
+
+
+def read_sheet(rows: list[list[str]]) -> pd.DataFrame:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["Розклад"] + [""] * (len(HEADER) - 1))
+    writer.writerow(HEADER)
+    for row in rows:
+        writer.writerow([""] + row)
+    out.seek(0)
+    return pd.read_csv(out, header=1)
+
+
+def random_rows(seed: int, count: int = 60) -> list[list[str]]:
+    """Випадковий аркуш: пропуски в будь-яких клітинках, рядки викладачів з номером пари тощо."""
+    rnd = random.Random(seed)
+
+    def maybe(*values: str) -> str:
+        return rnd.choice(["", *values])
+
+    return [
+        [maybe("Пн", "Вт", "Нд"), maybe("I", "II", "X", "XI"), maybe("08:30", "09:50"), maybe("чис.", "знам.", "?"),
+         maybe("Предмет", " Викладач "), maybe("101", "1-2"), maybe("Предмет"), maybe("202"), maybe("Предмет", "Викладач")]
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.parametrize("rows", [FIXTURE_ROWS, *(random_rows(seed) for seed in range(20))])
+def test_vectorized_parse_matches_row_by_row(rows):
+    df = read_sheet(rows)
+    group_columns, room_columns = ScheduleParser.detect_columns(list(df.columns))
+
+    lessons = ScheduleParser.parse_lessons(df, group_columns, room_columns)
+
+    assert group_columns == ["ІТ-11", "ІТ-12", "ІТ-13"]
+    assert room_columns == {"ІТ-11": "ІТ-11.1", "ІТ-12": "ІТ-12.1"}
+    assert lessons == {
+        group_name: process_group(df, group_name, room_columns.get(group_name)) for group_name in group_columns
+    }
+
+
+def test_fixture_lessons():
+    df = read_sheet(FIXTURE_ROWS)
+    group_columns, room_columns = ScheduleParser.detect_columns(list(df.columns))
+
+    lessons = ScheduleParser.parse_lessons(df, group_columns, room_columns)
+
+    # pandas читає колонку аудиторій з пропусками як числа, тому "101" стає "101.0".
+    assert [(lesson["week_day"], lesson["lesson_number"], lesson["week_type"], lesson["subject"],
+             lesson["teacher"], lesson["room"]) for lesson in lessons["ІТ-11"]] == [
+        (0, 1, "numerator", "Математика", "Іваненко", "101.0"),
+        (None, 2, "numerator", "Програмування", None, None),
+        (None, 3, None, "Англійська", "Мельник", "104.0"),
+        (1, 1, "denominator", "Фізкультура", None, None),
+    ]
+    # Рядок викладача з номером пари не стає окремим уроком.
+    assert [lesson["subject"] for lesson in lessons["ІТ-13"]] == ["Хімія", "Біологія", "Фізкультура"]
+    assert lessons["ІТ-12"][1]["room"] == "203а"
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+from sqlalchemy import insert, select
+
+from old_app.bot.subscriptions_service import SubscriptionService
+from old_app.database import AsyncSessionLocal, Group, Subscription
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def groups(bot_db):
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(Group), [{"name": "ІТ-11"}, {"name": "ІТ-12"}])
+        await session.commit()
+
+
+async def db_subscriptions() -> dict[int, tuple[str, str]]:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Subscription.chat_id, Group.name, Subscription.week_type).join(Group)
+        )
+        return {chat_id: (group_name, week_type) for chat_id, group_name, week_type in result.all()}
+
+
+def journal_entries(service: SubscriptionService) -> list[dict]:
+    return [json.loads(line) for line in service.journal_path.read_text(encoding="utf-8").splitlines()]
+
+
+async def test_flush_writes_latest_state_of_each_chat(groups, tmp_path):
+    service = SubscriptionService(journal_path=tmp_path / "subscriptions.journal")
+    await service.load_cache()
+
+    await service.set_group(1, "ІТ-11")
+    await service.set_group(2, "ІТ-11")
+    await service.set_group(2, "ІТ-12", "denominator")
+    await service.set_group(3, "ІТ-12")
+    await service.remove_user(3)
+    assert await db_subscriptions() == {}
+
+    await service.flush()
+    assert await db_subscriptions() == {1: ("ІТ-11", "numerator"), 2: ("ІТ-12", "denominator")}
+
+    await service.set_week_type(1, "denominator")
+    await service.remove_user(2)
+    await service.close()
+    assert await db_subscriptions() == {1: ("ІТ-11", "denominator")}
+    assert journal_entries(service) == []
+
+
+async def test_journal_is_replayed_after_crash(groups, tmp_path):
+    journal_path = tmp_path / "subscriptions.journal"
+    crashed = SubscriptionService(journal_path=journal_path)
+    await crashed.load_cache()
+    await crashed.set_group(1, "ІТ-11")
+    await crashed.set_week_type(1, "denominator")
+    # Процес впав до скидання буфера: лишився тільки журнал.
+    crashed._journal.close()
+
+    service = SubscriptionService(journal_path=journal_path)
+    await service.load_cache()
+
+    assert await db_subscriptions() == {1: ("ІТ-11", "denominator")}
+    assert await service.get_users_from_options("ІТ-11", "denominator") == [1]
+    assert journal_entries(service) == []
+    await service.close()
+
+
+async def test_week_type_without_subscription_is_ignored(groups, tmp_path):
+    service = SubscriptionService(journal_path=tmp_path / "subscriptions.journal")
+    await service.load_cache()
+
+    await service.set_week_type(123, "denominator")
+
+    assert await service.get_user(123) is None
+    assert service.cache_sizes()["subscriptions_pending"] == 0
+    await service.close()
+
+
+async def test_missing_row_and_broken_entries_do_not_block_flush(groups, tmp_path):
+    journal_path = tmp_path / "subscriptions.journal"
+    # Журнал попередньої версії: зміна типу тижня для чату без підписки та пошкоджений запис.
+    journal_path.write_text("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in [
+        {"chat_id": 123, "data": {"week_type": "denominator"}},
+        {"chat_id": 124, "data": {"group_name": "ІТ-11"}},
+        {"chat_id": 1, "data": {"group_name": "ІТ-11", "week_type": "numerator"}},
+    ]), encoding="utf-8")
+
+    service = SubscriptionService(journal_path=journal_path)
+    await service.load_cache()
+    assert await db_subscriptions() == {1: ("ІТ-11", "numerator")}
+    assert journal_entries(service) == []
+
+    await service.set_group(2, "ІТ-12")
+    await service.close()
+    assert await db_subscriptions() == {1: ("ІТ-11", "numerator"), 2: ("ІТ-12", "numerator")}
@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import func, insert, select
+
+from old_app.database import AsyncSessionLocal, Group, Lesson, Subscription
+from old_app.schedule.csv_parser import CsvScheduleParser
+from old_app.schedule.sync_engine import LessonSyncEngine
+
+from .sheets import lesson_rows, make_csv, serve_sheet
+
+pytestmark = pytest.mark.anyio
+
+LESSON = {"week_day": 0, "lesson_number": 1, "week_type": "numerator", "start_time": "08:30",
+          "end_time": "09:50", "subject": "Предмет", "teacher": "Викладач", "room": "101"}
+
+
+async def db_groups() -> dict[str, str | None]:
+    async with AsyncSessionLocal() as session:
+        return dict((await session.execute(select(Group.name, Group.source))).all())
+
+
+async def add_groups(groups: dict[str, str | None]):
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(Group), [{"name": name, "source": source} for name, source in groups.items()])
+        await session.commit()
+
+
+async def sync(csv_lessons: dict, sources: dict, configured_sources: set, complete: bool) -> dict:
+    async with AsyncSessionLocal() as session:
+        async with session.begin():
+            return await LessonSyncEngine().sync(
+                session, csv_lessons, list(sources), sources, configured_sources, complete
+            )
+
+
+async def test_sync_keeps_groups_of_failed_sources(bot_db):
+    await add_groups({"A-1": "a", "A-2": "a", "B-1": "b", "LEGACY": None, "OLD-1": "old"})
+
+    stats = await sync({"A-1": [LESSON]}, {"A-1": "a"}, {"a", "b"}, complete=False)
+
+    assert stats["changes"]["removed_groups"] == ["A-2"]
+    assert await db_groups() == {"A-1": "a", "B-1": "b", "LEGACY": None, "OLD-1": "old"}
+
+
+async def test_complete_sync_removes_legacy_and_unconfigured_sources(bot_db):
+    await add_groups({"A-1": "a", "B-1": "b", "LEGACY": None, "OLD-1": "old"})
+
+    stats = await sync({"A-1": [LESSON]}, {"A-1": "a"}, {"a", "b"}, complete=True)
+
+    assert stats["changes"]["removed_groups"] == ["LEGACY", "OLD-1"]
+    assert await db_groups() == {"A-1": "a", "B-1": "b"}
+
+
+async def test_changed_sheet_id_removes_groups_of_previous_sheet(bot_db, tmp_path):
+    old_parser = CsvScheduleParser("old-sheet", snapshot_dir=str(tmp_path))
+    serve_sheet(old_parser, tmp_path / "old.csv", make_csv(["ІТ-11", "ІТ-12"], lesson_rows(["ІТ-11", "ІТ-12"])))
+    await old_parser.run()
+    async with AsyncSessionLocal() as session:
+        group_id = await session.scalar(select(Group.id).where(Group.name == "ІТ-12"))
+        await session.execute(insert(Subscription).values(chat_id=1, group_id=group_id, week_type="numerator"))
+        await session.commit()
+
+    new_parser = CsvScheduleParser("new-sheet", snapshot_dir=str(tmp_path))
+    serve_sheet(new_parser, tmp_path / "new.csv", make_csv(["ІТ-11", "ІТ-21"], lesson_rows(["ІТ-11", "ІТ-21"])))
+    await new_parser.run()
+
+    assert await db_groups() == {"ІТ-11": "new-sheet", "ІТ-21": "new-sheet"}
+    async with AsyncSessionLocal() as session:
+        assert await session.scalar(select(func.count()).select_from(Lesson)) == 2
+        assert await session.scalar(select(func.count()).select_from(Lesson).where(Lesson.subject == "Предмет ІТ-12")) == 0
+        assert await session.scalar(select(func.count()).select_from(Subscription)) == 0
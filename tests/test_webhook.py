@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+from aiogram import Bot, Dispatcher
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiohttp import ClientSession, web
+
+from old_app.bot.webhook import SECRET_HEADER, WebhookServer
+from tests.fake_telegram import FakeTelegramServer, make_update
+
+SECRET = "test-secret"
+
+
+@pytest.fixture
+async def telegram(anyio_backend):
+    server = FakeTelegramServer(api_delay=0.001)
+    api_base = await server.start()
+    bot = Bot("123456:TEST", session=AiohttpSession(api=TelegramAPIServer.from_base(api_base)))
+    yield server, bot
+    await bot.session.close()
+    await server.stop()
+
+
+async def serve(webhook: WebhookServer):
+    runner = web.AppRunner(webhook.web_app())
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner, f"http://127.0.0.1:{runner.addresses[0][1]}{webhook.path}"
+
+
+async def post(session: ClientSession, url: str, update: dict, secret: str | None = SECRET) -> int:
+    headers = {SECRET_HEADER: secret} if secret else {}
+    async with session.post(url, json=update, headers=headers) as response:
+        return response.status
+
+
+@pytest.mark.anyio
+async def test_replies_keep_per_chat_order(telegram):
+    server, bot = telegram
+    dispatcher = Dispatcher()
+
+    @dispatcher.message()
+    async def echo(message):
+        await message.answer(message.text)
+
+    webhook = WebhookServer(bot, dispatcher, secret_token=SECRET, workers=4, queue_size=256)
+    runner, url = await serve(webhook)
+    await webhook.start()
+
+    async def send_chat(session: ClientSession, chat_id: int):
+        for index in range(10):
+            assert await post(session, url, make_update(chat_id * 10 + index, chat_id, str(index))) == 200
+
+    async with ClientSession() as session:
+        await asyncio.gather(*(send_chat(session, chat_id) for chat_id in range(1, 9)))
+    await webhook.stop()
+    await runner.cleanup()
+
+    expected = [str(index) for index in range(10)]
+    assert {chat_id: server.messages[chat_id] for chat_id in range(1, 9)} == {
+        chat_id: expected for chat_id in range(1, 9)
+    }
+
+
+@pytest.mark.anyio
+async def test_full_shard_returns_503(telegram):
+    _, bot = telegram
+    dispatcher = Dispatcher()
+    release = asyncio.Event()
+
+    @dispatcher.message()
+    async def blocked(message):
+        await release.wait()
+
+    webhook = WebhookServer(bot, dispatcher, secret_token=SECRET, workers=1, queue_size=1, enqueue_timeout=0.05)
+    runner, url = await serve(webhook)
+    await webhook.start()
+
+    async with ClientSession() as session:
+        # Перше оновлення забирає воркер, друге займає єдине місце в шарді, третє не вміщується.
+        first = await post(session, url, make_update(1, 1, "1"))
+        await asyncio.sleep(0.01)
+        statuses = [first] + [await post(session, url, make_update(index, 1, str(index))) for index in (2, 3)]
+    release.set()
+    await webhook.stop()
+    await runner.cleanup()
+
+    assert statuses == [200, 200, 503]
+
+
+@pytest.mark.anyio
+async def test_wrong_secret_returns_403(telegram):
+    _, bot = telegram
+    webhook = WebhookServer(bot, Dispatcher(), secret_token=SECRET)
+    runner, url = await serve(webhook)
+    await webhook.start()
+
+    async with ClientSession() as session:
+        statuses = [
+            await post(session, url, make_update(1, 1, "1"), secret="wrong"),
+            await post(session, url, make_update(2, 1, "2"), secret=None),
+            await post(session, url, make_update(3, 1, "3")),
+        ]
+    await webhook.stop()
+    await runner.cleanup()
+
+    assert statuses == [403, 403, 200]
+
+
+def test_public_webhook_gets_generated_secret():
+    webhook = WebhookServer(None, None, url="https://example.com/webhook")
+    assert webhook.secret_token